@@ -34,11 +34,6 @@ class Tile:
         return "\n".join(self.data)
 
 
-with open("data/20.txt", "r") as file:
-    data = file.read().split("\n\n")
-tiles_bag = [Tile(x) for x in data]
-
-
 # def find_context(tiles_bag, tile):
 #     right = []
 #     left = []
@@ -225,6 +220,11 @@ class Image:
         return "\n".join(r)
 
 
-x = Image(tiles_bag)
-x.fill_image()
-print(x)
\ No newline at end of file
+if __name__ == "__main__":
+    with open("data/20.txt", "r") as file:
+        data = file.read().split("\n\n")
+    tiles_bag = [Tile(x) for x in data]
+
+    x = Image(tiles_bag)
+    x.fill_image()
+    print(x)
@@ -1,3 +1,11 @@
+from typing import Iterable
+
+import numpy as np
+
+from aoc.inputs import Text, iter_int_chunks
+
+MMAP_INPUT = True
+
 RAW_DEMO = """\
 199
 200
@@ -11,26 +19,35 @@ RAW_DEMO = """\
 263
 """
 
-INPUT_DEMO = RAW_DEMO.strip().split("\n")
-
-with open("./data/01.txt") as f:
-    INPUT = f.read().strip().split("\n")
 
-
-def count_increases(numbers, windows=1):
+def count_increases(chunks: Iterable[np.ndarray], windows=1):
+    # comparing windows that share all but their ends reduces to comparing
+    # numbers `windows` apart; the last few of a chunk carry over to the next
     count = 0
-    for i in range(len(numbers) - windows):
-        if int(numbers[i]) < int(numbers[i + windows]):
-            count += 1
+    carry = np.empty(0, dtype=np.int64)
+    for chunk in chunks:
+        numbers = np.concatenate([carry, chunk])
+        count += int(np.count_nonzero(numbers[:-windows] < numbers[windows:]))
+        carry = numbers[-windows:]
     return count
 
 
-# Part 1
-assert count_increases(INPUT_DEMO) == 7
+def part_1(data: Text) -> int:
+    return count_increases(iter_int_chunks(data))
+
+
+def part_2(data: Text) -> int:
+    return count_increases(iter_int_chunks(data), 3)
+
 
+if __name__ == "__main__":
+    with open("./data/01.txt") as f:
+        data = f.read()
 
-print(count_increases(INPUT))
+    # Part 1
+    assert part_1(RAW_DEMO) == 7
+    print(part_1(data))
 
-# Part 2
-assert count_increases(INPUT_DEMO, 3) == 5
-print(count_increases(INPUT, 3))
+    # Part 2
+    assert part_2(RAW_DEMO) == 5
+    print(part_2(data))
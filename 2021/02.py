@@ -1,5 +1,6 @@
 from enum import Enum
 from dataclasses import dataclass
+from typing import List
 
 
 class Direction(str, Enum):
@@ -47,34 +48,43 @@ forward 2
 
 INPUT_DEMO = [x.split(" ") for x in RAW_DEMO.strip().split("\n")]
 
-submarine = Submarine()
 
-for x in INPUT_DEMO:
-    submarine.move(x[0], int(x[1]))
+def parse(data: str) -> List[List[str]]:
+    return [x.split(" ") for x in data.strip().split("\n")]
 
 
-# Part 1
-assert (submarine.position, submarine.depth) == (15, 10)
-assert submarine.position * submarine.depth == 150
-with open("data/02.txt", "r") as f:
-    INPUT = [x.split(" ") for x in f.read().strip().split("\n")]
+def part_1(data: str) -> int:
+    submarine = Submarine()
+    for x in parse(data):
+        submarine.move(x[0], int(x[1]))
+    return submarine.position * submarine.depth
 
-submarine = Submarine()
 
-for x in INPUT:
-    submarine.move(x[0], int(x[1]))
+def part_2(data: str) -> int:
+    submarine = Submarine()
+    for x in parse(data):
+        submarine.move_using_aim(x[0], int(x[1]))
+    return submarine.position * submarine.depth
 
-# Part 2
 
-submarine = Submarine()
-for x in INPUT_DEMO:
-    submarine.move_using_aim(x[0], int(x[1]))
+if __name__ == "__main__":
+    with open("data/02.txt", "r") as f:
+        data = f.read()
 
-assert (submarine.position, submarine.depth) == (15, 60)
-assert submarine.position * submarine.depth == 900
+    # Part 1
+    submarine = Submarine()
+    for x in INPUT_DEMO:
+        submarine.move(x[0], int(x[1]))
+    assert (submarine.position, submarine.depth) == (15, 10)
+    assert submarine.position * submarine.depth == 150
+    assert part_1(RAW_DEMO) == 150
+    print(part_1(data))
 
-submarine = Submarine()
-for x in INPUT:
-    submarine.move_using_aim(x[0], int(x[1]))
-
-print(submarine.position * submarine.depth)
+    # Part 2
+    submarine = Submarine()
+    for x in INPUT_DEMO:
+        submarine.move_using_aim(x[0], int(x[1]))
+    assert (submarine.position, submarine.depth) == (15, 60)
+    assert submarine.position * submarine.depth == 900
+    assert part_2(RAW_DEMO) == 900
+    print(part_2(data))
@@ -49,27 +49,32 @@ def bit_criteria_filtering(
 
 inverse = lambda x: "".join([str(int(not int(y))) for y in x])
 
-result = most_common_bit(INPUT_DEMO)
 
-assert (int(result, 2) * int(inverse(result), 2)) == 198
+def part_1(data: str) -> int:
+    result = most_common_bit(data.strip().split("\n"))
+    return int(result, 2) * int(inverse(result), 2)
 
 
-# Part 1
+def part_2(data: str) -> int:
+    numbers = data.strip().split("\n")
+    return int(bit_criteria_filtering(numbers)[0], 2) * int(
+        bit_criteria_filtering(numbers, greater=0)[0], 2
+    )
 
-with open("data/03.txt", "r") as f:
-    INPUT = f.read().strip().split("\n")
 
-result = most_common_bit(INPUT)
-print(int(result, 2) * int(inverse(result), 2))
+if __name__ == "__main__":
+    with open("data/03.txt", "r") as f:
+        data = f.read()
 
-# Part 2
-assert (
-    int(bit_criteria_filtering(INPUT_DEMO)[0], 2)
-    * int(bit_criteria_filtering(INPUT_DEMO, greater=0)[0], 2)
-    == 230
-)
+    # Part 1
+    result = most_common_bit(INPUT_DEMO)
+    assert (int(result, 2) * int(inverse(result), 2)) == 198
+    print(part_1(data))
 
-print(
-    int(bit_criteria_filtering(INPUT)[0], 2)
-    * int(bit_criteria_filtering(INPUT, greater=0)[0], 2)
-)
+    # Part 2
+    assert (
+        int(bit_criteria_filtering(INPUT_DEMO)[0], 2)
+        * int(bit_criteria_filtering(INPUT_DEMO, greater=0)[0], 2)
+        == 230
+    )
+    print(part_2(data))
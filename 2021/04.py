@@ -1,5 +1,13 @@
-from copy import deepcopy
-from typing import List, Tuple, Union
+from typing import Tuple
+
+import numpy as np
+
+from aoc.inputs import Text, iter_lines, parse_ints
+
+MMAP_INPUT = True
+
+# win turn of a board no draw completes
+NEVER = np.iinfo(np.int64).max
 
 RAW = """\
 7,4,9,5,11,17,23,2,0,14,21,24,10,16,13,6,15,25,12,22,18,20,8,19,3,26,1
@@ -24,120 +32,70 @@ RAW = """\
 """
 
 
-class Board:
-    def _parse_str_board(self, board: str) -> List[List[int]]:
-        """
-        Parse a string representation of a board into a list of lists.
-        """
-        board = board.strip().split("\n")
-        board = [list(map(int, row.split())) for row in board]
-        return board
-
-    def __init__(self, board: Union[str, "Board"]):
-        self.board = (
-            self._parse_str_board(board)
-            if isinstance(board, str)
-            else deepcopy(board.board)
-        )
-        self.n = len(self.board)
-        self.m = len(self.board[0])
-        self.board_mask = [[False for _ in range(self.m)] for _ in range(self.n)]
-        self._winner = False
-
-    def __repr__(self):
-        return "\n".join([" ".join(map(str, row)) for row in self.board])
-
-    @property
-    def already_a_winner(self) -> bool:
-        return self._winner
-
-    def check_wining_condition(self, i: int, j: int) -> bool:
+class Bingo:
+    """
+    Every board at once as an ``(n, 5, 5)`` array. A line is complete on the
+    turn its last number is drawn, and a board wins on the first turn one of
+    its lines is, so the whole game is a few reductions over the turn each
+    cell is drawn on rather than a replay of the draws.
+    """
+
+    def __init__(self, draws: np.ndarray, boards: np.ndarray):
+        self.draws = draws
+        self.boards = boards
+        # turn each number is first drawn on, NEVER for numbers never drawn
+        size = int(max(draws.max(initial=0), boards.max(initial=0))) + 1
+        turn = np.full(size, NEVER, dtype=np.int64)
+        numbers, first = np.unique(draws, return_index=True)
+        turn[numbers] = first
+        self.cell_turns = turn[boards]
+        rows, cols = self.cell_turns.max(axis=2), self.cell_turns.max(axis=1)
+        self.win_turns = np.minimum(rows.min(axis=1), cols.min(axis=1))
+
+    @classmethod
+    def from_str(cls, data: Text) -> "Bingo":
+        n_draws = next(iter_lines(data)).count(",") + 1
+        numbers = parse_ints(data, signed=False)
+        return cls(numbers[:n_draws], numbers[n_draws:].reshape(-1, 5, 5))
+
+    def score(self, board: int) -> int:
+        turn = self.win_turns[board]
+        unmarked = self.boards[board][self.cell_turns[board] > turn]
+        return int(unmarked.sum()) * int(self.draws[turn])
+
+    def winners(self) -> Tuple[int, int]:
         """
-        Check if the board has a winning condition.
+        First and last board to win. Boards winning on the same number win in
+        board order, so the first is the lowest such board and the last the
+        highest; boards that never win are left out.
         """
-        # Check row
-        if all(self.board_mask[i]):
-            return True
+        turns = self.win_turns
+        first = int(np.argmin(turns))
+        if turns[first] == NEVER:
+            raise ValueError("No board ever wins")
+        last_turn = turns[turns < NEVER].max()
+        last = int(np.flatnonzero(turns == last_turn)[-1])
+        return first, last
 
-        # Check column
-        if all([x[j] for x in self.board_mask]):
-            return True
 
-        return False
-
-    def mark_number(self, number: int) -> bool:
-        """
-        Check if a number is present in the board and mark it if so.
-        """
-        for i in range(self.n):
-            for j in range(self.m):
-                if self.board[i][j] == number:
-                    self.board_mask[i][j] = True
-                    if self.check_wining_condition(i, j):
-                        self._winner = True
-                        return True
-        return False
-
-    def get_sum_unmasked(self) -> int:
-        """
-        Get the sum of all unmasked numbers.
-        """
-        s = 0
-        for i in range(self.n):
-            for j in range(self.m):
-                if not self.board_mask[i][j]:
-                    s += self.board[i][j]
-        return s
+def part_1(data: Text) -> int:
+    bingo = Bingo.from_str(data)
+    return bingo.score(bingo.winners()[0])
 
 
-def parse(raw: str) -> Tuple[List[int], List[Board]]:
-    data = raw.strip().split("\n\n")
-    numbers = list(map(int, data[0].split(",")))
-    boards = [Board(x) for x in data[1:]]
-
-    return numbers, boards
-
-
-def find_winning_board(numbers: List[int], boards: List[Board]) -> Tuple[int, Board]:
-    for number in numbers:
-        for board in boards:
-            if board.mark_number(number):
-                return number, board
-    return None, None
-
-
-def find_last_winning_board(
-    numbers: List[int], boards: List[Board]
-) -> Tuple[int, Board]:
-    boards = [Board(x) for x in boards]
-    eliminated_boards = 0
-    for number in numbers:
-        for board in boards:
-            if not board.already_a_winner and board.mark_number(number):
-                eliminated_boards += 1
-                if eliminated_boards == len(boards):
-                    return number, board
-    return None, None
+def part_2(data: Text) -> int:
+    bingo = Bingo.from_str(data)
+    return bingo.score(bingo.winners()[1])
 
 
 if __name__ == "__main__":
-
-    # Part 1
-    numbers, boards = parse(RAW)
-    number, winner_board = find_winning_board(numbers, boards)
-    assert (winner_board.get_sum_unmasked() * number) == 4512
-
     with open("data/04.txt") as f:
-        numbers, boards = parse(f.read())
-    number, winner_board = find_winning_board(numbers, boards)
-    print(f"Part 1: {winner_board.get_sum_unmasked() * number}")
+        data = f.read()
 
-    # Part 2)
-    numbers, boards = parse(RAW)
-    number, last_winner_board = find_last_winning_board(numbers, boards)
-    assert (last_winner_board.get_sum_unmasked() * number) == 1924
+    # Part 1
+    assert part_1(RAW) == 4512
+    print(f"Part 1: {part_1(data)}")
 
-    with open("data/04.txt") as f:
-        numbers, boards = parse(f.read())
-    number, winner_board = find_last_winning_board(numbers, boards)
-    print(f"Part 2: {winner_board.get_sum_unmasked() * number}")
+    # Part 2
+    assert part_2(RAW) == 1924
+    print(f"Part 2: {part_2(data)}")
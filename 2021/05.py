@@ -1,4 +1,18 @@
-from dataclasses import dataclass
+import functools
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from aoc.inputs import Text, parse_ints
+
+MMAP_INPUT = True
+
+# cells of lines (sparse) or of the box (dense) handled at once
+BAND_SIZE = 1 << 22
+# boxes with more cells than this many times the cells of lines are sparse
+SPARSE_RATIO = 8
+# a cell of a difference array costs about a fifth of listing a cell of a line
+CELLS_PER_POINT = 5
 
 RAW = """\
 0,9 -> 5,9
@@ -14,137 +28,173 @@ RAW = """\
 """
 
 
-@dataclass
-class Point:
-    x: int
-    y: int
-
-    def __str__(self):
-        return f"({self.x}, {self.y})"
-
-    def __repr__(self):
-        return str(self)
-
-
-@dataclass
-class Line:
-    start: Point
-    end: Point
-
-    def __str__(self):
-        return f"{self.start} -> {self.end}"
-
-    def __repr__(self):
-        return str(self)
-
-
-class Grid:
-    def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.grid = [[0 for _ in range(width)] for _ in range(height)]
-
-    def __str__(self):
-        return "\n".join(
-            "".join(str(self.grid[y][x]) for x in range(self.width))
-            for y in range(self.height)
-        ).replace("0", ".")
-
-    def __repr__(self):
-        return str(self)
-
-    def draw(self, line: Line, include_diagonals: bool = False):
-        start = line.start
-        end = line.end
-        # Horizontal
-        if start.y == end.y:
-            for x in range(
-                *[n + 1 if i > 0 else n for i, n in enumerate(sorted([start.x, end.x]))]
-            ):
-                self.increase(x, start.y)
-        # Vertical
-        elif start.x == end.x:
-            for y in range(
-                *[n + 1 if i > 0 else n for i, n in enumerate(sorted([start.y, end.y]))]
-            ):
-                self.increase(start.x, y)
-        # Diagonal
-        elif abs(end.x - start.x) == abs(end.y - start.y):
-            if include_diagonals:
-                x_range = (
-                    range(start.x, end.x + 1)
-                    if start.x < end.x
-                    else range(start.x, end.x - 1, -1)
-                )
-                y_range = (
-                    range(start.y, end.y + 1)
-                    if start.y < end.y
-                    else range(start.y, end.y - 1, -1)
-                )
-                for x, y in zip(x_range, y_range):
-                    self.increase(x, y)
+def parse(data: Text) -> np.ndarray:
+    """Lines as ``(n, 4)`` rows of ``x1, y1, x2, y2``."""
+    return parse_ints(data, signed=False).reshape(-1, 4)
+
+
+def orient(lines: np.ndarray) -> np.ndarray:
+    """The same lines, drawn downwards, or rightwards if horizontal."""
+    x1, y1, x2, y2 = lines.T
+    flip = (y2 < y1) | ((y2 == y1) & (x2 < x1))
+    return np.where(flip[:, None], lines[:, [2, 3, 0, 1]], lines)
+
+
+def iter_bands(
+    lines: np.ndarray, height: int, rows: int
+) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Oriented lines clipped to bands of ``rows`` rows: for each band its row
+    count and the segments inside it, as their first cell ``x, y`` (``y``
+    from the top of the band), their step ``dx, dy`` and their length.
+    """
+    x1, y1, x2, y2 = lines.T
+    lengths = line_lengths(lines)
+    dx, dy = np.sign(x2 - x1), np.sign(y2 - y1)
+    for top in range(0, height, rows):
+        bottom = min(top + rows, height)
+        # steps t with top <= y1 + dy * t < bottom
+        first = np.where(dy > 0, np.maximum(top - y1, 0), 0)
+        last = np.where(dy > 0, np.minimum(bottom - y1, lengths), lengths)
+        inside = (first < last) & ((dy > 0) | ((top <= y1) & (y1 < bottom)))
+        first = first[inside]
+        yield (
+            bottom - top,
+            x1[inside] + dx[inside] * first,
+            y1[inside] + dy[inside] * first - top,
+            dx[inside],
+            dy[inside],
+            last[inside] - first,
+        )
+
+
+def line_lengths(lines: np.ndarray) -> np.ndarray:
+    dx, dy = lines[:, 2] - lines[:, 0], lines[:, 3] - lines[:, 1]
+    if np.any((dx != 0) & (dy != 0) & (np.abs(dx) != np.abs(dy))):
+        raise ValueError("Lines must be horizontal, vertical or diagonal")
+    return np.maximum(np.abs(dx), np.abs(dy)) + 1
+
+
+def cells(starts: np.ndarray, strides: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Every cell of every segment, ``n`` cells ``stride`` apart from ``start``."""
+    segment = np.repeat(np.arange(len(n)), n)
+    step = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    return starts[segment] + strides[segment] * step
+
+
+def dense_counts(
+    rows: int,
+    width: int,
+    x: np.ndarray,
+    y: np.ndarray,
+    dx: np.ndarray,
+    dy: np.ndarray,
+    n: np.ndarray,
+) -> np.ndarray:
+    """
+    Lines over each cell of a band. A direction with many cells to draw
+    gets a difference array: +1 on the first cell of a segment and -1 one
+    step past its last, summed along the direction. Rows are padded by a
+    column on each side and the band by a row below, so that a step is the
+    same offset everywhere and every -1 lands in the array. Seen as rows of
+    ``stride`` cells, the array has each chain ``i, i + stride, ...`` as a
+    column, so the sums are one ``cumsum`` down the columns. The cells of
+    the other directions are listed and counted with a ``bincount``.
+    """
+    padded = width + 2
+    size = (rows + 1) * padded
+    parts = []
+    # single cells step nowhere; count them as one-cell horizontal lines
+    strides = np.maximum(dy * padded + dx, 1)
+    starts = y * padded + x + 1
+    listed = np.zeros(len(n), dtype=bool)
+    for stride in np.unique(strides).tolist():
+        mine = strides == stride
+        if int(n[mine].sum()) * CELLS_PER_POINT < size:
+            listed |= mine
+            continue
+        diff = np.zeros(-(-size // stride) * stride, dtype=np.int32)
+        np.add.at(diff, starts[mine], 1)
+        np.add.at(diff, starts[mine] + n[mine] * stride, -1)
+        if stride == 1:
+            np.cumsum(diff, out=diff)
         else:
-            raise Exception(f"Invalid line: {line}")
-
-    def increase(self, x, y, value=1):
-
-        if x >= self.width:
-            self.grid = [l + [0] * (x - self.width + 1) for l in self.grid]
-            self.width = x + 1
-        if y >= self.height:
-            self.grid += [
-                [0 for _ in range(self.width)] for _ in range(y - self.height + 1)
-            ]
-            self.height = y + 1
-        self.grid[y][x] += value
-
-    def get(self, x, y):
-        return self.grid[y][x]
+            chains = diff.reshape(-1, stride)
+            np.cumsum(chains, axis=0, out=chains)
+        parts.append(diff[:size])
+    if listed.any():
+        drawn = cells(starts[listed], strides[listed], n[listed])
+        parts.append(np.bincount(drawn, minlength=size))
+    return functools.reduce(np.add, parts) if parts else np.zeros(0, dtype=np.int32)
+
+
+def repeated(keys: np.ndarray) -> int:
+    """Distinct keys that occur at least twice."""
+    keys = np.sort(keys)
+    same = keys[1:] == keys[:-1]
+    # the first repeat of each key
+    return int(np.count_nonzero(same[1:] & ~same[:-1])) + int(same[:1].sum())
+
+
+def count_overlaps(lines: np.ndarray, sparse: Optional[bool] = None) -> int:
+    """
+    Cells covered by at least two lines. The dense mode sums difference
+    arrays over a band of rows, in time linear in the lines and the cells of
+    the band; the sparse mode sorts the covered cells instead, which does not depend on the size of the box, for lines spread
+    thinly over a big one. By default the mode is the one with the least to
+    go through. Either way, bands hold about BAND_SIZE cells so memory stays
+    bounded.
+    """
+    if not len(lines):
+        return 0
+    # shift to the bounding box so that its corner is (0, 0)
+    lines = orient(lines - [lines[:, 0::2].min(), lines[:, 1::2].min()] * 2)
+    height = int(lines[:, 1::2].max()) + 1
+    width = int(lines[:, 0::2].max()) + 1
+    n_points = int(line_lengths(lines).sum())
+    if sparse is None:
+        sparse = height * width > SPARSE_RATIO * n_points
+    if sparse:
+        rows = height * BAND_SIZE // n_points
+    else:
+        rows = BAND_SIZE // width
+    overlaps = 0
+    for band, *segments in iter_bands(lines, height, max(1, min(rows, height))):
+        if sparse:
+            x, y, dx, dy, n = segments
+            drawn = cells(y * width + x, dy * width + dx, n)
+            # sorting halves in time on half the bytes
+            if band * width < 2**31:
+                drawn = drawn.astype(np.int32)
+            overlaps += repeated(drawn)
+        else:
+            counts = dense_counts(band, width, *segments)
+            overlaps += int(np.count_nonzero(counts >= 2))
+    return overlaps
 
 
-if __name__ == "__main__":
-    # Part 1
-    lines_raw = []
-    for line in RAW.splitlines():
-        start, end = line.split(" -> ")
-        start_x, start_y = [int(x) for x in start.split(",")]
-        end_x, end_y = [int(x) for x in end.split(",")]
-        lines_raw.append(Line(Point(start_x, start_y), Point(end_x, end_y)))
+def straight(lines: np.ndarray) -> np.ndarray:
+    return lines[(lines[:, 0] == lines[:, 2]) | (lines[:, 1] == lines[:, 3])]
 
-    grid = Grid(10, 10)
 
-    for line in lines_raw:
-        grid.draw(line)
+def part_1(data: Text, sparse: Optional[bool] = None) -> int:
+    return count_overlaps(straight(parse(data)), sparse)
 
-    get_points = lambda g: sum([sum([y >= 2 for y in x]) for x in g])
 
-    assert get_points(grid.grid) == 5
+def part_2(data: Text, sparse: Optional[bool] = None) -> int:
+    return count_overlaps(parse(data), sparse)
 
-    grid = Grid(10, 10)
 
+if __name__ == "__main__":
     with open("data/05.txt") as f:
-        lines = [
-            Line(
-                Point(*[int(x) for x in line.split(" -> ")[0].split(",")]),
-                Point(*[int(x) for x in line.split(" -> ")[1].split(",")]),
-            )
-            for line in f.readlines()
-        ]
-
-    for line in lines:
-        grid.draw(line)
+        data = f.read()
 
-    print(f"Part 1: {get_points(grid.grid)}")
+    # Part 1
+    assert part_1(RAW) == 5
+    assert part_1(RAW, sparse=True) == 5
+    print(f"Part 1: {part_1(data)}")
 
     # Part 2
-    grid = Grid(10, 10)
-
-    for line in lines_raw:
-        grid.draw(line, include_diagonals=True)
-    assert get_points(grid.grid) == 12
-
-    grid = Grid(989, 989)
-    for i, line in enumerate(lines):
-        grid.draw(line, include_diagonals=True)
-
-    print(f"Part 2: {get_points(grid.grid)}")
+    assert part_2(RAW) == 12
+    assert part_2(RAW, sparse=True) == 12
+    print(f"Part 2: {part_2(data)}")
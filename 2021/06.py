@@ -1,6 +1,8 @@
-from typing import List
-from collections import defaultdict
+from typing import List, Optional, Sequence
 
+import numpy as np
+
+from aoc.matrix import advance
 
 RAW = "3,4,3,1,2"
 
@@ -10,52 +12,73 @@ class LanternFishSimulator:
     reset_day: int = 6
 
     def __init__(self, init_states: List[int]):
-        group_dict = defaultdict(lambda: 0)
-        for state in init_states:
-            group_dict[state] += 1
-
-        self.group = [group_dict.get(i, 0) for i in range(self.max_days)]
+        self.group = np.bincount(init_states, minlength=self.max_days).astype(object)
+        # counts are kept modulo this once a simulation asked for it
+        self.modulus: Optional[int] = None
 
-    def new_day(self) -> None:
-        zeros = self.group[0]
-        for i in range(1, self.max_days):
-            self.group[i - 1] = self.group[i]
-        self.group[self.max_days - 1] = zeros
-        self.group[self.reset_day] += zeros
+    @classmethod
+    def transition(cls) -> np.ndarray:
+        """
+        One day as a matrix on the fish counts per timer: every timer counts
+        down, and the fish at 0 restart at ``reset_day`` and spawn as many at
+        ``max_days - 1``.
+        """
+        step = np.eye(cls.max_days, k=1, dtype=np.int64)
+        step[cls.reset_day, 0] = step[cls.max_days - 1, 0] = 1
+        return step
 
-    def simulate(self, n: int) -> None:
-        for _ in range(n):
-            self.new_day()
+    def simulate(self, n: int, modulus: Optional[int] = None) -> None:
+        self.modulus = modulus or self.modulus
+        self.group = advance(self.transition(), self.group, n, self.modulus)
 
     def __repr__(self) -> str:
         return str(self)
 
     def total(self) -> int:
-        return sum(self.group)
+        total = sum(self.group.tolist())
+        return total if self.modulus is None else total % self.modulus
 
     def __str__(self) -> str:
         return str(self.total())
 
 
+def simulate_many(
+    init_states: Sequence[List[int]], n: int, modulus: Optional[int] = None
+) -> List[int]:
+    """Fish after ``n`` days of each school, sharing one matrix power."""
+    groups = np.stack(
+        [np.bincount(s, minlength=LanternFishSimulator.max_days) for s in init_states]
+    )
+    groups = advance(LanternFishSimulator.transition(), groups, n, modulus)
+    totals = [sum(row) for row in groups.tolist()]
+    return totals if modulus is None else [total % modulus for total in totals]
+
+
+def part_1(data: str, days: int = 80) -> int:
+    fishes = LanternFishSimulator([int(i) for i in data.strip().split(",")])
+    fishes.simulate(days)
+    return fishes.total()
+
+
+def part_2(data: str, days: int = 256) -> int:
+    fishes = LanternFishSimulator([int(i) for i in data.strip().split(",")])
+    fishes.simulate(days)
+    return fishes.total()
+
+
 if __name__ == "__main__":
     fishes = LanternFishSimulator([int(i) for i in RAW.split(",")])
     fishes.simulate(18)
     assert (fishes.total()) == 26
-    fishes = LanternFishSimulator([int(i) for i in RAW.split(",")])
-    fishes.simulate(80)
-    assert (fishes.total()) == 5934
+    assert simulate_many([[3, 4, 3, 1, 2], [1]], 18) == [26, 7]
 
-    # Part 1
     with open("data/06.txt") as f:
         raw = f.read().strip()
-    fishes = LanternFishSimulator([int(i) for i in raw.split(",")])
-    fishes.simulate(80)
-    print(f"Part 1: {fishes.total()}")
+
+    # Part 1
+    assert part_1(RAW) == 5934
+    print(f"Part 1: {part_1(raw)}")
 
     # Part 2
-    fishes = LanternFishSimulator([int(i) for i in RAW.split(",")])
-    fishes.simulate(256)
-    assert (fishes.total()) == 26984457539
-    fishes = LanternFishSimulator([int(i) for i in raw.split(",")])
-    fishes.simulate(256)
-    print(f"Part 2: {fishes.total()}")
+    assert part_2(RAW) == 26984457539
+    print(f"Part 2: {part_2(raw)}")
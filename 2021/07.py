@@ -1,48 +1,105 @@
-from typing import Callable, List, Tuple
+from typing import Callable, Tuple
 
+import numpy as np
+
+from aoc.inputs import Text, parse_ints
+
+MMAP_INPUT = True
 
 INPUT = "16,1,2,0,4,2,7,1,2,14"
 
+# fuel to move a crab by each of an array of distances
+Method = Callable[[np.ndarray], np.ndarray]
+
+
+def linear_method(d: np.ndarray) -> np.ndarray:
+    return d
+
+
+def quad_method(d: np.ndarray) -> np.ndarray:
+    return d * (d + 1) // 2
+
+
+def fuel(a: np.ndarray, target: int, method: Method) -> int:
+    return int(method(np.abs(a - target)).sum())
+
+
+def find_least_fuel_usage(a: np.ndarray, method: Method) -> Tuple[int, int]:
+    """
+    Lowest target with the least fuel, and that fuel, for any ``method``
+    convex in the distance. The total is then convex in the target too, so a
+    binary search for the first target where it stops falling finds it in
+    ``O(n log range)``.
+    """
+    a = np.asarray(a, dtype=np.int64)
+    lo, hi = int(a.min()), int(a.max())
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if fuel(a, mid + 1, method) < fuel(a, mid, method):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo, fuel(a, lo, method)
+
+
+def cost_profile(a: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fuel for every target from ``min(a)`` to ``max(a)``, with linear and with
+    triangular cost, from prefix sums over the histogram of positions: the
+    crabs at or left of ``t`` and their position sum give the distance sum
+    ``L(t)``, and the triangular fuel is ``(sum of (p - t)² + L(t)) / 2``.
+    """
+    a = np.asarray(a, dtype=np.int64)
+    low = int(a.min())
+    hist = np.bincount(a - low)
+    targets = np.arange(low, low + len(hist), dtype=np.int64)
+    n, total, squares = len(a), int(a.sum()), int((a * a).sum())
+    left = np.cumsum(hist)
+    left_sum = np.cumsum(hist * targets)
+    linear = targets * left - left_sum + (total - left_sum) - targets * (n - left)
+    triangular = (squares - 2 * targets * total + n * targets**2 + linear) // 2
+    return linear, triangular
+
+
+def median_target(a: np.ndarray) -> int:
+    """Lowest target minimising the linear fuel: the lower median."""
+    return int(np.partition(a, (len(a) - 1) // 2)[(len(a) - 1) // 2])
+
 
-def histogram(a: List[int]) -> List[int]:
-    # it assumes that the values' range is from 0 to max(a) + 1
-    hist = [0] * (max(a) + 1)
-    for i in a:
-        hist[i] += 1
-    return hist
+def mean_target(a: np.ndarray) -> int:
+    """
+    Lowest target minimising the triangular fuel. Its slope is within n/2 of
+    ``n * (t - mean)``, so the optimum is within half a step of the mean and
+    the integers around it are the only candidates.
+    """
+    mean = int(a.sum()) // len(a)
+    candidates = range(mean - 1, mean + 2)
+    return min(candidates, key=lambda t: (fuel(a, t, quad_method), t))
 
 
-def argmin(iterable):
-    return min(enumerate(iterable), key=lambda x: x[1])[0]
+def part_1(data: Text) -> int:
+    a = parse_ints(data)
+    return fuel(a, median_target(a), linear_method)
 
 
-def find_least_fuel_usage(
-    a: List[int], method: Callable[[List[int], int, int], int]
-) -> Tuple[int, int]:
-    hist = histogram(a)
-    costs = []
-    for i in range(len(hist)):
-        sum_cost = 0
-        for j in range(len(hist)):
-            sum_cost += (move_cost := method(hist, i, j))
-            # print(f"Move from {j} to {i}: {move_cost}")
-        costs.append(sum_cost)
-    return (x := argmin(costs)), costs[x]
+def part_2(data: Text) -> int:
+    a = parse_ints(data)
+    return fuel(a, mean_target(a), quad_method)
 
 
 if __name__ == "__main__":
-    position_demo = [int(x) for x in INPUT.split(",")]
+    position_demo = parse_ints(INPUT)
     with open("data/07.txt") as f:
-        position = [int(x) for x in f.read().split(",")]
+        data = f.read()
 
     # Part 1
-    linear_method = lambda h, i, j: abs(i - j) * h[j]
     assert (find_least_fuel_usage(position_demo, linear_method)) == (2, 37)
-    print("Part 1:")
-    print(find_least_fuel_usage(position, linear_method))
+    assert median_target(position_demo) == 2
+    print("Part 1:", part_1(data))
 
     # Part 2
-    quad_method = lambda h, i, j: (x := (abs(i - j))) * (x + 1) // 2 * h[j]
     assert (find_least_fuel_usage(position_demo, quad_method)) == (5, 168)
-    print("Part 2:")
-    print(find_least_fuel_usage(position, quad_method))
+    assert mean_target(position_demo) == 5
+    linear, triangular = cost_profile(position_demo)
+    assert (linear.min(), triangular.min()) == (37, 168)
+    print("Part 2:", part_2(data))
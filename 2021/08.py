@@ -189,28 +189,26 @@ def decode_by_intersection(row: Row) -> int:
     return int("".join([to_number(word) for word in row.p2]))
 
 
+def part_1(data: str) -> int:
+    return count_unique(parse(data))
+
+
+def part_2(data: str) -> int:
+    return sum(decode_by_intersection(row) for row in parse(data))
+
+
 if __name__ == "__main__":
 
     input_demo_0 = parse(RAW_0)
-    input_demo = parse(RAW)
     with open("data/08.txt") as f:
-        input_real = parse(f.read())
-
-    assert count_unique(input_demo) == 26
+        data = f.read()
 
     # Part 1
-    print(f"Part 1: {count_unique(input_real)}")
+    assert part_1(RAW) == 26
+    print(f"Part 1: {part_1(data)}")
 
     # Part 2
     for row in input_demo_0:
         assert decode_by_intersection(row) == 5353
-
-    s = 0
-    for row in input_demo:
-        s += (x := decode_by_intersection(row))
-    assert s == 61229
-
-    s = 0
-    for row in input_real:
-        s += (x := decode_by_intersection(row))
-    print("Part 2:", s)
+    assert part_2(RAW) == 61229
+    print("Part 2:", part_2(data))
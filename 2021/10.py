@@ -70,29 +70,26 @@ def incomplete_points(data: List[str]) -> int:
     return sorted(ss)[len(ss) // 2]
 
 
+def part_1(data: str) -> int:
+    s = 0
+    for line in data.strip().splitlines():
+        if (x := check_syntax(line))[0] is not None:
+            s += ILLEGAL_POINTS[x[0]]
+    return s
+
+
+def part_2(data: str) -> int:
+    return incomplete_points(data.strip().splitlines())
+
+
 if __name__ == "__main__":
-    input_raw = RAW.strip().splitlines()
     with open("data/10.txt") as f:
-        input_real = f.read().strip().splitlines()
+        data = f.read()
 
     # Part 1
-    # Demo
-    s = 0
-    for line in input_raw:
-        if (x := check_syntax(line, True))[0] is not None:
-            s += ILLEGAL_POINTS[x[0]]
-    assert s == 26397
-
-    # Real
-    s = 0
-    for line in input_real:
-        if (x := check_syntax(line))[0] is not None:
-            s += ILLEGAL_POINTS[x[0]]
-    print("\nPart 1:", s)
+    assert part_1(RAW) == 26397
+    print("\nPart 1:", part_1(data))
 
     # Part 2
-    # Demo
-    assert incomplete_points(input_raw) == 288957
-
-    # Real
-    print("Part 2:", incomplete_points(input_real))
+    assert part_2(RAW) == 288957
+    print("Part 2:", part_2(data))
@@ -1,5 +1,9 @@
-from typing import List
+from typing import Tuple
 
+import numpy as np
+
+from aoc.grid import Grid
+from aoc.lazy import njit
 
 RAW = """\
 5483143223
@@ -15,57 +19,85 @@ RAW = """\
 """
 
 
-class Grid:
+# steps run per call into compiled code while waiting for a sync
+BATCH_STEPS = 1000
+
+
+@njit
+def simulate(energy: np.ndarray, steps: int, until_sync: bool) -> Tuple[int, int]:
+    """
+    Run up to ``steps`` steps on ``energy`` in place and return the number of
+    flashes and of steps taken, stopping after the first step in which every
+    octopus flashes if ``until_sync``. Flashes spread through an explicit
+    stack: an octopus is pushed when its energy reaches exactly 10, so once
+    per step, and each push costs its eight neighbours and nothing else.
+    """
+    h, w = energy.shape
+    stack = np.empty((h * w, 2), dtype=np.int64)
+    flashes = 0
+    for step in range(steps):
+        top = 0
+        for y in range(h):
+            for x in range(w):
+                energy[y, x] += 1
+                if energy[y, x] == 10:
+                    stack[top, 0], stack[top, 1] = y, x
+                    top += 1
+        flashed = 0
+        while top:
+            top -= 1
+            y, x = stack[top, 0], stack[top, 1]
+            flashed += 1
+            for ny in range(max(y - 1, 0), min(y + 2, h)):
+                for nx in range(max(x - 1, 0), min(x + 2, w)):
+                    energy[ny, nx] += 1
+                    if energy[ny, nx] == 10:
+                        stack[top, 0], stack[top, 1] = ny, nx
+                        top += 1
+        for y in range(h):
+            for x in range(w):
+                if energy[y, x] > 9:
+                    energy[y, x] = 0
+        flashes += flashed
+        if until_sync and flashed == h * w:
+            return flashes, step + 1
+    return flashes, steps
+
+
+class Octopuses:
     def __init__(self, data: str):
-        self.grid = self._parse(data)
-        self.height = len(self.grid)
-        self.width = len(self.grid[0])
-        self.reset_mask()
-
-    def _parse(self, data: str) -> List[List[int]]:
-        return [[int(y) for y in list(x)] for x in data.strip().split("\n")]
-
-    def _get_neighbors(self, x: int, y: int) -> List[int]:
-        neighbors = []
-        for i in range(max(0, y - 1), min(self.height, y + 2)):
-            for j in range(max(0, x - 1), min(self.width, x + 2)):
-                if i == y and j == x or self.flashing_mask[i][j]:
-                    continue
-                neighbors.append((i, j))
-        return neighbors
-
-    def maybe_flash_neighbors(self, x: int, y: int) -> None:
-        for i, j in self._get_neighbors(x, y):
-            if not self.flashing_mask[i][j]:
-                self.grid[i][j] += 1
-            if self.grid[i][j] > 9 and not self.flashing_mask[i][j]:
-                self.flashing_mask[i][j] = True
-                self.grid[i][j] = 0
-                self.maybe_flash_neighbors(j, i)
-
-    def reset_mask(self) -> None:
-        self.flashing_mask = [
-            [False for _ in range(self.width)] for _ in range(self.height)
-        ]
-
-    def step(self) -> int:
-        self.reset_mask()
-        for y in range(self.height):
-            for x in range(self.width):
-                if not self.flashing_mask[y][x]:
-                    self.grid[y][x] += 1
-                if self.grid[y][x] > 9 and not self.flashing_mask[y][x]:
-                    self.flashing_mask[y][x] = True
-                    self.grid[y][x] = 0
-                    self.maybe_flash_neighbors(x, y)
-
-        return sum(sum(x) for x in self.flashing_mask)
+        # at most 9 + 9 after a step's increments, so bytes are enough
+        self.grid = Grid.from_digits(data.strip(), dtype=np.uint8)
+        self.height, self.width = self.grid.shape
+
+    def step(self, steps: int = 1) -> int:
+        return simulate(self.grid.array, steps, False)[0]
+
+    def first_sync(self) -> int:
+        """Steps until every octopus flashes at once, stepping in batches."""
+        n = 0
+        while True:
+            _, taken = simulate(self.grid.array, BATCH_STEPS, True)
+            n += taken
+            if taken < BATCH_STEPS:
+                return n
+            # a sync right on the last step of the batch
+            if self.grid.count(0) == self.height * self.width:
+                return n
 
     def __repr__(self) -> str:
         return str(self)
 
     def __str__(self) -> str:
-        return "\n".join(["".join([str(y) for y in x]) for x in g.grid])
+        return self.grid.to_str("0123456789")
+
+
+def part_1(data: str, steps: int = 100) -> int:
+    return Octopuses(data).step(steps)
+
+
+def part_2(data: str) -> int:
+    return Octopuses(data).first_sync()
 
 
 if __name__ == "__main__":
@@ -75,35 +107,14 @@ if __name__ == "__main__":
 
     # Part 1
     # Demo
-    g, s = Grid(RAW), 0
-    for _ in range(10):
-        s += g.step()
-    assert s == 204
+    assert part_1(RAW, 10) == 204
     # Demo 2
-    g, s = Grid(RAW), 0
-    for _ in range(100):
-        s += g.step()
-    assert s == 1656
+    assert part_1(RAW) == 1656
     # Real
-    g, s = Grid(data), 0
-    for _ in range(100):
-        s += g.step()
-    print("Part 1:", s)
+    print("Part 1:", part_1(data))
 
     # Part 2
     # Demo
-    g, s, n = Grid(RAW), 0, 0
-    while True:
-        n += 1
-        s = g.step()
-        if s == (g.width * g.height):
-            break
-    assert n == 195
+    assert part_2(RAW) == 195
     # Real
-    g, s, n = Grid(data), 0, 0
-    while True:
-        n += 1
-        s = g.step()
-        if s == (g.width * g.height):
-            break
-    print("Part 2:", n)
+    print("Part 2:", part_2(data))
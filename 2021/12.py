@@ -1,6 +1,7 @@
-from collections import defaultdict
-from typing import List
+import functools
+from typing import Iterator, List, Tuple
 
+from aoc.graph import CSR
 
 RAW_DEMO_1 = """\
 start-A
@@ -52,35 +53,86 @@ class Graph:
         self.set_adj_dict(data)
 
     def set_adj_dict(self, data: str) -> None:
-        self.adj_dict = defaultdict(list)
-        for line in data.strip().split("\n"):
-            state, next_state = line.split("-")
-            self.adj_dict[state].append(next_state)
-            self.adj_dict[next_state].append(state)
-        self.all_lower_states = [x for x in self.adj_dict if x.islower()]
-
-    def step(self, paths: List[List[str]], small_q_once: int = 1) -> List[List[str]]:
-        not_ending_idx = [i for i, x in enumerate(paths) if x[-1] != "end"]
-        if not len(not_ending_idx):
-            return paths
-        new_paths = [x for i, x in enumerate(paths) if i not in not_ending_idx]
-        for i in not_ending_idx:
-            current_path = paths[i]
-            current_state = current_path[-1]
-            counts = defaultdict(lambda: 0)
-            for s in current_path:
-                counts[s] += 1
-            used = [x for x, c in counts.items() if c >= small_q_once and x.islower()]
-            if len(used):
-                used = [x for x in counts if x.islower()]
-            possibilities = (
-                set(self.adj_dict[current_state]) - set(used) - set(["start"])
-            )
-            if not len(possibilities):
+        edges = [line.split("-") for line in data.strip().split("\n")]
+        self.caves = sorted({cave for edge in edges for cave in edge})
+        self.index = {cave: i for i, cave in enumerate(self.caves)}
+        self.graph = CSR.from_edges(
+            len(self.caves),
+            [self.index[a] for a, _ in edges],
+            [self.index[b] for _, b in edges],
+            undirected=True,
+        )
+        self.adj_dict = {
+            cave: [self.caves[v] for v in self.graph.neighbours(u)]
+            for u, cave in enumerate(self.caves)
+        }
+        self.all_lower_states = [x for x in self.caves if x.islower()]
+        indptr, indices = self.graph.indptr.tolist(), self.graph.indices.tolist()
+        self.adjacency = [
+            indices[indptr[u] : indptr[u + 1]] for u in range(len(self.caves))
+        ]
+        self.small = [cave.islower() for cave in self.caves]
+
+    def moves(
+        self, u: int, visited: int, can_revisit: bool
+    ) -> Iterator[Tuple[int, int, bool]]:
+        """
+        Caves reachable from ``u`` as (cave, bitmask of the small caves on the
+        path, revisit still allowed), ``end`` included but never ``start``.
+        """
+        start, end = self.index["start"], self.index["end"]
+        for v in self.adjacency[u]:
+            if v == end or not self.small[v]:
+                yield v, visited, can_revisit
+            elif v == start:
                 continue
-            for state in list(possibilities):
-                new_paths.append(current_path + [state])
-        return self.step(new_paths, small_q_once=small_q_once)
+            elif not visited >> v & 1:
+                yield v, visited | 1 << v, can_revisit
+            elif can_revisit:
+                yield v, visited, False
+
+    def count_paths(self, small_q_once: int = 1) -> int:
+        """
+        Paths from start to end visiting small caves once, except for a single
+        small cave visited ``small_q_once`` times. The ways on from a cave
+        only depend on the state ``moves`` tracks, so they are counted once
+        per state rather than once per path.
+        """
+        end = self.index["end"]
+
+        @functools.cache
+        def ways(u: int, visited: int, can_revisit: bool) -> int:
+            return sum(
+                1 if v == end else ways(v, *state)
+                for v, *state in self.moves(u, visited, can_revisit)
+            )
+
+        start = self.index["start"]
+        return ways(start, 1 << start, small_q_once > 1)
+
+    def paths(self, small_q_once: int = 1) -> Iterator[List[str]]:
+        """The paths ``count_paths`` counts, one at a time by depth-first search."""
+        start, end = self.index["start"], self.index["end"]
+        path = [start]
+        stack = [self.moves(start, 1 << start, small_q_once > 1)]
+        while stack:
+            step = next(stack[-1], None)
+            if step is None:
+                stack.pop()
+                path.pop()
+            elif step[0] == end:
+                yield [self.caves[u] for u in path] + ["end"]
+            else:
+                path.append(step[0])
+                stack.append(self.moves(*step))
+
+
+def part_1(data: str) -> int:
+    return Graph(data).count_paths()
+
+
+def part_2(data: str) -> int:
+    return Graph(data).count_paths(small_q_once=2)
 
 
 if __name__ == "__main__":
@@ -88,38 +140,14 @@ if __name__ == "__main__":
     with open("data/12.txt", "r") as f:
         data = f.read()
     # Part 1
-    # Demo 1
-    g = Graph(RAW_DEMO_1)
-    new_paths = g.step([["start"]])
-    assert len(new_paths) == 10
-    # Demo 2
-    g = Graph(RAW_DEMO_2)
-    new_paths = g.step([["start"]])
-    assert len(new_paths) == 19
-    # Demo 3
-    g = Graph(RAW_DEMO_3)
-    new_paths = g.step([["start"]])
-    assert len(new_paths) == 226
-    # Real
-    g = Graph(data)
-    new_paths = g.step([["start"]])
-    print("Part 1:", len(new_paths))
+    assert part_1(RAW_DEMO_1) == 10
+    assert len(list(Graph(RAW_DEMO_1).paths())) == 10
+    assert part_1(RAW_DEMO_2) == 19
+    assert part_1(RAW_DEMO_3) == 226
+    print("Part 1:", part_1(data))
 
     # Part 2
-    # Demo 1
-    g = Graph(RAW_DEMO_1)
-    new_paths = g.step([["start"]], small_q_once=2)
-    assert len(new_paths) == 36
-    # Demo 2
-    g = Graph(RAW_DEMO_2)
-    new_paths = g.step([["start"]], small_q_once=2)
-    assert len(new_paths) == 103
-    # Demo 3
-    g = Graph(RAW_DEMO_3)
-    new_paths = g.step([["start"]], small_q_once=2)
-    assert len(new_paths) == 3509
-    # Real
-    print("This part is not optimized!!!")
-    g = Graph(data)
-    new_paths = g.step([["start"]], small_q_once=2)
-    print("Part 2:", len(new_paths))
+    assert part_2(RAW_DEMO_1) == 36
+    assert part_2(RAW_DEMO_2) == 103
+    assert part_2(RAW_DEMO_3) == 3509
+    print("Part 2:", part_2(data))
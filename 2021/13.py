@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import List, NamedTuple
 
+from aoc.grid import Grid
 
 RAW_DEMO = """\
 6,10
@@ -47,23 +48,17 @@ class Paper:
         points, folds = data.strip().split("\n\n")
         self.points = self.parse_points(points)
         self.folds = self.parse_folds(folds)
-        max_point = self.get_max_points()
-        self.size = (max_point.y + 1, max_point.x + 1)
-        self.grid = self.create_grid()
+        self.grid = Grid.from_coords(
+            (point.y for point in self.points), (point.x for point in self.points)
+        )
 
-    def create_grid(self) -> List[List[int]]:
-        grid = [
-            [False for _ in range(self.size[1])] for _ in range(self.size[0])
-        ]
-        for point in self.points:
-            grid[point.y][point.x] = True
-        return grid
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.grid.shape
 
     @staticmethod
     def parse_points(points: str) -> List[Point]:
-        return [
-            Point(*map(int, point.split(","))) for point in points.split("\n")
-        ]
+        return [Point(*map(int, point.split(","))) for point in points.split("\n")]
 
     @staticmethod
     def parse_folds(folds: str) -> List[Fold]:
@@ -72,16 +67,8 @@ class Paper:
             for fold in folds.split("\n")
         ]
 
-    def get_max_points(self) -> Point:
-        x, y = 0, 0
-        for point in self.points:
-            x = max(x, point.x)
-            y = max(y, point.y)
-        return Point(x, y)
-
     def __str__(self) -> str:
-        to_char = lambda x: "#" if x else "."
-        return "\n".join(["".join(map(to_char, row)) for row in self.grid])
+        return self.grid.to_str(".#")
 
     def __repr__(self) -> str:
         return str(self)
@@ -94,30 +81,31 @@ class Paper:
 
     def fold_along(self, direction: Direction, value: int):
         if direction == Direction.x:
-            self.fold_along_x(value)
+            self.grid = self.fold_up(self.grid.transpose(), value).transpose()
         elif direction == Direction.y:
-            self.fold_along_y(value)
+            self.grid = self.fold_up(self.grid, value)
         else:
             raise ValueError(f"Unknown direction: {direction}")
 
-    def fold_along_x(self, value: int):
-        new_grid = [[False for _ in range(value)] for _ in range(self.size[0])]
-        for y in range(len(self.grid)):
-            a = self.grid[y][:value]
-            b = self.grid[y][value + 1 :][::-1]
-            new_grid[y] = [xx + yy for xx, yy in zip(a, b)]
-        self.grid = new_grid
-        self.size = (len(self.grid), len(self.grid[0]))
-
-    def fold_along_y(self, value: int):
-        a = self.grid[:value]
-        b = self.grid[value + 1 :][::-1]
-        assert len(a) == len(b), f"{len(a)} != {len(b)}"
-        self.grid = [[xx + yy for xx, yy in zip(x, y)] for x, y in zip(a, b)]
-        self.size = (len(self.grid), len(self.grid[0]))
+    @staticmethod
+    def fold_up(grid: Grid, value: int) -> Grid:
+        # row value + k lands on row value - k; the bottom part may be shorter
+        # than the top one when the last rows have no dots
+        top = grid[:value].copy()
+        bottom = grid.flip(0)[: grid.height - value - 1]
+        top[value - bottom.shape[0] :] |= bottom
+        return Grid(top)
 
     def count_points(self) -> int:
-        return sum(sum([1 if x else 0 for x in row]) for row in self.grid)
+        return self.grid.count(True)
+
+
+def part_1(data: str) -> int:
+    return Paper(data).fold(just_first=True).count_points()
+
+
+def part_2(data: str) -> str:
+    return str(Paper(data).fold(just_first=False))
 
 
 if __name__ == "__main__":
@@ -125,20 +113,9 @@ if __name__ == "__main__":
     with open("data/13.txt") as f:
         data = f.read()
     # Part 1
-    # Demo
-    p = Paper(RAW_DEMO)
-    p.fold(just_first=True)
-    assert p.count_points() == 17
-    # Real
-    p = Paper(data)
-    p.fold(just_first=True)
-    print("Part 1:", p.count_points())
-    p = Paper(data)
-    p.fold(just_first=True)
+    assert part_1(RAW_DEMO) == 17
+    print("Part 1:", part_1(data))
 
     # Part 2
-    # Real
-    p = Paper(data)
-    p.fold(just_first=False)
-    print("Part 2:", p.count_points())
-    print(p)
+    print("Part 2:")
+    print(part_2(data))
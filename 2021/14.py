@@ -1,6 +1,8 @@
-from collections import defaultdict
-from typing import Dict
+from typing import Dict, List, Sequence
 
+import numpy as np
+
+from aoc.matrix import advance
 
 RAW_DEMO = """\
 NNCB
@@ -25,18 +27,24 @@ CN -> C
 
 
 class Polymer:
-    def __init__(self, data: str) -> None:
+    """
+    The template as counts of its overlapping pairs of letters. A step turns
+    each pair AB with a rule AB -> C into AC and CB, a linear map on the pair
+    counts, so any number of steps is a power of its matrix.
+    """
+
+    def __init__(self, data: str, extra_letters: str = "") -> None:
         sequence, rules = data.strip().split("\n\n")
         self.rules_dict = self.parse_rules(rules)
         self.sequence_str = sequence
+        # every letter in play fixes the pair indices, so polymers with the
+        # same rules and letters share a transition matrix
+        self.letters = sorted(
+            set(sequence + extra_letters)
+            | {c for rule in self.rules_dict.items() for c in "".join(rule)}
+        )
         self.steps = 0
-        self.sequence_histogram = self.create_sequence_histogram()
-
-    def create_sequence_histogram(self) -> Dict[str, int]:
-        histogram = defaultdict(lambda: 0)
-        for i in range(len(self.sequence_str) - 1):
-            histogram[self.sequence_str[i : i + 2]] += 1
-        return histogram
+        self.sequence_histogram = self.create_sequence_histogram(sequence)
 
     @staticmethod
     def parse_rules(rules: str) -> Dict[str, str]:
@@ -44,29 +52,47 @@ class Polymer:
             rule.split(" -> ")[0]: rule.split(" -> ")[1] for rule in rules.split("\n")
         }
 
-    def step(self, steps: int = 1) -> None:
-        for _ in range(steps):
-            self.step_once()
-
-    def step_once(self) -> None:
-        new_hist = defaultdict(lambda: 0)
-        for seq, count in self.sequence_histogram.items():
-            seq1, seq2 = seq[0] + self.rules_dict[seq], self.rules_dict[seq] + seq[1]
-            new_hist[seq1] += count
-            new_hist[seq2] += count
-        self.sequence_histogram = new_hist
+    def pair_index(self, a: str, b: str) -> int:
+        return self.letters.index(a) * len(self.letters) + self.letters.index(b)
+
+    def create_sequence_histogram(self, sequence: str) -> np.ndarray:
+        pairs = [self.pair_index(a, b) for a, b in zip(sequence, sequence[1:])]
+        return np.bincount(pairs, minlength=len(self.letters) ** 2)
+
+    def transition(self) -> np.ndarray:
+        """Pair counts after a step from the counts before, pairs without a rule kept."""
+        n = len(self.letters) ** 2
+        step = np.zeros((n, n), dtype=np.int64)
+        for a in self.letters:
+            for b in self.letters:
+                pair = self.pair_index(a, b)
+                if a + b in self.rules_dict:
+                    c = self.rules_dict[a + b]
+                    step[self.pair_index(a, c), pair] += 1
+                    step[self.pair_index(c, b), pair] += 1
+                else:
+                    step[pair, pair] = 1
+        return step
 
-        self.steps += 1
+    def step(self, steps: int = 1) -> None:
+        self.sequence_histogram = advance(
+            self.transition(), self.sequence_histogram, steps
+        )
+        self.steps += steps
 
     def letter_histogram(self) -> Dict[str, int]:
-        letter_hist = defaultdict(lambda: 0)
-        for k, v in self.sequence_histogram.items():
-            letter_hist[k[1]] += v
+        """
+        Every letter but the first is the second of one pair; the first
+        letter of the template stays first forever.
+        """
+        counts = np.asarray(self.sequence_histogram).reshape(len(self.letters), -1)
+        letter_hist = dict(zip(self.letters, counts.sum(axis=0).tolist()))
+        letter_hist[self.sequence_str[0]] += 1
         return letter_hist
 
     def generate_solution(self) -> int:
-        letter_hist = self.letter_histogram()
-        return max(letter_hist.values()) - min(letter_hist.values())
+        letter_hist = [v for v in self.letter_histogram().values() if v]
+        return max(letter_hist) - min(letter_hist)
 
     def __str__(self) -> str:
         return f"{self.sequence_histogram} after {self.steps} steps"
@@ -75,24 +101,41 @@ class Polymer:
         return str(self)
 
 
+def solve_many(templates: Sequence[str], rules: str, steps: int) -> List[int]:
+    """``generate_solution`` for each template, sharing one matrix power."""
+    letters = "".join(set("".join(templates)))
+    polymers = [Polymer(f"{t}\n\n{rules}", letters) for t in templates]
+    states = advance(
+        polymers[0].transition(),
+        np.stack([p.sequence_histogram for p in polymers]),
+        steps,
+    )
+    for polymer, state in zip(polymers, states):
+        polymer.sequence_histogram, polymer.steps = state, steps
+    return [polymer.generate_solution() for polymer in polymers]
+
+
+def part_1(data: str, steps: int = 10) -> int:
+    p = Polymer(data)
+    p.step(steps)
+    return p.generate_solution()
+
+
+def part_2(data: str, steps: int = 40) -> int:
+    p = Polymer(data)
+    p.step(steps)
+    return p.generate_solution()
+
+
 if __name__ == "__main__":
     # Data
     with open("data/14.txt") as f:
         data = f.read()
     # Part 1
-    # Demo
-    p = Polymer(RAW_DEMO)
-    p.step(10)
-    assert p.generate_solution() == 1588
-    # Real
-    p = Polymer(data)
-    p.step(10)
-    print("Part 1:", p.generate_solution())
+    assert part_1(RAW_DEMO) == 1588
+    rules = RAW_DEMO.split("\n\n")[1]
+    assert solve_many(["NNCB", "NNCB"], rules, 10) == [1588, 1588]
+    print("Part 1:", part_1(data))
     # Part 2
-    # Demo
-    p = Polymer(RAW_DEMO)
-    p.step(40)
-    assert p.generate_solution() == 2188189693529
-    p = Polymer(data)
-    p.step(40)
-    print("Part 2:", p.generate_solution())
+    assert part_2(RAW_DEMO) == 2188189693529
+    print("Part 2:", part_2(data))
@@ -1,8 +1,7 @@
-from typing import List, Optional
-
 import numpy as np
-from numba import jit
-from scipy.sparse import lil_matrix
+
+from aoc.grid import Grid
+from aoc.lazy import njit
 
 RAW_DEMO = """\
 1163751742
@@ -18,107 +17,78 @@ RAW_DEMO = """\
 """
 
 
-@jit(nopython=True)
-def min_distance_idx(dist: List[int], ignore: List[bool]) -> int:
-    min = np.iinfo(np.int32).max
-    for v in range(len(dist)):
-        if dist[v] < min and not ignore[v]:
-            min = dist[v]
-            min_index = v
-    return min_index
+@njit
+def lowest_total_risk(base: np.ndarray, tiles: int) -> int:
+    """
+    Risk of the safest path from the top left to the bottom right of the map
+    made of ``tiles`` x ``tiles`` copies of ``base``, the risk of each copy
+    raised by its distance in tiles from the first one and wrapped back to 1
+    after 9. Risks are worked out per position as the search reaches it, so
+    only the distances take memory.
 
+    Dial's algorithm: with risks of 1 to 9, the positions waiting at a
+    distance from d to d + 9 fit in 10 buckets reused circularly. A position
+    is pushed again only when its distance drops, so entries whose distance
+    is stale are skipped when popped.
+    """
+    h, w = base.shape
+    height, width = h * tiles, w * tiles
+    target = height * width - 1
+    dist = np.full(height * width, np.iinfo(np.int32).max, dtype=np.int32)
+    n_buckets = 10
+    buckets = np.empty((n_buckets, max(width, 16)), dtype=np.int64)
+    sizes = np.zeros(n_buckets, dtype=np.int64)
+    dist[0], buckets[0, 0], sizes[0] = 0, 0, 1
+    pending, d = 1, 0
+    while pending:
+        b = d % n_buckets
+        while sizes[b]:
+            sizes[b] -= 1
+            u = buckets[b, sizes[b]]
+            pending -= 1
+            if dist[u] != d:
+                continue
+            if u == target:
+                return d
+            i, j = u // width, u % width
+            for di, dj in ((-1, 0), (0, -1), (0, 1), (1, 0)):
+                ni, nj = i + di, j + dj
+                if not (0 <= ni < height and 0 <= nj < width):
+                    continue
+                risk = (base[ni % h, nj % w] + ni // h + nj // w - 1) % 9 + 1
+                v, alt = ni * width + nj, d + risk
+                if alt < dist[v]:
+                    dist[v] = alt
+                    nb = alt % n_buckets
+                    if sizes[nb] == buckets.shape[1]:
+                        grown = np.empty((n_buckets, 2 * buckets.shape[1]), np.int64)
+                        grown[:, : buckets.shape[1]] = buckets
+                        buckets = grown
+                    buckets[nb, sizes[nb]] = v
+                    sizes[nb] += 1
+                    pending += 1
+        d += 1
+    return -1
 
-class Graph:
-    def __init__(self, data: str, expand_n: Optional[int] = 1) -> None:
-        assert expand_n > 0, "expand_n must be greater than 0"
-        grid = np.array(
-            [[int(y) for y in x] for x in data.strip().split("\n")], dtype=np.int8
-        )
-        if expand_n > 1:
-            grid = self.expand_grid(grid=grid, n=expand_n)
-        self.size = (len(grid), len(grid[0]))
-        self.V = self.size[0] * self.size[1]
-        self.build_graph(grid)
 
-    @staticmethod
-    def expand_grid(grid: List[List[int]], n: int) -> List[List[int]]:
-        size = (len(grid), len(grid[0]))
-        new_grid = np.zeros((size[1] * n, size[0] * n), dtype=np.int8)
-        for j in range(size[1] * n):
-            for i in range(size[0] * n):
-                new_grid[j][i] = (
-                    x % 10
-                    if (
-                        x := (
-                            grid[j % size[1]][i % size[0]] + j // size[1] + i // size[0]
-                        )
-                    )
-                    < 10
-                    else x % 10 + 1
-                )
-        return new_grid
+def parse(data: str) -> np.ndarray:
+    return Grid.from_digits(data.strip(), dtype=np.int64).array
 
-    def build_graph(self, data: List[List[int]]) -> None:
-        graph = lil_matrix((self.V, self.V), dtype=np.int8)
-        get_neighbors = lambda i, j: [
-            (x, y)
-            for x, y in [
-                (i - 1, j),
-                (i + 1, j),
-                (i, j - 1),
-                (i, j + 1),
-            ]
-            if 0 <= x < self.size[0] and 0 <= y < self.size[1]
-        ]
 
-        for i in range(self.size[0]):
-            for j in range(self.size[1]):
-                neighbors = get_neighbors(i, j)
-                for ii, jj in neighbors:
-                    graph[i * self.size[0] + j, ii * self.size[0] + jj] = data[ii][jj]
-        self.graph = graph.tocsr()
+def part_1(data: str) -> int:
+    return lowest_total_risk(parse(data), 1)
 
-    @staticmethod
-    @jit(nopython=True)
-    def dijkstra(
-        graph: np.ndarray, iis: np.ndarray, jjs: np.ndarray, n: int, src: int
-    ) -> np.ndarray:
-        dist = np.ones((n,), dtype=np.int32) * np.iinfo(np.int32).max
-        dist[src] = 0
-        ignore = np.zeros(n, dtype=np.int8)
-        for _ in range(n):
-            u = min_distance_idx(dist, ignore)
-            ignore[u] = True
-            for i in range(iis[u], iis[u + 1]):
-                if not ignore[jjs[i]] and dist[jjs[i]] > dist[u] + graph[i]:
-                    dist[jjs[i]] = dist[u] + graph[i]
-        return dist
 
-    def dijk(self, source: int) -> List[int]:
-        dist = self.dijkstra(
-            self.graph.data,
-            self.graph.indptr,
-            self.graph.indices,
-            self.size[0] ** 2,
-            source,
-        )
-        return [dist[node] for node in range(self.V)]
+def part_2(data: str, tiles: int = 5) -> int:
+    return lowest_total_risk(parse(data), tiles)
 
 
 if __name__ == "__main__":
     with open("data/15.txt") as f:
         data = f.read()
     # Part 1
-    # Demo
-    f = Graph(RAW_DEMO)
-    assert (x := f.dijk(0)[-1]) == 40, f"Part 1 Demo Failed: {x}"
-    # Real
-    f = Graph(data)
-    print("Part 1", f.dijk(0)[-1])
+    assert (x := part_1(RAW_DEMO)) == 40, f"Part 1 Demo Failed: {x}"
+    print("Part 1", part_1(data))
     # Part 2
-    # Demo
-    f = Graph(RAW_DEMO, expand_n=5)
-    assert f.dijk(0)[-1] == 315
-    # Real
-    f = Graph(data, expand_n=5)
-    print("Part 2", f.dijk(0)[-1])
+    assert part_2(RAW_DEMO) == 315
+    print("Part 2", part_2(data))
@@ -1,9 +1,7 @@
 import operator
-import functools
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Tuple, Union
-
+from typing import Any, Callable, List, Tuple, Union
 
 RAW_DEMO_1 = "D2FE28"
 RAW_DEMO_2 = "38006F45291200"
@@ -33,146 +31,198 @@ class PacketType(int, Enum):
     equal_to = 7
 
 
-@dataclass
-class Packet:
-    version: int
-    type_id: int
-    type: PacketType
-    value: Union[List["Packet"], int]
-    _bits: int = 0
+# how an operator folds the values of its sub-packets, one at a time
+OPERATORS: dict[PacketType, Callable[[int, int], int]] = {
+    PacketType.sum: operator.add,
+    PacketType.product: operator.mul,
+    PacketType.minimum: min,
+    PacketType.maximum: max,
+    PacketType.greater_than: lambda a, b: int(a > b),
+    PacketType.less_than: lambda a, b: int(a < b),
+    PacketType.equal_to: lambda a, b: int(a == b),
+}
 
-    @classmethod
-    def from_hex(cls, data: str) -> "Packet":
-        decoded = cls.hex_to_binary(data)
-        version, type_id = cls.get_header(decoded)
-        return cls(
-            version,
-            type_id,
-            (x := cls.get_type(type_id)),
-            (y := cls.get_value(x, decoded[6:]))[0],
-            (6 + y[1]),
-        )
 
-    @classmethod
-    def from_bin(cls, data: str) -> "Packet":
-        version, type_id = cls.get_header(data)
-        return cls(
-            version,
-            type_id,
-            (x := cls.get_type(type_id)),
-            (y := cls.get_value(x, data[6:]))[0],
-            (6 + y[1]),
-        )
+class BitReader:
+    """A cursor over the bits of the raw message, most significant first."""
 
-    @staticmethod
-    def get_type(type_id: int) -> PacketType:
-        return PacketType(type_id)
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
 
-    @staticmethod
-    def get_value(
-        ptype: PacketType, data: str
-    ) -> Tuple[Union[List["Packet"], int], int]:
-        if ptype == PacketType.literal:
-            return Packet.get_literal_value(data)
+    @classmethod
+    def from_hex(cls, data: str) -> "BitReader":
+        data = data.strip()
+        # a trailing half byte only holds padding
+        return cls(bytes.fromhex(data + "0" * (len(data) % 2)))
+
+    def read(self, n: int) -> int:
+        start, end = self.pos >> 3, (self.pos + n + 7) >> 3
+        value = int.from_bytes(self.data[start:end], "big")
+        value >>= (end << 3) - self.pos - n
+        self.pos += n
+        return value & ((1 << n) - 1)
+
+    def read_literal(self) -> int:
+        value = 0
+        while True:
+            group = self.read(5)
+            value = value << 4 | group & 0b1111
+            if not group & 0b10000:
+                return value
+
+
+class Frame:
+    """An operator packet whose sub-packets are still being read."""
+
+    __slots__ = ("start", "version", "type_id", "end", "remaining", "state")
+
+    def __init__(self, start: int, version: int, type_id: int, state: Any):
+        self.start = start
+        self.version = version
+        self.type_id = type_id
+        self.end = None  # bit position after the sub-packets, or
+        self.remaining = None  # number of sub-packets left
+        self.state = state
+
+    def done(self, pos: int) -> bool:
+        return pos >= self.end if self.remaining is None else self.remaining == 0
+
+
+def walk(reader: BitReader, builder: Any) -> Any:
+    """
+    Decode the outermost packet in one pass without recursion. ``builder``
+    turns literals into items, starts a state for each operator, adds the
+    items of its sub-packets to that state and finishes it into an item.
+    """
+    stack: List[Frame] = []
+    while True:
+        start = reader.pos
+        version, type_id = reader.read(3), reader.read(3)
+        if type_id == PacketType.literal:
+            value = reader.read_literal()
+            item = builder.literal(version, value, reader.pos - start)
         else:
-            return Packet.get_operator_value(data)
+            frame = Frame(start, version, type_id, builder.start(type_id))
+            if reader.read(1):
+                frame.remaining = reader.read(11)
+            else:
+                length = reader.read(15)
+                frame.end = reader.pos + length
+            if not frame.done(reader.pos):
+                stack.append(frame)
+                continue
+            item = builder.finish(frame, reader.pos - start)
+        while stack:
+            frame = stack[-1]
+            frame.state = builder.add(frame, item)
+            if frame.remaining is not None:
+                frame.remaining -= 1
+            if not frame.done(reader.pos):
+                break
+            stack.pop()
+            item = builder.finish(frame, reader.pos - frame.start)
+        else:
+            return item
+
 
+class TreeBuilder:
     @staticmethod
-    def get_operator_value(data: str) -> List["Packet"]:
-        length_type_id = int(data[0])
-        packets = []
-        if length_type_id == 0:
-            bits_len = int(data[1:16], 2)
-            packets.append(Packet.from_bin(data[16 : 16 + bits_len]))
-            while (x := sum([x._bits for x in packets])) < bits_len:
-                packets.append(Packet.from_bin(data[16 + x : 16 + bits_len]))
-            return packets, bits_len + 16
-        elif length_type_id == 1:
-            sub_packets = int(data[1:12], 2)
-            packets.append(Packet.from_bin(data[12:]))
-            while len(packets) < sub_packets:
-                skip_bits = sum([x._bits for x in packets])
-                packets.append(Packet.from_bin(data[12 + skip_bits :]))
-            bits = sum([x._bits for x in packets])
-            return packets, 12 + bits
-        else:
-            raise ValueError(f"Unknown operator length type: {length_type_id}")
+    def literal(version: int, value: int, bits: int) -> "Packet":
+        return Packet(version, PacketType.literal, PacketType.literal, value, bits)
 
     @staticmethod
-    def get_literal_value(data: str) -> Tuple[int, int]:
-        vs = []
-        c = 0
-        while True:
-            vs.append(data[c + 1 : c + 5])
-            if data[c] == "0":
-                break
-            c += 5
-        return int("".join(vs), 2), c + 5
+    def start(type_id: int) -> List["Packet"]:
+        return []
 
     @staticmethod
-    def hex_to_binary(data: str) -> str:
-        decoded = "".join([bin(int(x, 16))[2:].zfill(4) for x in data])
-        return decoded
+    def add(frame: Frame, packet: "Packet") -> List["Packet"]:
+        frame.state.append(packet)
+        return frame.state
 
     @staticmethod
-    def get_header(data: str) -> Tuple[int, int]:
-        v = data[0:3]
-        t = data[3:6]
-        return int(v, 2), int(t, 2)
+    def finish(frame: Frame, bits: int) -> "Packet":
+        type = PacketType(frame.type_id)
+        return Packet(frame.version, frame.type_id, type, frame.state, bits)
 
-    def sum_versions(self) -> int:
-        v = self.version
-        if isinstance(self.value, list):
-            for p in self.value:
-                v += p.sum_versions()
-        return v
-
-    def operator(self) -> str:
-        if self.type == PacketType.sum:
-            return "sum"
-        elif self.type == PacketType.product:
-            return "prod"
-        elif self.type == PacketType.minimum:
-            return "min"
-        elif self.type == PacketType.maximum:
-            return "max"
-        elif self.type == PacketType.less_than:
-            return "less"
-        elif self.type == PacketType.greater_than:
-            return "greater"
-        elif self.type == PacketType.equal_to:
-            return "equal"
-        else:
-            raise ValueError(f"Unknown operator: {self.type}")
-
-    def to_math_expresion(self) -> str:
-        if isinstance(self.value, list):
-            return (
-                self.operator()
-                + "("
-                + "["
-                + ",".join([x.to_math_expresion() for x in self.value])
-                + "]"
-                + ")"
-            )
-        else:
-            return str(self.value)
 
+class Evaluator:
+    """Items are (sum of versions, value); operators fold them as they come."""
 
-def prod(*args) -> float:
-    return functools.reduce(operator.mul, *args, 1)
+    @staticmethod
+    def literal(version: int, value: int, bits: int) -> Tuple[int, int]:
+        return version, value
 
+    @staticmethod
+    def start(type_id: int) -> None:
+        return None
 
-def less(*args) -> bool:
-    return functools.reduce(operator.lt, *args)
+    @staticmethod
+    def add(frame: Frame, item: Tuple[int, int]) -> Tuple[int, int]:
+        if frame.state is None:
+            return item
+        (versions, value), (more_versions, other) = frame.state, item
+        fold = OPERATORS[frame.type_id]
+        return versions + more_versions, fold(value, other)
 
+    @staticmethod
+    def finish(frame: Frame, bits: int) -> Tuple[int, int]:
+        versions, value = frame.state or (0, 0)
+        return frame.version + versions, value
 
-def greater(*args) -> bool:
-    return functools.reduce(operator.gt, *args)
 
+@dataclass
+class Packet:
+    version: int
+    type_id: int
+    type: PacketType
+    value: Union[List["Packet"], int]
+    _bits: int = 0
 
-def equal(*args) -> bool:
-    return functools.reduce(operator.eq, *args)
+    @classmethod
+    def from_hex(cls, data: str) -> "Packet":
+        return walk(BitReader.from_hex(data), TreeBuilder)
+
+    def sum_versions(self) -> int:
+        total, stack = 0, [self]
+        while stack:
+            packet = stack.pop()
+            total += packet.version
+            if isinstance(packet.value, list):
+                stack.extend(packet.value)
+        return total
+
+    def evaluate(self) -> int:
+        """The value of the expression, folding sub-packets bottom-up."""
+        values, stack = [], [(self, False)]
+        while stack:
+            packet, expanded = stack.pop()
+            if not isinstance(packet.value, list):
+                values.append(packet.value)
+            elif not expanded:
+                stack.append((packet, True))
+                stack.extend((p, False) for p in reversed(packet.value))
+            else:
+                n = len(packet.value)
+                args, values[len(values) - n :] = values[len(values) - n :], []
+                value = args[0] if args else 0
+                for arg in args[1:]:
+                    value = OPERATORS[packet.type](value, arg)
+                values.append(value)
+        return values[0]
+
+
+def evaluate(data: str) -> Tuple[int, int]:
+    """Sum of the versions and value of a transmission, without a tree."""
+    return walk(BitReader.from_hex(data), Evaluator)
+
+
+def part_1(data: str) -> int:
+    return evaluate(data)[0]
+
+
+def part_2(data: str) -> int:
+    return evaluate(data)[1]
 
 
 if __name__ == "__main__":
@@ -259,31 +309,29 @@ if __name__ == "__main__":
     assert c.sum_versions() == 31
 
     # Real
-    c = Packet.from_hex(data)
-    print("Part 1:", c.sum_versions())
+    print("Part 1:", part_1(data))
 
     # Part 2
     # Demo 8
     c = Packet.from_hex(RAW_DEMO_8)
-    assert eval(c.to_math_expresion()) == 3
+    assert c.evaluate() == 3
     # Demo 9
     c = Packet.from_hex(RAW_DEMO_9)
-    assert eval(c.to_math_expresion()) == 54
+    assert c.evaluate() == 54
     # Demo 10
     c = Packet.from_hex(RAW_DEMO_10)
-    assert eval(c.to_math_expresion()) == 7
+    assert c.evaluate() == 7
     # Demo 11
     c = Packet.from_hex(RAW_DEMO_11)
-    assert eval(c.to_math_expresion()) == 9
+    assert c.evaluate() == 9
     # Demo 12
     c = Packet.from_hex(RAW_DEMO_12)
-    assert eval(c.to_math_expresion()) == 1
+    assert c.evaluate() == 1
     # Demo 13
     c = Packet.from_hex(RAW_DEMO_13)
-    assert eval(c.to_math_expresion()) == 0
+    assert c.evaluate() == 0
     # Demo 14
     c = Packet.from_hex(RAW_DEMO_14)
-    assert eval(c.to_math_expresion()) == 0
+    assert c.evaluate() == 0
     # Real
-    c = Packet.from_hex(data)
-    print("Part 2:", eval(c.to_math_expresion()))
+    print("Part 2:", part_2(data))
@@ -1,8 +1,7 @@
-from dataclasses import dataclass, field
-from typing import List, Tuple
-
-from tqdm import tqdm
-
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import List, Tuple, Union
 
 RAW_DEMK_1 = "target area: x=20..30, y=-10..-5"
 
@@ -13,29 +12,6 @@ class Vec2D:
     y: int
 
 
-sign = lambda x: (1, -1)[x < 0]
-
-
-@dataclass
-class Probe:
-    vel: Vec2D
-    ace: Vec2D = field(default_factory=lambda: Vec2D(0, -1))
-    pos: Vec2D = field(default_factory=lambda: Vec2D(0, 0))
-    drag: int = 1
-
-    def step(self) -> "Probe":
-        # change position
-        self.pos.x += self.vel.x
-        self.pos.y += self.vel.y
-        # drag force
-        self.vel.x -= (self.drag) * sign(self.vel.x) if self.vel.x else 0
-        # change velocity
-        self.vel.x += self.ace.x
-        self.vel.y += self.ace.y
-
-        return self
-
-
 @dataclass
 class Target:
     a: Vec2D
@@ -48,45 +24,94 @@ class Target:
         y = y.split("=")[1].split("..")
         return cls(Vec2D(int(x[0]), int(y[0])), Vec2D(int(x[1]), int(y[1])))
 
-    def intersect(self, probe: Probe) -> bool:
-        return (self.a.x <= probe.pos.x <= self.b.x) and (
-            self.a.y <= probe.pos.y <= self.b.y
-        )
-
-    def miss(self, probe: Probe) -> bool:
-        return probe.pos.x > self.b.x or probe.pos.y < self.a.y
-
-
-def get_valocities(target: Target, y_limit: int, iters: int) -> List[Tuple[Vec2D, int]]:
-    velocities = []
-    for j in tqdm(range(y_limit, -y_limit, -1)):
-        for i in range(1, target.b.x + 1):
-            p = Probe(vel=Vec2D(i, j))
-            for step in range(iters):
-                p.step()
-                if target.intersect(p):
-                    velocities.append((Vec2D(i, j), step))
-                    break
-                elif target.miss(p):
-                    break
-    return velocities
-
-
-def find_max_y_vel(
-    target: str, y_limit: int, iters: int = 500
-) -> Tuple[Tuple[Vec2D, int], int]:
-    return (
-        max(
-            (x := get_valocities(Target.from_str(target), y_limit, iters)),
-            key=lambda x: x[0].y,
-        ),
-        len(x),
-    )
-
 
-def find_max_y_pos(vel: Vec2D, iters: int = 500) -> int:
-    p = Probe(vel=vel)
-    return max([p.step().pos.y for _ in range(iters)])
+# A window is the first and last step at which one coordinate of the probe is
+# inside the target; x can stay inside forever once drag has stopped it.
+Window = Tuple[int, Union[int, float]]
+
+
+def position(v: int, n: int) -> int:
+    """Coordinate after ``n`` steps thrown at ``v``, before drag stops it."""
+    return n * v - n * (n - 1) // 2
+
+
+def rising(v: int, bound: int) -> int:
+    """First step at which a coordinate thrown at ``v`` reaches ``bound``."""
+    # smaller root of n^2 - (2v + 1) n + 2 bound = 0, fixed up for rounding
+    b = 2 * v + 1
+    n = (b - math.isqrt(b * b - 8 * bound)) // 2
+    while position(v, n) < bound:
+        n += 1
+    while n > 0 and position(v, n - 1) >= bound:
+        n -= 1
+    return n
+
+
+def falling(v: int, bound: int) -> int:
+    """First step at which it is below ``bound <= 0`` on its way down."""
+    b = 2 * v + 1
+    n = (b + math.isqrt(b * b - 8 * bound)) // 2 + 1
+    while position(v, n) >= bound:
+        n += 1
+    while position(v, n - 1) < bound:
+        n -= 1
+    return n
+
+
+def x_windows(target: Target) -> List[Window]:
+    windows = []
+    for vx in range(1, target.b.x + 1):
+        stop = vx * (vx + 1) // 2
+        if stop < target.a.x:
+            continue
+        first = rising(vx, target.a.x)
+        last = math.inf if stop <= target.b.x else rising(vx, target.b.x + 1) - 1
+        if first <= last:
+            windows.append((first, last))
+    return windows
+
+
+def y_windows(target: Target) -> List[Tuple[int, Window]]:
+    # thrown up at vy, the probe is back at 0 going -vy - 1, so anything
+    # faster than -a.y overshoots on the first step below 0
+    windows = []
+    for vy in range(-target.a.y - 1, target.a.y - 1, -1):
+        first, last = falling(vy, target.b.y + 1), falling(vy, target.a.y) - 1
+        if first <= last:
+            windows.append((vy, (first, last)))
+    return windows
+
+
+def solve(data: str) -> Tuple[int, int]:
+    """
+    Highest point reached and number of initial velocities that hit the
+    target. Both axes move independently, so a velocity hits when its x and y
+    windows overlap; with the x windows sorted by first and by last step,
+    each y window counts its overlaps with two bisections. Assumes the target
+    is right of the launcher and below it.
+    """
+    target = Target.from_str(data.strip())
+    if target.a.x <= 0 or target.b.y >= 0:
+        raise ValueError(f"Target {data.strip()!r} is not right of and below 0,0")
+    xs = x_windows(target)
+    firsts = sorted(first for first, _ in xs)
+    lasts = sorted(last for _, last in xs)
+    top, count = None, 0
+    for vy, (first, last) in y_windows(target):
+        # all x windows but those ending before and those starting after
+        hits = bisect_right(firsts, last) - bisect_left(lasts, first)
+        if hits and top is None:
+            top = vy * (vy + 1) // 2 if vy > 0 else 0
+        count += hits
+    return top, count
+
+
+def part_1(data: str) -> int:
+    return solve(data)[0]
+
+
+def part_2(data: str) -> int:
+    return solve(data)[1]
 
 
 if __name__ == "__main__":
@@ -95,13 +120,9 @@ if __name__ == "__main__":
         data = f.read().strip()
     # Part 1
     # Demo
-    assert find_max_y_vel(RAW_DEMK_1, 100)[0][0].y == 9
+    assert part_1(RAW_DEMK_1) == 45
     # Real
-    (vel, iters), q = find_max_y_vel(data, 1_000, 500)
-    p = Probe(vel=vel)
-    print("Part 1: ", find_max_y_pos(vel, iters))
+    print("Part 1: ", part_1(data))
     # Part 2
-    (vel, iters), q = find_max_y_vel(RAW_DEMK_1, 30, 400)
-    assert q == 112
-    (vel, iters), q = find_max_y_vel(data, 10_000, 5000)
-    print("Part 2:", q)
+    assert part_2(RAW_DEMK_1) == 112
+    print("Part 2:", part_2(data))
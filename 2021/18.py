@@ -1,6 +1,8 @@
-import ast
-import re
-from typing import List, Tuple
+import functools
+from typing import List, NamedTuple, Optional, Tuple
+
+from aoc.counters import counted
+from aoc.parallel import pool_workers, solver_pool
 
 # Test explode
 RAW_DEMO_1 = "[[[[[9,8],1],2],3],4]"
@@ -36,148 +38,162 @@ RAW_DEMO_7 = """\
 """
 
 
-PAIR_REGEXP = re.compile(r"(\[\d+,\d+\])")
-BRACKET_REGEXP = re.compile(r"(\[)|(\])")
-NUMBER_REGEXP = re.compile(r"(\d+)")
-
-
-def explode(number: str) -> str:
-    pairs: List[Tuple[Tuple[int, int], Tuple[int, int]]] = sorted(
-        [
-            (x, tuple(map(int, m.group(1)[1:-1].split(","))))
-            for m in PAIR_REGEXP.finditer(number)
-            if (x := m.span(1)) != (-1, -1)
-        ],
-        key=lambda x: x[0][0],
-    )
-
-    brackets: List[Tuple[int, str]] = [
-        (x[0], m.group(idx))
-        for idx in range(1, 3)
-        for m in BRACKET_REGEXP.finditer(number)
-        if (x := m.span(idx)) != (-1, -1)
-    ]
-    to_int = lambda x: 1 if x == "[" else -1
-    pairs_depth = [
-        sum([to_int(bracket) for pos, bracket in brackets if pos < span[0]])
-        for span, _ in pairs
-    ]
-    explode_idx = [i for i, depth in enumerate(pairs_depth) if depth >= 4]
-
-    if not len(explode_idx):
-        new_number = number
-    else:
-        span, values = pairs[explode_idx[0]]
-        numbers: List[Tuple[Tuple[int, int], int]] = sorted(
-            [
-                (m.span(idx), int(m.group(idx)))
-                for idx in range(1, 2)
-                for m in NUMBER_REGEXP.finditer(number)
-            ],
-            key=lambda x: x[0][0],
-        )
-        left_numbers = [
-            (span2, value) for span2, value in numbers if span2[1] < span[0]
-        ]
-        left_number = left_numbers[-1] if len(left_numbers) else None
-        right_numbers = [
-            (span2, value) for span2, value in numbers if span2[0] > span[1]
-        ]
-        right_number = right_numbers[0] if len(right_numbers) else None
-
-        if left_number is not None:
-            new_number = (
-                number[: left_number[0][0]]
-                + str(left_number[1] + values[0])
-                + number[left_number[0][1] : span[0]]
+MAX_DEPTH = 4
+# below this many numbers forking the pool costs more than it saves
+POOL_THRESHOLD = 40
+
+
+class Number(NamedTuple):
+    """
+    A snailfish number flattened to its regular numbers, left to right, with
+    the count of pairs around each. The two halves of a pair are neighbours
+    at the same depth, which is all reduction needs to know about the tree.
+    """
+
+    values: List[int]
+    depths: List[int]
+
+    @classmethod
+    def from_str(cls, text: str) -> "Number":
+        values, depths = [], []
+        depth, value = 0, None
+        for char in text:
+            if char.isdigit():
+                value = (value or 0) * 10 + int(char)
+                continue
+            if value is not None:
+                values.append(value)
+                depths.append(depth)
+                value = None
+            if char == "[":
+                depth += 1
+            elif char == "]":
+                depth -= 1
+        return cls(values, depths)
+
+    def __str__(self) -> str:
+        stack: List[Tuple[str, int]] = []
+        for value, depth in zip(self.values, self.depths):
+            item = (str(value), depth)
+            while stack and stack[-1][1] == item[1]:
+                left, _ = stack.pop()
+                item = (f"[{left},{item[0]}]", depth - 1)
+                depth -= 1
+            stack.append(item)
+        return stack[0][0]
+
+    def __add__(self, other: "Number") -> "Number":
+        return reduce(
+            explode(
+                Number(
+                    self.values + other.values,
+                    [d + 1 for d in self.depths] + [d + 1 for d in other.depths],
+                )
             )
-        else:
-            new_number = number[: span[0]]
-
-        new_number += "0"
-
-        if right_number is not None:
-            new_number += (
-                number[span[1] : right_number[0][0]]
-                + str(right_number[1] + values[1])
-                + number[right_number[0][1] :]
-            )
-        else:
-            new_number += number[span[1] :]
-
-    return new_number
-
-
-def split(number: str) -> str:
-    numbers: List[Tuple[Tuple[int, int], int]] = sorted(
-        [
-            (m.span(idx), x)
-            for idx in range(1, 2)
-            for m in NUMBER_REGEXP.finditer(number)
-            if (x := int(m.group(idx))) > 9
-        ],
-        key=lambda x: x[0][0],
-    )
-
-    if not len(numbers):
-        new_number = number
-    else:
-        span, value = numbers[0]
-        new_number = (
-            number[: span[0]]
-            + f"[{( x:= value//2)},{1 + x if value%2 else x}]"
-            + number[span[1] :]
         )
 
-    return new_number
-
-
-def sum_numbers(a: str, b: str) -> str:
-    return f"[{a},{b}]"
+    def magnitude(self) -> int:
+        stack: List[Tuple[int, int]] = []
+        for value, depth in zip(self.values, self.depths):
+            while stack and stack[-1][1] == depth:
+                left, _ = stack.pop()
+                value, depth = 3 * left + 2 * value, depth - 1
+            stack.append((value, depth))
+        return stack[0][0]
+
+
+@counted("explode")
+def explode(number: Number) -> Number:
+    """
+    Explode every pair nested too deep in one pass. Exploding never nests
+    anything deeper, so pairs can go left to right.
+    """
+    values: List[int] = []
+    depths: List[int] = []
+    carry, i, n = 0, 0, len(number.values)
+    while i < n:
+        value, depth = number.values[i] + carry, number.depths[i]
+        carry = 0
+        if depth > MAX_DEPTH and i + 1 < n and number.depths[i + 1] == depth:
+            if values:
+                values[-1] += value
+            carry = number.values[i + 1]
+            value, depth = 0, depth - 1
+            i += 1
+        values.append(value)
+        depths.append(depth)
+        i += 1
+    return Number(values, depths)
+
+
+def reduce(number: Number) -> Number:
+    """
+    Split the leftmost number over 9 until none is left, given no pair is
+    nested too deep. A split can only make a pair too deep where it happens,
+    and that pair is exploded at once; if that pushes the number on its left
+    over 9, it is the leftmost one to split and the scan steps back to it.
+    """
+    values, depths = list(number.values), list(number.depths)
+    i = 0
+    while i < len(values):
+        value = values[i]
+        if value < 10:
+            i += 1
+            continue
+        left, right, depth = value // 2, value - value // 2, depths[i] + 1
+        if depth <= MAX_DEPTH:
+            values[i : i + 1] = [left, right]
+            depths[i : i + 1] = [depth, depth]
+            continue
+        values[i] = 0
+        if i + 1 < len(values):
+            values[i + 1] += right
+        if i > 0:
+            values[i - 1] += left
+            if values[i - 1] >= 10:
+                i -= 1
+    return Number(values, depths)
+
+
+def parse(data: str) -> List[Number]:
+    return [Number.from_str(line) for line in data.strip().splitlines()]
+
+
+def sum_numbers(numbers: List[Number]) -> Number:
+    result = numbers[0]
+    for number in numbers[1:]:
+        result = result + number
+    return result
 
 
-def reduce_number(number: str) -> str:
-    while True:
-        new_number = explode(number)
-        if new_number == number:
-            new_number = split(number)
-            if new_number == number:
-                break
-            else:
-                number = new_number
-        else:
-            number = new_number
-    return number
+def _best_sum_from(numbers: List[Number], i: int) -> int:
+    return max(
+        (numbers[i] + number).magnitude() for j, number in enumerate(numbers) if j != i
+    )
 
 
-def sum_number_list(data: str) -> str:
-    data = data.strip().splitlines()
-    result = data[0]
-    for number in data[1:]:
-        result = reduce_number(sum_numbers(result, number))
-    return result
+def solution_2(data: str, workers: Optional[int] = None) -> int:
+    """
+    Largest magnitude of a sum of two different numbers. Each of the n rows
+    of sums (a fixed left operand) is one task on a process pool.
+    """
+    numbers = parse(data)
+    best_from = functools.partial(_best_sum_from, numbers)
+    rows = range(len(numbers))
+    workers = pool_workers(workers)
+    if workers == 1 or len(numbers) < POOL_THRESHOLD:
+        return max(map(best_from, rows))
+    with solver_pool(workers) as pool:
+        chunksize = max(1, len(numbers) // (4 * workers))
+        return max(pool.map(best_from, rows, chunksize=chunksize))
 
 
-def get_sum(data: list, mult: int = 1) -> int:
-    LEFT = 3
-    RIGHT = 2
-    if isinstance(data[0], list) and isinstance(data[1], list):
-        return get_sum(data[0], LEFT * mult) + get_sum(data[1], RIGHT * mult)
-    elif isinstance(data[0], list):
-        return get_sum(data[0], LEFT * mult) + data[1] * (RIGHT * mult)
-    elif isinstance(data[1], list):
-        return data[0] * (LEFT * mult) + get_sum(data[1], RIGHT * mult)
-    else:
-        return data[0] * (LEFT * mult) + data[1] * (RIGHT * mult)
+def part_1(data: str) -> int:
+    return sum_numbers(parse(data)).magnitude()
 
 
-def solution_2(data: str) -> int:
-    data = data.strip().splitlines()
-    values = [
-        get_sum(ast.literal_eval(reduce_number(sum_numbers(*pair))))
-        for pair in [(a, b) for a in data for b in data if a != b]
-    ]
-    return max(values)
+def part_2(data: str, workers: Optional[int] = None) -> int:
+    return solution_2(data, workers)
 
 
 if __name__ == "__main__":
@@ -186,27 +202,31 @@ if __name__ == "__main__":
         data = f.read()
     # Part 1
     # Explode
-    assert explode(RAW_DEMO_1) == "[[[[0,9],2],3],4]"
-    assert explode(RAW_DEMO_2) == "[7,[6,[5,[7,0]]]]"
-    assert explode(RAW_DEMO_3) == "[[6,[5,[7,0]]],3]"
-    assert explode(RAW_DEMO_4) == "[[3,[2,[8,0]]],[9,[5,[4,[3,2]]]]]"
-    assert explode(explode(RAW_DEMO_4)) == "[[3,[2,[8,0]]],[9,[5,[7,0]]]]"
+    explode_str = lambda text: str(explode(Number.from_str(text)))
+    assert explode_str(RAW_DEMO_1) == "[[[[0,9],2],3],4]"
+    assert explode_str(RAW_DEMO_2) == "[7,[6,[5,[7,0]]]]"
+    assert explode_str(RAW_DEMO_3) == "[[6,[5,[7,0]]],3]"
+    # both pairs in one pass
+    assert explode_str(RAW_DEMO_4) == "[[3,[2,[8,0]]],[9,[5,[7,0]]]]"
     # Split
-    assert split(RAW_DEMO_5) == "[[[[0,7],4],[[7,8],[0,13]]],[1,1]]"
-    assert split(split(RAW_DEMO_5)) == "[[[[0,7],4],[[7,8],[0,[6,7]]]],[1,1]]"
+    assert (
+        str(reduce(Number.from_str(RAW_DEMO_5))) == "[[[[0,7],4],[[7,8],[6,0]]],[8,1]]"
+    )
     # Reduce test
     assert (
-        reduce_number(sum_numbers("[[[[4,3],4],4],[7,[[8,4],9]]]", "[1,1]"))
+        str(Number.from_str("[[[[4,3],4],4],[7,[[8,4],9]]]") + Number.from_str("[1,1]"))
         == "[[[[0,7],4],[[7,8],[6,0]]],[8,1]]"
     )
     # Sum test
     assert (
-        sum_number_list(RAW_DEMO_6)
-    ) == "[[[[8,7],[7,7]],[[8,6],[7,7]]],[[[0,7],[6,6]],[8,7]]]"
+        str(sum_numbers(parse(RAW_DEMO_6)))
+        == "[[[[8,7],[7,7]],[[8,6],[7,7]]],[[[0,7],[6,6]],[8,7]]]"
+    )
+    assert Number.from_str("[[9,1],[1,9]]").magnitude() == 129
     # Solution 1
-    print("Part 1:", get_sum(ast.literal_eval(sum_number_list(data))))
+    print("Part 1:", part_1(data))
 
     # Part 2
     # Demo
-    assert solution_2(RAW_DEMO_7) == 3993
-    print("Part 2:", solution_2(data))
+    assert part_2(RAW_DEMO_7) == 3993
+    print("Part 2:", part_2(data))
@@ -1,5 +1,8 @@
-from typing import Iterable, Iterator, List, NamedTuple, Set, Tuple
+import itertools
+from collections import defaultdict, deque
+from typing import List
 
+import numpy as np
 
 RAW = """\
 --- scanner 0 ---
@@ -140,182 +143,163 @@ RAW = """\
 30,-46,-14
 """
 
+# overlapping scanners share at least 12 beacons, so 12 * 11 / 2 pairs
+MIN_SHARED_BEACONS = 12
+MIN_SHARED_PAIRS = MIN_SHARED_BEACONS * (MIN_SHARED_BEACONS - 1) // 2
+# a fingerprint packs the sorted absolute offsets between two beacons, which
+# turns do not change; unlike the squared distance alone it is rarely shared by
+# unrelated pairs, even with hundreds of scanners
+FINGERPRINT_BASE = 4001
 
-class Point3D(NamedTuple):
-    x: int
-    y: int
-    z: int
 
-    def rotate_x_90(self) -> "Point3D":
-        return Point3D(self.x, -self.z, self.y)
+def rotation_matrices() -> np.ndarray:
+    """The 24 orientations: signed permutation matrices with determinant 1."""
+    matrices = []
+    for perm in itertools.permutations(range(3)):
+        for signs in itertools.product((1, -1), repeat=3):
+            matrix = np.zeros((3, 3), dtype=np.int64)
+            matrix[range(3), perm] = signs
+            if round(np.linalg.det(matrix)) == 1:
+                matrices.append(matrix)
+    return np.array(matrices)
 
-    def rotate_y_90(self) -> "Point3D":
-        return Point3D(self.z, self.y, -self.x)
 
-    def rotate_z_90(self) -> "Point3D":
-        return Point3D(-self.y, self.x, self.z)
-
-    def euclidean_dist(self, other: "Point3D") -> float:
-        return (sum((x - y) ** 2 for x, y in zip(self, other))) ** 0.5
-
-    def manhattan_dist(self, other: "Point3D") -> float:
-        return sum(abs(x - y) for x, y in zip(self, other))
-
-
-def rotations(points: List[Point3D]) -> Iterable[List[Point3D]]:
-    # https://stackoverflow.com/a/16467849
-    for cycle in range(2):
-        for step in range(3):  # Yield RTTT 3 times
-            points = [p.rotate_x_90() for p in points]
-            yield points
-            for i in range(3):  # Yield TTT
-                points = [p.rotate_z_90() for p in points]
-                yield points
-        points = [p.rotate_x_90().rotate_z_90().rotate_x_90() for p in points]  # Do RTR
-
-
-def sub_list(x: List[Point3D], y: List[Point3D]) -> List[Point3D]:
-    return [Point3D(a[0] - b[0], a[1] - b[1], a[2] - b[2]) for a, b in zip(x, y)]
-
-
-# Calculates the pairwise euclidean distanse between all points
-def pdist(points: List[Point3D]) -> List[float]:
-    return [p1.euclidean_dist(p2) for p1 in points for p2 in points if p1 != p2]
-
-
-# Calculates the pairwise manhattan distanse between all points
-def manhattan_pdist(points: List[Point3D]) -> List[float]:
-    return [p1.manhattan_dist(p2) for p1 in points for p2 in points if p1 != p2]
+ROTATIONS = rotation_matrices()
 
 
 class Scanner:
     @classmethod
     def from_str(cls, data: str) -> "Scanner":
         data = data.strip().splitlines()
-        header, points = data[0], [Point3D(*map(int, x.split(","))) for x in data[1:]]
-
-        return cls(id=int(header.split(" ")[-2]), points=points)
-
-    @classmethod
-    def from_copy(cls, scanner: "Scanner") -> "Scanner":
-        return cls(id=scanner.id, points=scanner.points)
+        points = np.array([list(map(int, x.split(","))) for x in data[1:]])
+        return cls(id=int(data[0].split(" ")[-2]), points=points.reshape(-1, 3))
 
-    def __init__(self, id: str, points: List[Point3D]):
+    def __init__(self, id: int, points: np.ndarray):
         self.id = id
         self.points = points
-        self.aligned = False
-        self.reference = None
-        self.pos = None
-
-    def align(self, reference: "Scanner", pos: Point3D) -> "Scanner":
-        if reference is not None:
-            print("ALIGNING", self.id, reference.id, reference.aligned, pos)
-        self.reference = reference
-        self.move(*pos)
-        self.pos = pos
-        self.aligned = True
-        return self
-
-    def __iter__(self) -> Iterator[Point3D]:
-        return iter(self.points)
-
-    def __repr__(self) -> str:
-        return str(self)
-
-    def __str__(self) -> str:
-        return f"--- scanner {self.id} ---\n" + "\n".join(
-            [f"{p.x},{p.y},{p.z}" for p in self.points]
-        )
-
-    def rotate(self, iters: int) -> "Scanner":
-        for _, rot in zip(range(iters), rotations(self.points)):
-            pass
-        self.points = rot
-        return self
-
-    def move(self, x: int, y: int, z: int) -> "Scanner":
-        self.points = [Point3D(p[0] + x, p[1] + y, p[2] + z) for p in self.points]
-        return self
-
-    def matches(self, other: "Scanner") -> Set[float]:
-        return set(pdist(self.points)) & set(pdist(other.points))
-
-    def points_from_distances(self, distances: Set[float]) -> List[Point3D]:
-        points = list(
-            set(
-                [
-                    point1
-                    for point1 in self.points
-                    for point2 in self.points
-                    if point1.euclidean_dist(point2) in distances
-                ]
-            )
-        )
-        return sorted(
-            points, key=lambda p: sum([p.euclidean_dist(p2) for p2 in points])
+        self.pos = None  # in the frame of the first scanner, once aligned
+        self.fingerprints, self.pairs = self._fingerprints()
+
+    def _fingerprints(self) -> tuple[np.ndarray, np.ndarray]:
+        """Sorted fingerprints of every pair of beacons, and those pairs."""
+        i, j = np.triu_indices(len(self.points), 1)
+        offsets = np.sort(np.abs(self.points[i] - self.points[j]), axis=1)
+        fingerprints = (
+            offsets[:, 0] * FINGERPRINT_BASE + offsets[:, 1]
+        ) * FINGERPRINT_BASE + offsets[:, 2]
+        order = np.argsort(fingerprints, kind="stable")
+        return fingerprints[order], np.stack([i, j], axis=1)[order]
+
+    def align(self, reference: "Scanner") -> bool:
+        """
+        Turn and move the points into the frame of the aligned ``reference``,
+        if a pair of beacons both see lines up at least 12 of them.
+        """
+        known = set(map(tuple, reference.points.tolist()))
+        _, in_reference, in_self = np.intersect1d(
+            reference.fingerprints, self.fingerprints, return_indices=True
         )
+        for (i, j), (k, l) in zip(
+            reference.pairs[in_reference].tolist(), self.pairs[in_self].tolist()
+        ):
+            target = reference.points[j] - reference.points[i]
+            turned = ROTATIONS @ (self.points[l] - self.points[k])
+            for sign, start in ((1, i), (-1, j)):
+                for r in np.flatnonzero((turned == sign * target).all(axis=1)):
+                    points = self.points @ ROTATIONS[r].T
+                    offset = reference.points[start] - points[k]
+                    points += offset
+                    matched = known & set(map(tuple, points.tolist()))
+                    if len(matched) >= MIN_SHARED_BEACONS:
+                        self.points, self.pos = points, offset
+                        return True
+        return False
 
 
 def load_scanners(data: str) -> List[Scanner]:
     return [Scanner.from_str(x) for x in data.strip().split("\n\n")]
 
 
+def overlap_graph(scanners: List[Scanner]) -> dict[int, list[int]]:
+    """Scanners sharing enough beacon pairs to possibly overlap."""
+    fingerprints = np.concatenate([s.fingerprints for s in scanners])
+    owners = np.repeat(
+        np.arange(len(scanners)), [len(s.fingerprints) for s in scanners]
+    )
+    order = np.argsort(fingerprints, kind="stable")
+    fingerprints, owners = fingerprints[order], owners[order]
+    # pair up the owners of equal fingerprints, k places apart in the order
+    run = np.cumsum(np.diff(fingerprints, prepend=-1) != 0)
+    n, codes = len(scanners), []
+    for k in range(1, len(run)):
+        same = np.flatnonzero(run[k:] == run[:-k])
+        if not len(same):
+            break
+        first, second = owners[same], owners[same + k]
+        low, high = np.minimum(first, second), np.maximum(first, second)
+        codes.append((low * n + high)[low != high])
+    codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int64)
+    codes, counts = np.unique(codes, return_counts=True)
+    low, high = np.divmod(codes, n)
+    pairs = dict(zip(zip(low.tolist(), high.tolist()), counts.tolist()))
+    graph = defaultdict(list)
+    for (a, b), shared in pairs.items():
+        if shared >= MIN_SHARED_PAIRS:
+            graph[a].append(b)
+            graph[b].append(a)
+    return graph
+
+
 class Map:
     def __init__(self, scanners: List[Scanner]):
-        self.aligned_scanners = [scanners.pop(0).align(None, Point3D(0, 0, 0))]
-        self.remaining_scanners = scanners
+        self.scanners = scanners
         self.align_scanners()
 
-    def find_rotation(
-        self, points_a: List[Point3D], points_b: List[Point3D]
-    ) -> Tuple[int, Point3D]:
-        for i, rot in enumerate(rotations(points_b)):
-            if len(s := set(sub_list(points_a, rot))) == 1:
-                offset = s.pop()
-                iterations = i
-                return iterations + 1, offset
-        return None, None
-
     def align_scanners(self) -> None:
-        remaining = len(self.remaining_scanners)
-        while remaining > 0:
-            for i, scanner in enumerate(self.remaining_scanners):
-                for j, reference in enumerate(self.aligned_scanners):
-                    if (
-                        not scanner.aligned
-                        and len(distances := scanner.matches(reference)) == 66
-                    ):
-                        points_s = scanner.points_from_distances(distances)
-                        points_r = reference.points_from_distances(distances)
-                        iterations, offset = self.find_rotation(points_r, points_s)
-                        self.aligned_scanners.append(
-                            scanner.rotate(iters=iterations).align(reference, offset)
-                        )
-                        remaining -= 1
-
-    def beacons(self) -> List[Point3D]:
-        return list(
-            set(
-                [point for scanner in self.aligned_scanners for point in scanner.points]
-            )
-        )
+        """Breadth-first over the overlap graph from the first scanner."""
+        graph = overlap_graph(self.scanners)
+        self.scanners[0].pos = np.zeros(3, dtype=np.int64)
+        queue = deque([0])
+        while queue:
+            r = queue.popleft()
+            for s in graph[r]:
+                scanner = self.scanners[s]
+                if scanner.pos is None and scanner.align(self.scanners[r]):
+                    queue.append(s)
+        lost = [s.id for s in self.scanners if s.pos is None]
+        if lost:
+            raise ValueError(f"Could not align scanners {lost}")
+
+    def beacons(self) -> np.ndarray:
+        return np.unique(np.concatenate([s.points for s in self.scanners]), axis=0)
+
+    def positions(self) -> np.ndarray:
+        return np.array([s.pos for s in self.scanners])
+
+
+def max_manhattan_dist(points: np.ndarray) -> int:
+    return int(np.abs(points[:, None] - points[None]).sum(axis=2).max())
+
+
+def part_1(data: str) -> int:
+    return len(Map(load_scanners(data)).beacons())
+
+
+def part_2(data: str) -> int:
+    return max_manhattan_dist(Map(load_scanners(data)).positions())
 
 
 if __name__ == "__main__":
     # Data
     with open("data/19.txt") as f:
         data = f.read()
-
     # Demo
     scanners = load_scanners(RAW)
     m = Map(scanners)
     # Part 1
     assert len(m.beacons()) == 79
     # Part 2
-    assert max(manhattan_pdist([s.pos for s in m.aligned_scanners])) == 3621
-
+    assert max_manhattan_dist(m.positions()) == 3621
     # Real
-    scanners = load_scanners(data)
-    m = Map(scanners)
-    print("Part 1:", len(m.beacons()))
-    print("Part 2:", max(manhattan_pdist([s.pos for s in m.aligned_scanners])))
+    print("Part 1:", part_1(data))
+    print("Part 2:", part_2(data))
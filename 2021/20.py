@@ -1,5 +1,6 @@
-from typing import List
+import numpy as np
 
+from aoc.grid import Grid
 
 RAW = """\
 ..#.#..#####.#.#.#.###.##.....###.##.#..###.####..#####..#....#..#..##..###..######.###...####..#..#####..##..#.#####...##.#.#..#.##..#.#......#.###.######.###.####...#.##.##..#..#..#####.....#.#....###..#.##......#.....#..#..#..##..#...##.######.####.####.#.#...#.......#..#.#.#...####.##.#......#..#...##.#.##..#...##.#.##..###.#......#.#.......#.#.#.####.###.##...#.....####.#..#..#.##.#....##..#.####....##...##..#...#......#.#.......#.......##..####..#...#.#.#...##..#.#..###..#####........#..####......#..#
@@ -15,60 +16,88 @@ RAW = """\
 class Image:
     @classmethod
     def from_str(cls, data: str) -> "Image":
-        sequence, image = data.strip().split("\n\n")
-        to_int = lambda x: 1 if x == "#" else 0
+        algorithm, image = data.strip().split("\n\n")
         return cls(
-            sequence=[to_int(x) for x in sequence],
-            image=[[to_int(x) for x in row] for row in image.split("\n")],
+            algorithm=Grid.from_str(algorithm, {"#": 1})[0],
+            pixels=Grid.from_str(image, {"#": 1}).array,
         )
 
-    def __init__(self, sequence: List[int], image: List[List[int]]):
-        self.sequence = sequence
-        self.image = image
-        self.m, self.n = len(image), len(image[0])
+    def __init__(self, algorithm: np.ndarray, pixels: np.ndarray, background: int = 0):
+        self.algorithm = algorithm
+        self.pixels = pixels
+        # every pixel outside the image, out to infinity
+        self.background = background
         self.iterations = 0
 
-    def _get_neighbors(
-        self, i: int, j: int, filler: int, n: int = 3
-    ) -> List[int]:
-        neighbors = []
-        middle = n // 2
-        for k1 in range(-middle, middle + 1):
-            for k2 in range(-middle, middle + 1):
-                if 0 <= (x := i + k1) < self.m and 0 <= (y := j + k2) < self.n:
-                    neighbors.append(self.image[x][y])
-                else:
-                    neighbors.append(filler)
-        return neighbors
+    @property
+    def image(self) -> Grid:
+        return Grid(self.pixels)
 
-    def enhancement(self) -> "Image":
-        self.iterations += 1
-        new_image = [[0 for _ in range(self.n + 2)] for _ in range(self.m + 2)]
-
-        filler = 1 if self.sequence[0] == 1 and not self.iterations % 2 else 0
-        for i in range(-1, self.m + 1):
-            for j in range(-1, self.n + 1):
-                neighbors = self._get_neighbors(
-                    i,
-                    j,
-                    filler=filler,
-                )
-                new_image[i + 1][j + 1] = self.sequence[
-                    int("".join(map(str, neighbors)), 2)
-                ]
-        self.image = new_image
-        self.m, self.n = len(new_image), len(new_image[0])
+    def enhance(self, steps: int = 1) -> "Image":
+        """
+        Apply the algorithm ``steps`` times. The 9-bit index of every window
+        is built with shifts and ors of shifted views of the image, and
+        looked up in one ``take``. The image grows by a pixel on each side
+        per step, so the canvases of its final size are allocated once and
+        swapped between steps; only the ring of background around the image
+        that the edge windows read is rewritten.
+        """
+        h, w = self.pixels.shape
+        margin = steps + 2
+        shape = (h + 2 * margin, w + 2 * margin)
+        source, target = np.empty(shape, np.uint8), np.empty(shape, np.uint8)
+        row_codes, index = np.empty(shape, np.uint16), np.empty(shape, np.uint16)
+        top = left = margin
+        source[top : top + h, left : left + w] = self.pixels
+        for _ in range(steps):
+            b = self.background
+            source[top - 2 : top, left - 2 : left + w + 2] = b
+            source[top + h : top + h + 2, left - 2 : left + w + 2] = b
+            source[top : top + h, left - 2 : left] = b
+            source[top : top + h, left + w : left + w + 2] = b
+            h, w, top, left = h + 2, w + 2, top - 1, left - 1
+            # the 3-bit code of every horizontal triple, then three of those
+            # stacked vertically; the top left cell ends up as the high bit
+            area = source[top - 1 : top + h + 1, left - 1 : left + w + 1]
+            rows = row_codes[: h + 2, :w]
+            rows[...] = area[:, :-2]
+            for dx in (1, 2):
+                np.left_shift(rows, 1, out=rows)
+                np.bitwise_or(rows, area[:, dx : dx + w], out=rows)
+            window = index[:h, :w]
+            np.left_shift(rows[:-2], 3, out=window)
+            np.bitwise_or(window, rows[1:-1], out=window)
+            np.left_shift(window, 3, out=window)
+            np.bitwise_or(window, rows[2:], out=window)
+            np.take(
+                self.algorithm,
+                window,
+                out=target[top : top + h, left : left + w],
+                mode="clip",
+            )
+            # an infinite sea of 0s reads index 0, one of 1s index 511
+            self.background = int(self.algorithm[511 * b])
+            source, target = target, source
+        self.pixels = source[top : top + h, left : left + w]
+        self.iterations += steps
         return self
 
+    def enhancement(self) -> "Image":
+        return self.enhance(1)
+
     def n_ones(self) -> int:
-        return sum(sum(row) for row in self.image)
+        return int(np.count_nonzero(self.pixels))
 
     def __str__(self) -> str:
-        return (
-            "\n".join(["".join(map(str, row)) for row in self.image])
-            .replace("1", "#")
-            .replace("0", ".")
-        )
+        return self.image.to_str(".#")
+
+
+def part_1(data: str) -> int:
+    return Image.from_str(data).enhance(2).n_ones()
+
+
+def part_2(data: str, steps: int = 50) -> int:
+    return Image.from_str(data).enhance(steps).n_ones()
 
 
 if __name__ == "__main__":
@@ -77,21 +106,11 @@ if __name__ == "__main__":
         data = f.read()
 
     # Demo
-    image = Image.from_str(RAW)
     # Part 1
-    image.enhancement()
-    image.enhancement()
-    assert image.n_ones() == 35
+    assert part_1(RAW) == 35
     # Part 2
-    for _ in range(50 - 2):
-        image.enhancement()
-    assert image.n_ones() == 3351
+    assert part_2(RAW) == 3351
 
     # Real
-    image = Image.from_str(data)
-    image.enhancement()
-    image.enhancement()
-    print("Part 1:", image.n_ones())
-    for _ in range(50 - 2):
-        image.enhancement()
-    print("Part 2:", image.n_ones())
+    print("Part 1:", part_1(data))
+    print("Part 2:", part_2(data))
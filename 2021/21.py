@@ -1,8 +1,9 @@
 from collections import defaultdict
 from typing import Dict, Iterator, List, Tuple
-from functools import lru_cache
-from itertools import product
 
+import numpy as np
+
+from aoc.counters import counted
 
 RAW = """\
 Player 1 starting position: 4
@@ -41,30 +42,92 @@ def play_1(data: str, iters: int = 500) -> Tuple[int, int, int]:
     return p1s, p2s, i
 
 
-@lru_cache(maxsize=None)
-def roll(max_value: int, dices: int) -> Dict[int, int]:
-    sums = defaultdict(lambda: 0)
-    for roll in product(range(1, max_value + 1), repeat=dices):
-        sums[sum(roll)] += 1
-    return sums
+def roll(faces: int, rolls: int) -> Dict[int, int]:
+    """How many ways ``rolls`` dice with ``faces`` faces add up to each sum."""
+    sums = {0: 1}
+    for _ in range(rolls):
+        new_sums = defaultdict(int)
+        for total, count in sums.items():
+            for face in range(1, faces + 1):
+                new_sums[total + face] += count
+        sums = new_sums
+    return dict(sums)
+
+
+@counted("fill_table")
+def fill_table(
+    outcomes: Dict[int, int], board: int, target: int, dtype: type
+) -> Tuple[np.ndarray, np.ndarray]:
+    # scores run up to target: a state whose second score reached it is one
+    # the other player has just won, counted by its other_wins of 1
+    shape = (target + 1, target + 1, board, board)
+    mover_wins, other_wins = np.zeros(shape, dtype), np.zeros(shape, dtype)
+    other_wins[:, target] = 1
+    positions = np.arange(board)
+    pos_mover, pos_other = positions[None, :, None], positions[None, None, :]
+    for total in range(2 * (target - 1), -1, -1):
+        score = np.arange(max(0, total - target + 1), min(total, target - 1) + 1)
+        other_score = total - score
+        mover = np.zeros((len(score), board, board), dtype)
+        other = np.zeros((len(score), board, board), dtype)
+        for moves, count in outcomes.items():
+            landed = (pos_mover + moves) % board
+            new_score = np.minimum(score[:, None, None] + landed + 1, target)
+            # the other player moves next, from (other_score, new_score)
+            after = (other_score[:, None, None], new_score, pos_other, landed)
+            mover += count * other_wins[after]
+            other += count * mover_wins[after]
+        mover_wins[score, other_score] = mover
+        other_wins[score, other_score] = other
+    return mover_wins[:target, :target], other_wins[:target, :target]
+
+
+def dirac_table(
+    board: int = 10, faces: int = 3, rolls: int = 3, target: int = 21
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Universes won by the player about to move and by the other one, for every
+    state ``[score_mover, score_other, pos_mover, pos_other]`` (positions from
+    0). The turn is folded into the table by always looking from the mover's
+    side: after a move the players swap places.
+
+    Every move adds at least one point, so a state only depends on states
+    with a larger total score; the table is filled one anti-diagonal of
+    scores at a time, from the highest total down.
+
+    A first pass in float64 sizes the counts. They are all sums of positive
+    terms, so below 2**53 that pass is exact; otherwise the table is filled
+    again in int64, or in Python ints when even that would overflow.
+    """
+    outcomes = roll(faces, rolls)
+    with np.errstate(over="ignore"):  # overflowing to inf only sizes larger
+        mover_wins, other_wins = fill_table(outcomes, board, target, np.float64)
+    largest = max(mover_wins.max(), other_wins.max())
+    if largest < 2**53:
+        return mover_wins.astype(np.int64), other_wins.astype(np.int64)
+    # float64 is only within a relative 2**-40 or so, keep a margin
+    dtype = np.int64 if largest < 2**62 else object
+    return fill_table(outcomes, board, target, dtype)
+
+
+def dirac_wins(
+    data: str, board: int = 10, faces: int = 3, rolls: int = 3, target: int = 21
+) -> Tuple[int, int]:
+    p1, p2 = parse_input(data)
+    mover_wins, other_wins = dirac_table(board, faces, rolls, target)
+    start = (0, 0, p1 - 1, p2 - 1)
+    return int(mover_wins[start]), int(other_wins[start])
 
 
-@lru_cache(maxsize=None)
-def dirac_roll(s1: int, s2: int, p1: int, p2: int, multiplier: int = 1) -> Tuple[int]:
-    win_1 = win_2 = 0
-    for v1, count in roll(max_value=3, dices=3).items():
-        wrap = lambda x, add: ((x - 1 + add) % 10) + 1
-        new_s1 = wrap(s1, v1)
-        new_p1 = p1 + new_s1
-        if new_p1 >= 21:
-            win_1 += count * multiplier
-        else:
-            new_win_2, new_win_1 = dirac_roll(
-                s2, new_s1, p2, new_p1, count * multiplier
-            )
-            win_1 += new_win_1
-            win_2 += new_win_2
-    return win_1, win_2
+def part_1(data: str) -> int:
+    p1s, p2s, its = play_1(data)
+    return min(p1s, p2s) * (its + 1) * 3
+
+
+def part_2(
+    data: str, board: int = 10, faces: int = 3, rolls: int = 3, target: int = 21
+) -> int:
+    return max(dirac_wins(data, board, faces, rolls, target))
 
 
 if __name__ == "__main__":
@@ -73,13 +136,10 @@ if __name__ == "__main__":
 
     # Part 1
     # Demo
-    p1s, p2s, its = play_1(RAW)
-    assert min(p1s, p2s) * (its + 1) * 3 == 739785
+    assert part_1(RAW) == 739785
     # Real
-    p1s, p2s, its = play_1(data)
-    print("Part 1:", min(p1s, p2s) * (its + 1) * 3)
+    print("Part 1:", part_1(data))
 
     # Part 2
-    assert dirac_roll(4, 8, 0, 0) == (444356092776315, 341960390180808)
-    p1, p2 = parse_input(data)
-    print("Part 2:", max(dirac_roll(p1, p2, 0, 0)))
+    assert dirac_wins(RAW) == (444356092776315, 341960390180808)
+    print("Part 2:", part_2(data))
@@ -1,5 +1,12 @@
-from itertools import product
-from typing import List, Tuple
+from typing import Iterator
+
+import numpy as np
+
+from aoc.inputs import Text, iter_lines, parse_ints
+
+MMAP_INPUT = True
+
+BATCH_SIZE = 4096
 
 RAW = """\
 on x=-20..26,y=-36..17,z=-47..7
@@ -27,221 +34,142 @@ on x=967..23432,y=45373..81175,z=27513..53682
 """
 
 
-class Cube:
-    @classmethod
-    def from_str(cls, s: str) -> "Cube":
-        points = [
-            tuple(sorted(map(int, x.split("=")[1].split("..")))) for x in s.split(",")
-        ]
-        x, y, z = tuple([p[0] for p in points])
-        w, h, d = tuple([p[1] - p[0] for p in points])
-        return cls(x, y, z, w, h, d)
-
-    def __init__(self, x: int, y: int, z: int, w: int, h: int, d: int):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.w = w
-        self.h = h
-        self.d = d
-
-    def __str__(self):
-        return "Cube(x={}, y={}, z={}, w={}, h={}, d={})".format(
-            self.x, self.y, self.z, self.w, self.h, self.d
-        )
-
-    def __repr__(self):
-        return self.__str__()
-
-    def is_overlap(self, other: "Cube") -> bool:
-        return (
-            self.x <= other.x + other.w
-            and self.x + self.w >= other.x
-            and self.y <= other.y + other.h
-            and self.y + self.h >= other.y
-            and self.z <= other.z + other.d
-            and self.z + self.d >= other.z
-        )
-
-    def is_contained(self, other: "Cube") -> bool:
-        return (
-            self.x >= other.x
-            and self.y >= other.y
-            and self.z >= other.z
-            and self.x + self.w <= other.x + other.w
-            and self.y + self.h <= other.y + other.h
-            and self.z + self.d <= other.z + other.d
-        )
-
-    def overlap(self, other: "Cube") -> "Cube":
-        return Cube(
-            (x := max(self.x, other.x)),
-            (y := max(self.y, other.y)),
-            (z := max(self.z, other.z)),
-            min(self.x + self.w, other.x + other.w) - x,
-            min(self.y + self.h, other.y + other.h) - y,
-            min(self.z + self.d, other.z + other.d) - z,
-        )
+def parse_batch(lines: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Whether each step turns cubes on, and its ranges as ``(n, 3, 2)`` rows
+    of inclusive ``(low, high)`` along x, y and z.
+    """
+    on = np.array([line.startswith("on") for line in lines], dtype=bool)
+    ranges = parse_ints("\n".join(lines)).reshape(-1, 3, 2)
+    ranges.sort(axis=2)
+    return on, ranges
+
+
+def iter_batches(
+    data: Text, batch_size: int = BATCH_SIZE
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """The steps ``batch_size`` at a time, so that no step file is held whole."""
+    lines = []
+    for line in iter_lines(data):
+        if line:
+            lines.append(line)
+        if len(lines) == batch_size:
+            yield parse_batch(lines)
+            lines = []
+    if lines:
+        yield parse_batch(lines)
 
-    @staticmethod
-    def _sort(cubes: List["Cube"]) -> List["Cube"]:
-        return sorted(cubes, key=lambda c: min(c.x, c.y, c.z))
-
-    def __hash__(self) -> int:
-        return hash((self.x, self.y, self.z, self.w, self.h, self.d))
-
-    def __eq__(self, other: "Cube") -> bool:
-        return hash(self) == hash(other)
-
-    def __add__(self, other: "Cube") -> List["Cube"]:
-        if self.is_contained(other):
-            return [other]
-        elif other.is_contained(self):
-            return [self]
-        elif self.is_overlap(other):
-            result = []
-            cubes = self._sort([self, other])
-            for i, j, k in product([0, 1], repeat=3):
-                c = Cube(
-                    cubes[i].x,
-                    cubes[j].y,
-                    cubes[k].z,
-                    cubes[i - 1].x - cubes[i].x + cubes[i - 1].w * i,
-                    cubes[j - 1].y - cubes[j].y + cubes[j - 1].h * j,
-                    cubes[k - 1].z - cubes[k].z + cubes[k - 1].d * k,
-                )
-                if c.w > 0 and c.h > 0 and c.d > 0:
-                    result.append(c)
-            overlap = self.overlap(other)
-            cubes = [overlap, cubes[-1]]
-            for i, j, k in product([0, 1], repeat=3):
-                c = Cube(
-                    cubes[0].x + cubes[i].w * (i == 0),
-                    cubes[0].y + cubes[j].h * (j == 0),
-                    cubes[0].z + cubes[k].d * (k == 0),
-                    cubes[i - 1].w - cubes[0].w * (i == 0),
-                    cubes[j - 1].h - cubes[0].h * (j == 0),
-                    cubes[k - 1].d - cubes[0].d * (k == 0),
-                )
-                if c.w > 0 and c.h > 0 and c.d > 0:
-                    result.append(c)
-
-            return list(set(result))
-        else:
-            return [self, other]
-
-    def __sub__(self, other: "Cube") -> List["Cube"]:
-        if self.is_contained(other):
-            return []
-        elif other.is_contained(self):
-            return [
-                Cube(
-                    self.x, self.y, self.z, self.w, other.y - self.y, other.z - self.z
-                ),
-                Cube(
-                    self.x,
-                    other.y + other.h,
-                    other.z + other.d,
-                    self.w,
-                    self.y + self.h - other.y - other.h,
-                    self.z + self.d - other.z - other.d,
-                ),
-                Cube(self.x, other.y, other.z, other.x - self.x, other.h, other.d),
-                Cube(
-                    other.x + other.w,
-                    other.y,
-                    other.z,
-                    self.x + self.w - other.x - other.w,
-                    other.y,
-                    other.z,
-                ),
-            ]
-        elif self.is_overlap(other):
-            cubes = self._sort([self, other])
-            overlap = self.overlap(other)
-            self_idx = cubes.index(self)
-            result = []
-            if self_idx:
-                cubes = [overlap, cubes[-1]]
-                for i, j, k in product([0, 1], repeat=3):
-                    c = Cube(
-                        cubes[0].x + cubes[i].w * (i == 0),
-                        cubes[0].y + cubes[j].h * (j == 0),
-                        cubes[0].z + cubes[k].d * (k == 0),
-                        cubes[i - 1].w - cubes[0].w * (i == 0),
-                        cubes[j - 1].h - cubes[0].h * (j == 0),
-                        cubes[k - 1].d - cubes[0].d * (k == 0),
-                    )
-                    if c != overlap and c.w > 0 and c.h > 0 and c.d > 0:
-                        result.append(c)
-            else:
-                for i, j, k in product([0, 1], repeat=3):
-                    c = Cube(
-                        cubes[i].x,
-                        cubes[j].y,
-                        cubes[k].z,
-                        cubes[i - 1].x - cubes[i].x + cubes[i - 1].w * i,
-                        cubes[j - 1].y - cubes[j].y + cubes[j - 1].h * j,
-                        cubes[k - 1].z - cubes[k].z + cubes[k - 1].d * k,
-                    )
-                    if c != overlap and c.w > 0 and c.h > 0 and c.d > 0:
-                        result.append(c)
-            return result
-        else:
-            return [self]
+
+class Space:
+    """The cubes from -radius to radius on every axis, as a boolean volume."""
+
+    def __init__(self, radius: int = 50):
+        self.radius = radius
+        self.cubes = np.zeros((2 * radius + 1,) * 3, dtype=bool)
+
+    def apply(self, on: bool, ranges: np.ndarray) -> None:
+        # only the part of a step inside the region counts
+        low = np.maximum(ranges[:, 0], -self.radius) + self.radius
+        high = np.minimum(ranges[:, 1], self.radius) + self.radius
+        if (low > high).any():
+            return
+        x, y, z = (slice(a, b + 1) for a, b in zip(low.tolist(), high.tolist()))
+        self.cubes[x, y, z] = on
+
+    def apply_batch(self, on: np.ndarray, ranges: np.ndarray) -> None:
+        for step_on, step_ranges in zip(on.tolist(), ranges):
+            self.apply(step_on, step_ranges)
 
     @property
-    def volume(self) -> int:
-        return (self.w + 1) * (self.h + 1) * (self.d + 1)
+    def n_on(self) -> int:
+        return int(np.count_nonzero(self.cubes))
 
 
-def parse(data: str) -> List[Tuple[str, Cube]]:
-    return [
-        ((x := s.split(" "))[0], Cube.from_str(x[1])) for s in data.strip().split("\n")
-    ]
+# an empty slot: its low x is above every high x, so no step overlaps it
+EMPTY = np.array([np.iinfo(np.int64).max, 0, 0, np.iinfo(np.int64).min, 0, 0])
 
 
-class Space:
-    def __init__(self, n: int):
-        self.grid = [[[False] * n for _ in range(n)] for _ in range(n)]
-        self.offset = n // 2
-
-    def add(self, c: Cube):
-        for x in range(c.x, c.x + c.w + 1):
-            for y in range(c.y, c.y + c.h + 1):
-                for z in range(c.z, c.z + c.d + 1):
-                    self.grid[x + self.offset][y + self.offset][z + self.offset] = True
-
-    def remove(self, c: Cube):
-        for x in range(c.x, c.x + c.w + 1):
-            for y in range(c.y, c.y + c.h + 1):
-                for z in range(c.z, c.z + c.d + 1):
-                    self.grid[x + self.offset][y + self.offset][z + self.offset] = False
+class Reactor:
+    """
+    Lit cubes as disjoint cuboids, the columns of ``bounds``: rows 0-2 hold
+    their low x, y and z and rows 3-5 the high ones, inclusive. A step carves
+    itself out of the cuboids it overlaps, leaving at most six slabs of each,
+    then adds itself if it turns cubes on. The slabs reuse the slots of the
+    carved cuboids, so a step only ever touches what it overlaps.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.bounds = np.empty((6, capacity), dtype=np.int64)
+        self.n = 0
 
+    @property
+    def cuboids(self) -> np.ndarray:
+        live = self.bounds[:, : self.n]
+        return live[:, live[0] <= live[3]]
+
+    @property
     def n_on(self) -> int:
-        return sum(sum(sum(row) for row in layer) for layer in self.grid)
-
-
-def part_1(cubes: List[Tuple[str, Cube]]) -> int:
-    new_cubes = [cubes.pop(0)[1]]
-    space = Space(200)
-    space.add(new_cubes[0])
-    for action, cube in cubes:
-        p = max(abs(cube.x), abs(cube.y), abs(cube.z))
-        if p > 50:
-            print(f"passing {cube}")
-            continue
-        else:
-            if action == "on":
-                new_cubes = list(set([c2 for c in new_cubes for c2 in (c + cube)]))
-                print(new_cubes)
-                space.add(cube)
-            elif action == "off":
-                space.remove(cube)
-                new_cubes = list(set([c2 for c in new_cubes for c2 in (c - cube)]))
-            else:
-                raise ValueError(f"unknown action {action}")
-    return space.n_on(), sum(c.volume for c in new_cubes)
+        cuboids = self.cuboids
+        volumes = (cuboids[3:] - cuboids[:3] + 1).prod(axis=0)
+        # every volume fits in an int64 but their sum may not
+        return int(volumes.astype(object).sum())
+
+    def apply(self, on: bool, ranges: np.ndarray) -> None:
+        step = ranges.T.reshape(6, 1)
+        lo, hi = step[:3], step[3:]
+        live = self.bounds[:, : self.n]
+        hit = np.flatnonzero(((live[:3] <= hi) & (live[3:] >= lo)).all(axis=0))
+        pieces = self._carve(live[:, hit], lo, hi)
+        if on:
+            pieces = np.concatenate([pieces, step], axis=1)
+        self._store(hit, pieces)
+
+    @staticmethod
+    def _carve(cuboids: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """What is left of ``cuboids`` outside the cuboid from lo to hi."""
+        low, high = cuboids[:3], cuboids[3:]
+        inner_low, inner_high = np.maximum(low, lo), np.minimum(high, hi)
+        slabs = []
+        for axis in range(3):
+            # the slabs cut along this axis span the overlap on the axes before
+            slab = np.concatenate(
+                [inner_low[:axis], low[axis:], inner_high[:axis], high[axis:]]
+            )
+            below, above = slab, slab.copy()
+            below[3 + axis] = lo[axis] - 1
+            above[axis] = hi[axis] + 1
+            slabs += [below, above]
+        slabs = np.concatenate(slabs, axis=1)
+        return slabs[:, (slabs[:3] <= slabs[3:]).all(axis=0)]
+
+    def _store(self, slots: np.ndarray, pieces: np.ndarray) -> None:
+        k = min(len(slots), pieces.shape[1])
+        self.bounds[:, slots[:k]] = pieces[:, :k]
+        self.bounds[:, slots[k:]] = EMPTY[:, None]
+        rest = pieces[:, k:]
+        if self.n + rest.shape[1] > self.bounds.shape[1]:
+            # drop the empty slots while growing
+            live = self.cuboids
+            self.bounds = np.empty((6, 2 * (live.shape[1] + rest.shape[1])), np.int64)
+            self.bounds[:, : live.shape[1]] = live
+            self.n = live.shape[1]
+        self.bounds[:, self.n : self.n + rest.shape[1]] = rest
+        self.n += rest.shape[1]
+
+
+def part_1(data: Text, batch_size: int = BATCH_SIZE) -> int:
+    space = Space(50)
+    for on, ranges in iter_batches(data, batch_size):
+        space.apply_batch(on, ranges)
+    return space.n_on
+
+
+def part_2(data: Text, batch_size: int = BATCH_SIZE) -> int:
+    reactor = Reactor()
+    for on, ranges in iter_batches(data, batch_size):
+        for step_on, step_ranges in zip(on.tolist(), ranges):
+            reactor.apply(step_on, step_ranges)
+    return reactor.n_on
 
 
 if __name__ == "__main__":
@@ -250,16 +178,12 @@ if __name__ == "__main__":
         data = f.read()
     # Part 1
     # Demo
-    cubes = parse(RAW)
-    assert part_1(cubes)[0] == 590784
+    assert part_1(RAW) == 590784
     # Real
-    cubes = parse(data)
-    print("Part 1:", part_1(cubes)[0])
+    print("Part 1:", part_1(data))
 
-    RAW = """\
-on x=-0..4,y=0..4,z=0..4
-off x=1..2,y=1..2,z=1..2
-"""
-    cubes = parse(RAW)[:2]
-    print(cubes)
-    print(part_1(cubes))
+    # Part 2
+    # Demo
+    assert part_2("on x=0..4,y=0..4,z=0..4\noff x=1..2,y=1..2,z=1..2") == 117
+    # Real
+    print("Part 2:", part_2(data))
@@ -25,7 +25,18 @@ class Elf:
 
 
 def parse(data: str) -> list[Elf]:
-    return [Elf([int(meal) for meal in elf.split("\n")]) for elf in data.split("\n\n")]
+    return [
+        Elf([int(meal) for meal in elf.split("\n")])
+        for elf in data.strip().split("\n\n")
+    ]
+
+
+def part_1(data: str) -> int:
+    return sorted(parse(data), key=lambda x: x.sum)[-1].sum
+
+
+def part_2(data: str) -> int:
+    return sum([x.sum for x in sorted(parse(data), key=lambda x: x.sum)[-3:]])
 
 
 if __name__ == "__main__":
@@ -33,10 +44,9 @@ if __name__ == "__main__":
     with open("data/01.txt") as f:
         data = f.read()
     # Part 1
-    assert sorted(parse(RAW), key=lambda x: x.sum)[-1].sum == 24000
-    print("Part 1:", sorted(parse(data), key=lambda x: x.sum)[-1].sum)
+    assert part_1(RAW) == 24000
+    assert part_1(RAW + "\n") == 24000
+    print("Part 1:", part_1(data))
     # Part 2
-    assert (sum([x.sum for x in sorted(parse(RAW), key=lambda x: x.sum)[-3:]])) == 45000
-    print(
-        "Part 2:", sum([x.sum for x in sorted(parse(data), key=lambda x: x.sum)[-3:]])
-    )
+    assert part_2(RAW) == 45000
+    print("Part 2:", part_2(data))
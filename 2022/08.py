@@ -1,6 +1,9 @@
 import enum
 from dataclasses import dataclass
 
+import numpy as np
+
+from aoc.grid import Grid
 
 EXAMPLE = """\
 30373
@@ -17,83 +20,71 @@ class Directions(int, enum.Enum):
     RIGHT = enum.auto()
 
 
+# quarter turns (counter-clockwise) that make each direction point left
+ROTATIONS = {
+    Directions.LEFT: 0,
+    Directions.UP: 1,
+    Directions.RIGHT: 2,
+    Directions.DOWN: 3,
+}
+
+
 @dataclass
 class Forest:
-    n: int
-    m: int
-    trees: list[list[int]]
+    trees: Grid
+
+    @property
+    def n(self) -> int:
+        return self.trees.height
+
+    @property
+    def m(self) -> int:
+        return self.trees.width
 
     @classmethod
     def from_quadcopter(cls, data: str) -> "Forest":
-        lines = data.splitlines()
-        trees = [[int(line) for line in x] for x in lines]
-        n, m = len(lines), len(lines[0])
-        return cls(n, m, trees)
-
-    def towards_up_height_from_point(self, i: int, j: int) -> list[int]:
-        return [tree[j] for tree in self.trees[:i]][::-1]
-
-    def get_down_height_from_point(self, i: int, j: int) -> list[int]:
-        return [tree[j] for tree in self.trees[i + 1 :]]
-
-    def get_left_height_from_point(self, i: int, j: int) -> list[int]:
-        return self.trees[i][:j][::-1]
-
-    def get_right_height_from_point(self, i: int, j: int) -> list[int]:
-        return self.trees[i][j + 1 :]
-
-    def is_visible(self, i: int, j: int, direction: Directions) -> bool:
-        if direction == Directions.UP:
-            return self.trees[i][j] > max(self.towards_up_height_from_point(i, j))
-        elif direction == Directions.DOWN:
-            return self.trees[i][j] > max(self.get_down_height_from_point(i, j))
-        elif direction == Directions.LEFT:
-            return self.trees[i][j] > max(self.get_left_height_from_point(i, j))
-        elif direction == Directions.RIGHT:
-            return self.trees[i][j] > max(self.get_right_height_from_point(i, j))
-        else:
-            raise ValueError("Invalid direction")
-
-    def space(self, i: int, j: int) -> int:
-        fist_equal_or_higher = lambda x: x[1] >= self.trees[i][j]
-        distance = lambda x: next(
-            filter(fist_equal_or_higher, enumerate(x, 1)), (len(x), None)
-        )[0]
-        up = self.towards_up_height_from_point(i, j)
-        down = self.get_down_height_from_point(i, j)
-        left = self.get_left_height_from_point(i, j)
-        right = self.get_right_height_from_point(i, j)
-        return distance(up) * distance(down) * distance(left) * distance(right)
+        return cls(Grid.from_digits(data.strip(), dtype=np.int8))
+
+    def looking(self, direction: Directions) -> Grid:
+        """The trees rotated so that ``direction`` points left."""
+        return self.trees.rotate(ROTATIONS[direction])
+
+    def restore(self, array: np.ndarray, direction: Directions) -> np.ndarray:
+        return np.rot90(array, -ROTATIONS[direction])
+
+    def visible(self, direction: Directions) -> np.ndarray:
+        trees = self.looking(direction).array
+        # tallest tree strictly between each tree and the edge, -1 at the edge
+        blocking = np.full(trees.shape, -1, dtype=trees.dtype)
+        np.maximum.accumulate(trees[:, :-1], axis=1, out=blocking[:, 1:])
+        return self.restore(trees > blocking, direction)
+
+    def viewing_distance(self, direction: Directions) -> np.ndarray:
+        trees = self.looking(direction).array
+        distance = np.zeros(trees.shape, dtype=np.int64)
+        blocked = np.zeros(trees.shape, dtype=bool)
+        for d in range(1, trees.shape[1]):
+            # trees at least d away from the edge still looking see one more
+            seeing = ~blocked[:, d:]
+            distance[:, d:] += seeing
+            blocked[:, d:] |= seeing & (trees[:, :-d] >= trees[:, d:])
+        return self.restore(distance, direction)
 
 
 def part_1(data: str) -> int:
     forest = Forest.from_quadcopter(data)
-    return (
-        sum(
-            sum(
-                1
-                for j in range(1, forest.m - 1)
-                if forest.is_visible(i, j, Directions.UP)
-                or forest.is_visible(i, j, Directions.DOWN)
-                or forest.is_visible(i, j, Directions.LEFT)
-                or forest.is_visible(i, j, Directions.RIGHT)
-            )
-            for i in range(1, forest.n - 1)
-        )
-        + (forest.n + forest.m) * 2
-        - 4
-    )
+    visible = np.zeros(forest.trees.shape, dtype=bool)
+    for direction in Directions:
+        visible |= forest.visible(direction)
+    return int(visible.sum())
 
 
 def part_2(data: str) -> int:
     forest = Forest.from_quadcopter(data)
-    return max(
-        [
-            forest.space(i, j)
-            for i in range(1, forest.n - 1)
-            for j in range(1, forest.m - 1)
-        ]
-    )
+    space = np.ones(forest.trees.shape, dtype=np.int64)
+    for direction in Directions:
+        space *= forest.viewing_distance(direction)
+    return int(space.max())
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 import string
-from collections import defaultdict
 
+import numpy as np
+
+from aoc.graph import CSR, bfs
+from aoc.grid import Grid
 
 EXAMPLE = """\
 Sabqponm
@@ -10,71 +13,45 @@ acctuvwj
 abdefghi"""
 
 
-class Grid:
-    def __init__(
-        self,
-        graph: dict[complex, list[complex]],
-        values: dict[complex, int],
-        start: complex,
-        end: complex,
-    ):
-        self.graph = graph
-        self.values = values
+HEIGHTS = {letter: i for i, letter in enumerate(string.ascii_lowercase)}
+
+
+class HeightMap:
+    def __init__(self, heights: Grid, start: tuple[int, int], end: tuple[int, int]):
+        self.heights = heights
         self.start = start
         self.end = end
 
     @classmethod
-    def from_string(cls, data: str) -> "Grid":
-        values = {}
-        graph = defaultdict(list)
-        start = end = 0 + 0j
-        for y, line in enumerate(data.splitlines()):
-            for x, letter in enumerate(line):
-                point = complex(x, y)
-                if letter == "S":
-                    value = string.ascii_lowercase.index("a")
-                    start = point
-                elif letter == "E":
-                    value = string.ascii_lowercase.index("z")
-                    end = point
-                else:
-                    value = string.ascii_lowercase.index(letter)
-                values[point] = value
-
-        for point in values:
-            for neighbor in [1 + 0j, -1 + 0j, 0 + 1j, 0 - 1j]:
-                if (point + neighbor) in values:
-                    graph[point].append(point + neighbor)
-
-        return cls(graph, values, start, end)
-
-    def get_starts(self) -> list[complex]:
-        return [point for point in self.values if self.values[point] == 0]
-
-    def bfs(self, source: complex) -> dict[complex, int]:
-        Q = [source]
-        dist = {v: float("inf") for v in self.graph}
-        dist[source] = 0
-
-        while Q:
-            u = Q.pop(0)
-            for v in self.graph[u]:
-                alt = dist[u] + 1
-                if alt < dist[v] and self.values[u] - self.values[v] <= 1:
-                    dist[v] = alt
-                    Q.append(v)
-        return dist  # type: ignore
+    def from_string(cls, data: str) -> "HeightMap":
+        letters = Grid.from_str(data)
+        (start,), (end,) = letters.find("S"), letters.find("E")
+        heights = Grid.from_str(data, HEIGHTS | {"S": 0, "E": 25}, dtype=np.int16)
+        return cls(heights, tuple(start), tuple(end))
+
+    def get_starts(self) -> np.ndarray:
+        return self.heights.array == 0
+
+    def bfs(self, source: tuple[int, int]) -> np.ndarray:
+        """Steps from every cell to ``source``, climbing at most one level, or -1."""
+        heights = self.heights.array.ravel()
+        # walking backwards from the source, u -> v undoes a step v -> u
+        graph = CSR.from_grid(
+            self.heights.shape, allowed=lambda u, v: heights[u] - heights[v] <= 1
+        )
+        source = source[0] * self.heights.width + source[1]
+        return bfs(graph, source).reshape(self.heights.shape)
 
 
 def part_1(data: str) -> int:
-    grid = Grid.from_string(data)
-    return grid.bfs(grid.end)[grid.start]
+    grid = HeightMap.from_string(data)
+    return int(grid.bfs(grid.end)[grid.start])
 
 
 def part_2(data: str) -> int:
-    grid = Grid.from_string(data)
-    dists = grid.bfs(grid.end)
-    return min(dists[s] for s in grid.get_starts())
+    grid = HeightMap.from_string(data)
+    dists = grid.bfs(grid.end)[grid.get_starts()]
+    return int(dists[dists >= 0].min())
 
 
 if __name__ == "__main__":
@@ -1,11 +1,18 @@
 from dataclasses import dataclass
 
+import numpy as np
+
+from aoc.counters import counted
+from aoc.grid import Grid
 
 EXAMPLE = """\
 498,4 -> 498,6 -> 496,6
 503,4 -> 502,4 -> 502,9 -> 494,9"""
 
 
+AIR, ROCK, SAND = 0, 1, 2
+
+
 @dataclass
 class Segment:
     start: complex
@@ -18,7 +25,7 @@ class Cave:
     y_min: int
     y_max: int
     segments: list[Segment]
-    space: dict[complex, str]
+    space: Grid
     sand_source: complex
 
     def __init__(
@@ -34,83 +41,61 @@ class Cave:
         self.x_min = int(min(min(s.start.real, s.end.real) for s in segments))
         self.y_max = int(max(max(s.start.imag, s.end.imag) for s in segments))
         self.y_min = 0
-        self.space = {
-            complex(x, y): "."
-            for y in range(self.y_min, self.y_max + 1)
-            for x in range(self.x_min, self.x_max + 1)
-        }
-        self.space[sand_source] = "+"
+        # with a floor the sand piles up in a triangle below the source
+        floor = self.y_max + 2
+        self.left = min(self.x_min, int(sand_source.real) - floor) - 1
+        right = max(self.x_max, int(sand_source.real) + floor) + 1
+        self.space = Grid.zeros((floor + 1, right - self.left + 1), dtype=np.uint8)
         for s in segments:
             self._add_segment(s)
+        if add_floor:
+            self.space[floor] = ROCK
+        self.path: list[tuple[int, int]] = []
 
     def _add_segment(self, segment: Segment) -> None:
-        start = segment.start
-        end = segment.end
-        x1, y1 = int(start.real), int(start.imag)
-        x2, y2 = int(end.real), int(end.imag)
-        x1, x2 = sorted([x1, x2])
-        y1, y2 = sorted([y1, y2])
-        if x1 == x2:
-            for y in range(y1, y2 + 1):
-                self.space[complex(x1, y)] = "#"
-        else:
-            for x in range(x1, x2 + 1):
-                self.space[complex(x, y1)] = "#"
+        x1, x2 = sorted([int(segment.start.real), int(segment.end.real)])
+        y1, y2 = sorted([int(segment.start.imag), int(segment.end.imag)])
+        self.space[y1 : y2 + 1, x1 - self.left : x2 - self.left + 1] = ROCK
 
     def is_blocked(self, point: complex) -> bool:
-        if self.add_floor:
-            return (
-                point.imag >= self.y_max + 2
-                or self.space.get(point, ".") == "#"
-                or self.space.get(point, ".") == "o"
-            )
-
-        return self.space[point] == "#" or self.space[point] == "o"
+        return bool(self.space[int(point.imag), int(point.real) - self.left])
 
+    @counted("drop_sand")
     def drop_sand(
         self,
         drop: complex | None = None,
     ) -> complex | None:
-        drop = self.sand_source if drop is None else drop
-        if not self.add_floor and (
-            drop.imag >= self.y_max
-            or drop.real <= self.x_min
-            or drop.real >= self.x_max
-        ):
-            return None
-        move = self.get_move(drop)
-        if move is not None:
-            return self.drop_sand(drop + move)
-        self.space[drop] = "o"
-        return drop
-
-    def get_move(self, point: complex) -> complex | None:
-        return (
-            y[0]
-            if len(
-                y := [
-                    x
-                    for x in [0 + +1j, -1 + 1j, 1 + 1j]
-                    if not self.is_blocked(point + x)
-                ]
-            )
-            else None
-        )
-
-    def _translate(self, point: complex) -> complex:
-        return point - complex(self.x_min, self.y_min)
+        # every grain follows the previous one until the cell where that one
+        # came to rest, so falls from the source resume along the last path
+        if drop is None:
+            path = self.path
+            if not path:
+                path.append((int(self.sand_source.imag), int(self.sand_source.real)))
+        else:
+            path = [(int(drop.imag), int(drop.real))]
+        space = self.space.array
+        y, x = path[-1][0], path[-1][1] - self.left
+        while True:
+            if not self.add_floor and (
+                y >= self.y_max
+                or x + self.left <= self.x_min
+                or x + self.left >= self.x_max
+            ):
+                return None
+            if not space[y + 1, x]:
+                y += 1
+            elif not space[y + 1, x - 1]:
+                y, x = y + 1, x - 1
+            elif not space[y + 1, x + 1]:
+                y, x = y + 1, x + 1
+            else:
+                space[y, x] = SAND
+                path.pop()
+                return complex(x + self.left, y)
+            path.append((y, x + self.left))
 
     def __repr__(self):
-        xs = [int(x.real) for x in self.space.keys()]
-        ys = [int(x.imag) for x in self.space.keys()]
-        xmin = min(xs)
-        xmax = max(xs)
-        ymin = min(ys)
-        ymax = max(ys)
-        return "\n".join(
-            "".join(self.space.get(complex(x, y), ".") for x in range(xmin, xmax + 1))
-            for y in range(ymin, ymax + 1)
-        )
+        return self.space.to_str(".#o")
 
 
 def parse_segments(data: str) -> list[Segment]:
@@ -76,7 +76,7 @@ def parse(data: str) -> list[tuple[complex, complex]]:
     return sensors
 
 
-def part_1(data: str, line: int) -> int:
+def part_1(data: str, line: int = 2_000_000) -> int:
     sensors = parse(data)
     space = defaultdict(list)
     for i, (sensor, beacon) in enumerate(sensors):
@@ -103,7 +103,7 @@ def part_1(data: str, line: int) -> int:
     return not_availables - beacons_in_line
 
 
-def part_2(data: str, max_line: int) -> int:
+def part_2(data: str, max_line: int = 4_000_000) -> int:
     sensors = parse(data)
     space = defaultdict(list)
     for i, (sensor, beacon) in enumerate(sensors):
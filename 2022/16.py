@@ -3,7 +3,9 @@ import re
 from collections import defaultdict
 from typing import NamedTuple
 
-from tqdm import trange
+from aoc.lazy import lazy_import
+
+tqdm = lazy_import("tqdm")
 
 EXAMPLE = """\
 Valve AA has flow rate=0; tunnels lead to valves DD, II, BB
@@ -144,7 +146,7 @@ class SarsaLearner:
         self.action_count = defaultdict(lambda: 0)
 
     def learn(self, n_episodes: int = 1000):
-        for _ in trange(n_episodes):
+        for _ in tqdm.trange(n_episodes):
             self._episode()
 
     def _episode(self):
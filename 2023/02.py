@@ -45,7 +45,7 @@ def parse_games(data: str) -> list[Game]:
     ]
 
 
-def part_1(data: str, max_hand: Hand) -> int:
+def part_1(data: str, max_hand: Hand = Hand(red=12, green=13, blue=14)) -> int:
     games = parse_games(data)
     posibble_hands = []
     for game in games:
@@ -1,6 +1,10 @@
 import re
 from typing import NamedTuple
 
+import numpy as np
+
+from aoc.grid import Grid
+
 EXAMPLE = """\
 467..114..
 ...*......
@@ -13,97 +17,61 @@ EXAMPLE = """\
 ...$.*....
 .664.598.."""
 
+DIGITS_AND_DOT = np.frombuffer(b"0123456789.", dtype=np.uint8)
+
 
 class Engine(NamedTuple):
-    grid: list[list[str]]
-    numbers: list[list[int]]
-    numbers_pos: list[list[tuple[int, int]]]
+    grid: Grid
+    numbers: list[int]
+    numbers_pos: list[tuple[int, int, int]]  # row, start, end
 
     @property
     def width(self) -> int:
-        return len(self.grid[0])
+        return self.grid.width
 
     @property
     def height(self) -> int:
-        return len(self.grid)
+        return self.grid.height
 
     @property
-    def gears(self) -> list[tuple[int, int]]:
-        return [
-            (x, y)
-            for y, row in enumerate(self.grid)
-            for x, cell in enumerate(row)
-            if cell == "*"
-        ]
-
-    def get_grid_neighbours(self, x: int, y: int) -> list[str]:
-        # print(self.grid[y][x])
-        neighbours = []
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                if i == j == 0:
-                    continue
-                if 0 <= x + i < self.width and 0 <= y + j < self.height:
-                    neighbours.append(self.grid[y + j][x + i])
-        return neighbours
+    def gears(self) -> np.ndarray:
+        return self.grid.find("*")
+
+    def number_ids(self) -> Grid:
+        """Index of the number covering each cell, -1 elsewhere."""
+        ids = Grid(np.full(self.grid.shape, -1, dtype=np.int64))
+        for k, (row, start, end) in enumerate(self.numbers_pos):
+            ids[row, start:end] = k
+        return ids
 
     def part_numbers_sum(self) -> int:
-        # print(self.get_grid_neighbours(x=2, 0))
-        value = 0
-        for i, numbers in enumerate(self.numbers_pos):
-            for j, pos in enumerate(numbers):
-                neighbours = set()
-                # print(pos[0], pos[1])
-                for k in range(pos[0], pos[1]):
-                    # print(i, j, k, self.get_grid_neighbours(k, i))
-                    #     print(i, j, self.get_grid_neighbours(i, k))
-                    neighbours.update(
-                        [
-                            x
-                            for x in self.get_grid_neighbours(k, i)
-                            if not x.isnumeric() and x != "."
-                        ]
-                    )
-
-                if len(neighbours):
-                    value += self.numbers[i][j]
-        return value
+        cells = self.grid.array
+        symbols = ~np.isin(cells, DIGITS_AND_DOT)
+        near_symbol = Grid(symbols).windows().any(axis=(2, 3))
+        return sum(
+            number
+            for number, (row, start, end) in zip(self.numbers, self.numbers_pos)
+            if near_symbol[row, start:end].any()
+        )
 
     def gear_ratio(self) -> int:
+        windows = self.number_ids().windows(fill=-1)
         value = 0
-        for gear in self.gears:
-            neighbours = set()
-            for i in range(-1, 2):
-                for j in range(-1, 2):
-                    if i == j == 0:
-                        continue
-                    if 0 <= gear[0] + i < self.width and 0 <= gear[1] + j < self.height:
-                        # print(gear, self.numbers_pos[gear[1] + j])
-                        for k, pos in enumerate(self.numbers_pos[gear[1] + j]):
-                            # print(gear, pos)
-                            if pos[0] <= gear[0] + i < pos[1]:
-                                # print("x", gear[1] + j, pos[0])
-                                neighbours.add(self.numbers[gear[1] + j][k])
-                        # if pos[0] <= gear[0] + i < pos[1]:
-                        #     neighbours.add(self.numbers[gear[1] + j][pos[0]])
-
+        for row, col in self.gears:
+            neighbours = np.unique(windows[row, col])
+            neighbours = neighbours[neighbours >= 0]
             if len(neighbours) == 2:
-                value += neighbours.pop() * neighbours.pop()
-
+                value += self.numbers[neighbours[0]] * self.numbers[neighbours[1]]
         return value
 
 
 def parse(data: str) -> Engine:
-    grid = [list(x) for x in data.splitlines()]
-    numbers_pos = [
-        [(m.start(0), m.end(0)) for m in re.finditer(r"\d+", x)]
-        for x in data.splitlines()
-    ]
-    numbers = [
-        [int("".join(grid[i][r[0] : r[1]])) for r in numbers]
-        for i, numbers in enumerate(numbers_pos)
-    ]
-    return Engine(grid=grid, numbers=numbers, numbers_pos=numbers_pos)
+    numbers, numbers_pos = [], []
+    for row, line in enumerate(data.splitlines()):
+        for m in re.finditer(r"\d+", line):
+            numbers.append(int(m.group(0)))
+            numbers_pos.append((row, m.start(0), m.end(0)))
+    return Engine(grid=Grid.from_str(data), numbers=numbers, numbers_pos=numbers_pos)
 
 
 def part_1(data: str) -> int:
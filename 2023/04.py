@@ -1,4 +1,9 @@
-from typing import NamedTuple
+from collections import deque
+from typing import Iterator, NamedTuple
+
+from aoc.inputs import Text, iter_lines
+
+MMAP_INPUT = True
 
 EXAMPLE = """\
 Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53
@@ -28,19 +33,28 @@ class Card(NamedTuple):
         return len(self.winning_numbers & self.numbers)
 
 
-def part_1(string: str) -> int:
-    cards = [Card.from_str(line) for line in string.splitlines()]
-    return sum([2 ** (card.score - 1) for card in cards if card.score > 0])
+def iter_cards(data: Text) -> Iterator[Card]:
+    return (Card.from_str(line) for line in iter_lines(data) if line)
 
 
-def part_2(string: str) -> int:
-    cards = [Card.from_str(line) for line in string.splitlines()]
-    n_cards = [1 for _ in range(len(cards))]
-    for i, card in enumerate(cards):
-        for j in range(card.score):
-            n_cards[i + j + 1] += n_cards[i]
+def part_1(string: Text) -> int:
+    return sum(2 ** (card.score - 1) for card in iter_cards(string) if card.score > 0)
 
-    return sum(n_cards)
+
+def part_2(string: Text) -> int:
+    # extra copies won by the cards still to come, the next card first; a card
+    # only wins copies of the following ones so this never outgrows the
+    # largest score
+    extra = deque()
+    total = 0
+    for card in iter_cards(string):
+        n = 1 + (extra.popleft() if extra else 0)
+        total += n
+        if len(extra) < card.score:
+            extra.extend([0] * (card.score - len(extra)))
+        for j in range(card.score):
+            extra[j] += n
+    return total
 
 
 if __name__ == "__main__":
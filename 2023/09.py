@@ -1,11 +1,19 @@
+from typing import Iterator
+
+from aoc.inputs import Text, iter_lines
+
+MMAP_INPUT = True
+
 EXAMPLE = """\
 0 3 6 9 12 15
 1 3 6 10 15 21
 10 13 16 21 30 45"""
 
 
-def parse(data: str) -> list[list[int]]:
-    return [list(map(int, line.split())) for line in data.splitlines()]
+def parse(data: Text) -> Iterator[list[int]]:
+    for line in iter_lines(data):
+        if line:
+            yield list(map(int, line.split()))
 
 
 def process_sequence(sequence: list[int]) -> list[list[int]]:
@@ -17,7 +25,7 @@ def process_sequence(sequence: list[int]) -> list[list[int]]:
     return sequences
 
 
-def part_1(data: str) -> int:
+def part_1(data: Text) -> int:
     sequences = parse(data)
     n = 0
     for seq in sequences:
@@ -26,7 +34,7 @@ def part_1(data: str) -> int:
     return n
 
 
-def part_2(data: str) -> int:
+def part_2(data: Text) -> int:
     sequences = parse(data)
     n = 0
     for seq in sequences:
@@ -70,7 +70,7 @@ def part_1(data: str) -> int:
     return sum(distances)
 
 
-def part_2(data: str, n: int) -> int:
+def part_2(data: str, n: int = 1_000_000 - 1) -> int:
     galaxies, empty_spaces_y, empty_spaces_x = parse(data)
     expanded_galaxies = expand(galaxies, empty_spaces_y, empty_spaces_x, n)
     distances = [
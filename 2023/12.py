@@ -2,6 +2,8 @@ import re
 from typing import NamedTuple
 from functools import cache
 
+from aoc.counters import watch_cache
+
 EXAMPLE = """\
 ???.### 1,1,3
 .??..??...?##. 1,1,3
@@ -28,6 +30,7 @@ def calculate_arragement(pattern: str) -> list[int]:
     return [len(x) for x in re.findall(r"#+", pattern)]
 
 
+@watch_cache("n_solutions")
 @cache
 def n_solutions(
     pattern: str, arrangement: tuple[int], current_group_size: int = 0
@@ -1,5 +1,9 @@
 from typing import NamedTuple
 
+import numpy as np
+
+from aoc.grid import Grid
+
 EXAMPLE = """\
 O....#....
 O.OO#....#
@@ -12,113 +16,68 @@ O.#..O.#.#
 #....###..
 #OO..#...."""
 
+ROUND, CUBE = ord("O"), ord("#")
+
 
-class Grid(NamedTuple):
-    grid: list[list[str]]
+class Platform(NamedTuple):
+    grid: Grid
 
     @property
     def width(self) -> int:
-        return len(self.grid[0])
+        return self.grid.width
 
     @property
     def height(self) -> int:
-        return len(self.grid)
+        return self.grid.height
 
     @classmethod
-    def from_str(cls, data: str) -> "Grid":
-        return cls([list(line) for line in data.splitlines()])
+    def from_str(cls, data: str) -> "Platform":
+        return cls(Grid.from_str(data))
 
     def __str__(self) -> str:
-        return "\n".join("".join(line) for line in self.grid)
-
-    def tilt_upwards(self) -> bool:
-        change = False
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] == "O":
-                    new_y = max(0, y - 1)
-                    if self.grid[new_y][x] == ".":
-                        self.grid[new_y][x] = "O"
-                        self.grid[y][x] = "."
-                        change = True
-        return change
-
-    def tilt_downwards(self) -> bool:
-        change = False
-        for y in range(self.height - 1, -1, -1):
-            for x in range(self.width):
-                if self.grid[y][x] == "O":
-                    new_y = min(self.height - 1, y + 1)
-                    if self.grid[new_y][x] == ".":
-                        self.grid[new_y][x] = "O"
-                        self.grid[y][x] = "."
-                        change = True
-        return change
-
-    def tilt_left(self) -> bool:
-        change = False
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] == "O":
-                    new_x = max(0, x - 1)
-                    if self.grid[y][new_x] == ".":
-                        self.grid[y][new_x] = "O"
-                        self.grid[y][x] = "."
-                        change = True
-        return change
-
-    def tilt_right(self) -> bool:
-        change = False
-        for y in range(self.height):
-            for x in range(self.width - 1, -1, -1):
-                if self.grid[y][x] == "O":
-                    new_x = min(self.width - 1, x + 1)
-                    if self.grid[y][new_x] == ".":
-                        self.grid[y][new_x] = "O"
-                        self.grid[y][x] = "."
-                        change = True
-        return change
+        return str(self.grid)
+
+    def tilt_upwards(self) -> "Platform":
+        # cube rocks split every column into segments; sorting each segment by
+        # (segment, kind) moves its round rocks to the top in a single pass
+        cells = self.grid.array
+        segment = np.cumsum(cells == CUBE, axis=0)
+        kind = np.select([cells == CUBE, cells == ROUND], [0, 1], 2)
+        order = np.argsort(segment * 3 + kind, axis=0, kind="stable")
+        return Platform(Grid(np.take_along_axis(cells, order, axis=0)))
+
+    def cycle(self) -> "Platform":
+        # north, west, south, east: tilting up then turning clockwise each time
+        platform = self
+        for _ in range(4):
+            platform = Platform(platform.tilt_upwards().grid.rotate(-1))
+        return platform
 
     def total_load(self) -> int:
-        return sum(
-            line.count("O") * (self.height - i) for i, line in enumerate(self.grid)
-        )
+        rows = np.count_nonzero(self.grid.array == ROUND, axis=1)
+        return int((rows * np.arange(self.height, 0, -1)).sum())
 
 
 def part_1(data: str) -> int:
-    grid = Grid.from_str(data)
-    while grid.tilt_upwards():
-        continue
-    return grid.total_load()
-
-
-def iterate(grid: Grid) -> Grid:
-    while grid.tilt_upwards():
-        continue
-    while grid.tilt_left():
-        continue
-    while grid.tilt_downwards():
-        continue
-    while grid.tilt_right():
-        continue
-    return grid
+    return Platform.from_str(data).tilt_upwards().total_load()
 
 
 def part_2(data: str) -> int:
-    grid = Grid.from_str(data)
-    grid_cache = {}
+    platform = Platform.from_str(data)
+    seen = {}
     n = 1_000_000_000
     i = 0
     while i < n:
-        grid = iterate(grid)
+        platform = platform.cycle()
         i += 1
-        if x := grid_cache.get(str(grid)):
+        key = platform.grid.array.tobytes()
+        if x := seen.get(key):
             length = i - x
             i += (n - i) // length * length
         else:
-            grid_cache[str(grid)] = i
+            seen[key] = i
 
-    return grid.total_load()
+    return platform.total_load()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,8 @@
-from collections import Counter
+import numpy as np
+
+from aoc.inputs import Text, parse_ints
+
+MMAP_INPUT = True
 
 EXAMPLE = """\
 3   4
@@ -9,22 +13,21 @@ EXAMPLE = """\
 3   3"""
 
 
-def parse(data: str) -> tuple[list[int], list[int]]:
-    parsed: list[list[int]] = [list(map(int, x.split())) for x in data.splitlines()]
-    return [x[0] for x in parsed], [x[1] for x in parsed]
+def parse(data: Text) -> tuple[np.ndarray, np.ndarray]:
+    left, right = parse_ints(data).reshape(-1, 2).T
+    return left, right
 
 
-def part_1(data: str) -> int:
-    parsed = parse(data)
-    a = sorted(parsed[0])
-    b = sorted(parsed[1])
-    return sum([abs(x - y) for x, y in zip(a, b)])
+def part_1(data: Text) -> int:
+    a, b = parse(data)
+    return int(np.abs(np.sort(a) - np.sort(b)).sum())
 
 
-def part_2(data: str) -> int:
-    parsed = parse(data)
-    count = Counter(parsed[1])
-    return sum([x * count[x] for x in parsed[0]])
+def part_2(data: Text) -> int:
+    a, b = parse(data)
+    values, counts = np.unique(b, return_counts=True)
+    i = np.minimum(np.searchsorted(values, a), len(values) - 1)
+    return int((a * np.where(values[i] == a, counts[i], 0)).sum())
 
 
 if __name__ == "__main__":
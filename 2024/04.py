@@ -1,4 +1,6 @@
-from typing import Generator
+import numpy as np
+
+from aoc.grid import Grid, shift
 
 EXAMPLE = """\
 MMMSXXMASM
@@ -13,72 +15,34 @@ MAMMMXMMMM
 MXMXAXMASX"""
 
 
-def parse(data: str) -> list[list[str]]:
-    return [list(x) for x in data.splitlines()]
+DIRECTIONS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
 
 
-def paths_from_point(x: int, y: int, n: int, m: int, length: int) -> Generator[list[tuple[int, int]], None, None]:
-    # to the right
-    yield [(x, y + i) for i in range(min(m - y, length))]
-    # to the left
-    yield [(x, y - i) for i in range(min(y + 1, length))]
-    # to the bottom
-    yield [(x + i, y) for i in range(min(n - x, length))]
-    # to the top
-    yield [(x - i, y) for i in range(min(x + 1, length))]
-    # to the bottom right
-    yield [(x + i, y + i) for i in range(min(n - x, m - y, length))]
-    # to the bottom left
-    yield [(x + i, y - i) for i in range(min(n - x, y + 1, length))]
-    # to the top right
-    yield [(x - i, y + i) for i in range(min(x + 1, m - y, length))]
-    # to the top left
-    yield [(x - i, y - i) for i in range(min(x + 1, y + 1, length))]
+def parse(data: str) -> Grid:
+    return Grid.from_str(data)
 
 
-def crosses_from_point(x: int, y: int, n: int, m: int) -> list[list[tuple[int, int]]]:
-    if x == 0 or x == n - 1 or y == 0 or y == m - 1:
-        return []
-    return [
-        [(x - 1, y - 1), (x, y), (x + 1, y + 1)],
-        [(x - 1, y + 1), (x, y), (x + 1, y - 1)],
-    ]
+def matches(grid: Grid, word: str, dy: int, dx: int) -> np.ndarray:
+    """Cells where ``word`` starts when read in direction (dy, dx)."""
+    found = np.ones(grid.shape, dtype=bool)
+    for i, letter in enumerate(word.encode()):
+        found &= grid.shifted(i * dy, i * dx) == letter
+    return found
 
 
 def part_1(raw: str) -> int:
-    data = parse(raw)
-    find_xs = lambda x: [(i, j) for i, row in enumerate(x) for j, col in enumerate(row) if col == "X"]
-    xs = find_xs(data)
-    n, m = len(data), len(data[0])
-    val = 0
-    for x, y in xs:
-        for path in paths_from_point(x, y, n, m, 4):
-            word = "".join(data[i][j] for i, j in path)
-            if len(word) == 4:
-                if word == "XMAS" or word == "SAMX":
-                    val += 1
-    return val
+    grid = parse(raw)
+    return sum(int(matches(grid, "XMAS", dy, dx).sum()) for dy, dx in DIRECTIONS)
 
 
 def part_2(raw: str) -> int:
-    data = parse(raw)
-    find_as = lambda x: [(i, j) for i, row in enumerate(x) for j, col in enumerate(row) if col == "A"]
-    as_ = find_as(data)
-    n, m = len(data), len(data[0])
-    val = 0
-    for x, y in as_:
-        n_mas = 0
-        for path in crosses_from_point(x, y, n, m):
-            try:
-                word = "".join(data[i][j] for i, j in path)
-                if word == "MAS" or word == "SAM":
-                    n_mas += 1
-            except IndexError:
-                pass
-        if n_mas == 2:
-            val += 1
-
-    return val
+    grid = parse(raw)
+    # each diagonal through an A reads MAS or SAM, starting from its top corner
+    diagonals = []
+    for dx in (1, -1):
+        mas = matches(grid, "MAS", 1, dx) | matches(grid, "SAM", 1, dx)
+        diagonals.append(shift(mas, -1, -dx, False))
+    return int((diagonals[0] & diagonals[1] & (grid.array == ord("A"))).sum())
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""Shared tooling to run and measure the daily solvers."""
@@ -0,0 +1,232 @@
+import argparse
+import ast
+import json
+import sys
+from typing import Any
+
+from aoc import counters, timings
+from aoc.cache import ResultCache
+from aoc.runner import PARTS, discover, format_result, run, select
+
+# aoc.bench and aoc.parallel pull in multiprocessing, so they are imported by
+# the commands that use them to keep plain runs starting fast
+
+
+def parse_param(param: str) -> tuple[str, Any]:
+    key, value = param.split("=", 1)
+    try:
+        return key, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return key, value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run and time the solvers")
+    run_parser.add_argument(
+        "days", nargs="*", help="days to run, e.g. 2021 or 2023/05 (default: all)"
+    )
+    run_parser.add_argument(
+        "-p", "--part", type=int, choices=[1, 2], action="append", dest="parts"
+    )
+    run_parser.add_argument(
+        "--param",
+        type=parse_param,
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="keyword argument passed to the parts accepting it, e.g. n=9",
+    )
+    run_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        nargs="?",
+        const=0,
+        help="run the parts on a process pool of this size (default: all cores)",
+    )
+    run_parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="cache",
+        help="recompute every part instead of reusing cached results",
+    )
+    run_parser.add_argument(
+        "--json", action="store_true", help="print one JSON object per result"
+    )
+    run_parser.add_argument(
+        "--profile",
+        choices=["cprofile", "sample"],
+        help="profile every part, writing reports to .aoc/profiles",
+    )
+    run_parser.add_argument(
+        "--counters",
+        action="store_true",
+        help="report the counters solvers keep on their hot functions",
+    )
+
+    bench_parser = commands.add_parser(
+        "bench", help="time the solvers on synthetic inputs of growing size"
+    )
+    bench_parser.add_argument("days", nargs="*", help="days to bench (default: all)")
+    bench_parser.add_argument(
+        "-p", "--part", type=int, choices=[1, 2], action="append", dest="parts"
+    )
+    bench_parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        metavar="N",
+        help="input sizes relative to a real input (default: 1 10 100)",
+    )
+    bench_parser.add_argument(
+        "--timeout", type=float, default=60.0, help="seconds allowed per measurement"
+    )
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        metavar="N",
+        help="report the median of N runs of every measurement",
+    )
+    bench_parser.add_argument(
+        "--warmup", type=int, default=0, metavar="N", help="discarded runs first"
+    )
+    bench_parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store the results as the baselines in .aoc/baselines.json",
+    )
+    bench_parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="compare against the stored baselines and fail on regressions",
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown counted as a regression (default: 0.10)",
+    )
+    bench_parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=0.10,
+        help="relative memory growth counted as a regression (default: 0.10)",
+    )
+    bench_parser.add_argument(
+        "--json", action="store_true", help="print one JSON object per result"
+    )
+
+    cache_parser = commands.add_parser("cache", help="inspect or clear the cache")
+    cache_commands = cache_parser.add_subparsers(dest="cache_command", required=True)
+    cache_commands.add_parser("info", help="show the size of the cache")
+    invalidate_parser = cache_commands.add_parser(
+        "invalidate", help="drop cached results"
+    )
+    invalidate_parser.add_argument(
+        "days", nargs="*", help="days to drop (default: all)"
+    )
+    return parser
+
+
+def main_cache(args: argparse.Namespace) -> int:
+    cache = ResultCache()
+    if args.cache_command == "invalidate":
+        days = select(discover(), args.days) if args.days else None
+        print(f"removed {cache.invalidate(days)} entries")
+    else:
+        print(
+            f"{len(cache.entries())} entries, {cache.size() / 1024:.1f} KiB "
+            f"of {cache.max_bytes / 1024 / 1024:.0f} MiB in {cache.path}"
+        )
+    return 0
+
+
+def main_bench(args: argparse.Namespace) -> int:
+    from aoc import baseline
+    from aoc.bench import SCALES, bench, format_bench_result, format_growth
+
+    days = select(discover(), args.days)
+    parts = [f"part_{p}" for p in args.parts] if args.parts else PARTS
+    scales = args.scales or SCALES
+    results = bench(
+        days, parts, scales, args.timeout, args.seed, args.repeat, args.warmup
+    )
+    baselines = baseline.load() if args.compare else {}
+    done, failed = [], False
+    for result in results:
+        done.append(result)
+        if args.compare:
+            comparison = baseline.compare_one(
+                result,
+                baselines.get(baseline.key(result)),
+                args.threshold,
+                args.memory_threshold,
+            )
+            failed |= comparison.status in ("regression", "error")
+            if args.json:
+                print(json.dumps(comparison.to_dict()), flush=True)
+            else:
+                print(baseline.format_comparison(comparison), flush=True)
+        elif args.json:
+            print(json.dumps(result.to_dict()), flush=True)
+        else:
+            print(format_bench_result(result), flush=True)
+    if not args.json and not args.compare:
+        print()
+        print(format_growth(done))
+    if args.save_baseline:
+        n = baseline.record(done, args.repeat)
+        if not args.json:
+            print(f"saved {n} baselines to {baseline.BASELINES_PATH}")
+    return int(failed)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "bench":
+        return main_bench(args)
+    if args.command == "cache":
+        return main_cache(args)
+
+    days = select(discover(), args.days)
+    parts = [f"part_{p}" for p in args.parts] if args.parts else PARTS
+    params = dict(args.param)
+    if args.counters:
+        counters.enable()
+    # profiles and counters need the parts to actually run
+    instrumented = args.profile is not None or args.counters
+    cache = ResultCache() if args.cache and not instrumented else None
+    if args.jobs is None:
+        results = run(days, parts, params, cache, args.profile)
+    else:
+        from aoc.parallel import run_parallel
+
+        results = run_parallel(
+            days, parts, params, args.jobs or None, cache, args.profile
+        )
+
+    done = []
+    for result in results:
+        done.append(result)
+        if args.json:
+            print(json.dumps(result.to_dict()), flush=True)
+        else:
+            print(format_result(result), flush=True)
+    # timings measured with non-default parameters or under a profiler would
+    # mislead the scheduler
+    if not params and args.profile is None:
+        timings.update(done)
+    if args.profile is not None and not args.json:
+        from aoc.profiling import PROFILE_DIR
+
+        print(f"profiles written to {PROFILE_DIR}")
+    return int(any(result.error is not None for result in done))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Stored benchmark baselines and the regression check against them.
+
+A baseline is the median wall time and memory of one (day, part, scale) as
+measured by ``aoc.bench``, kept in ``.aoc/baselines.json`` along with the
+input size and the commit it was recorded at. A new measurement regresses
+when it is slower (or grows more memory) than its baseline by more than the
+relative threshold *and* by more than an absolute floor, so that timer noise
+on sub-millisecond parts is not reported.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple
+
+from aoc.bench import BenchResult
+from aoc.runner import ROOT
+from aoc.timings import STATE_DIR
+
+BASELINES_PATH = STATE_DIR / "baselines.json"
+
+TIME_THRESHOLD = 0.10
+MEMORY_THRESHOLD = 0.10
+MIN_TIME_DELTA = 0.005  # seconds
+MIN_MEMORY_DELTA = 1024  # KiB
+
+
+def key(result: BenchResult) -> str:
+    return f"{result.day}:{result.part}:x{result.scale}"
+
+
+def current_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def load(path: Path = BASELINES_PATH) -> dict[str, dict[str, Any]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def record(
+    results: Iterable[BenchResult], repeat: int = 1, path: Path = BASELINES_PATH
+) -> int:
+    """Store the successful results as the new baselines, returning how many."""
+    baselines = load(path)
+    commit, recorded = current_commit(), time.time()
+    n = 0
+    for result in results:
+        if result.error is not None or result.part == "-":
+            continue
+        baselines[key(result)] = {
+            "size": result.size,
+            "wall": result.wall,
+            "cpu": result.cpu,
+            "peak_rss": result.peak_rss,
+            "rss_growth": result.rss_growth,
+            "repeat": repeat,
+            "commit": commit,
+            "recorded": recorded,
+        }
+        n += 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True))
+    return n
+
+
+class Comparison(NamedTuple):
+    result: BenchResult
+    baseline: dict[str, Any] | None
+    # "regression", "improvement", "ok", "new" (no baseline), "stale" (the
+    # generator now makes a different input size) or "error"
+    status: str
+    time_ratio: float | None = None
+    memory_ratio: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.result.to_dict(),
+            "status": self.status,
+            "time_ratio": self.time_ratio,
+            "memory_ratio": self.memory_ratio,
+            "baseline": self.baseline,
+        }
+
+
+def _ratio(new: float, old: float) -> float | None:
+    return new / old if old > 0 else None
+
+
+def compare_one(
+    result: BenchResult,
+    baseline: dict[str, Any] | None,
+    time_threshold: float = TIME_THRESHOLD,
+    memory_threshold: float = MEMORY_THRESHOLD,
+) -> Comparison:
+    if result.error is not None:
+        return Comparison(result, baseline, "error")
+    if baseline is None:
+        return Comparison(result, baseline, "new")
+    if baseline["size"] != result.size:
+        return Comparison(result, baseline, "stale")
+    old_wall, old_rss = baseline["wall"], baseline["rss_growth"]
+    time_ratio = _ratio(result.wall, old_wall)
+    memory_ratio = _ratio(result.rss_growth, old_rss)
+    slower = (
+        result.wall > old_wall * (1 + time_threshold)
+        and result.wall - old_wall > MIN_TIME_DELTA
+    )
+    bigger = (
+        result.rss_growth > old_rss * (1 + memory_threshold)
+        and result.rss_growth - old_rss > MIN_MEMORY_DELTA
+    )
+    faster = (
+        result.wall < old_wall / (1 + time_threshold)
+        and old_wall - result.wall > MIN_TIME_DELTA
+    )
+    if slower or bigger:
+        status = "regression"
+    elif faster:
+        status = "improvement"
+    else:
+        status = "ok"
+    return Comparison(result, baseline, status, time_ratio, memory_ratio)
+
+
+def format_comparison(comparison: Comparison) -> str:
+    result, baseline = comparison.result, comparison.baseline
+    head = f"{result.day} {result.part:<6} x{result.scale:<4}"
+    if comparison.status == "error":
+        return f"{head}  ERROR {result.error.splitlines()[-1]}"
+    now = f"{result.wall * 1000:10.2f} ms {result.rss_growth / 1024:8.1f} MiB"
+    if baseline is None or comparison.status == "stale":
+        return f"{head}  {now}  {comparison.status.upper()}"
+    fmt = lambda r: "   n/a" if r is None else f"{r:6.2f}x"
+    return (
+        f"{head}  {now}  was {baseline['wall'] * 1000:10.2f} ms "
+        f"{baseline['rss_growth'] / 1024:8.1f} MiB  time {fmt(comparison.time_ratio)}"
+        f"  memory {fmt(comparison.memory_ratio)}"
+        + ("" if comparison.status == "ok" else f"  {comparison.status.upper()}")
+    )
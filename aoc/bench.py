@@ -0,0 +1,222 @@
+"""Measure how each solver scales on synthetic inputs of growing size.
+
+Every (day, part, scale) runs in a child process so that a solver that blows
+up can be stopped after ``timeout`` seconds and its memory is not shared with
+the next measurement. Once a part times out (or fails) its larger scales are
+skipped.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import statistics
+import traceback
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from aoc.generators import GENERATORS, generate
+from aoc.runner import (
+    PARTS,
+    Day,
+    Result,
+    current_rss,
+    get_parts,
+    load_module,
+    run_part,
+)
+
+SCALES = (1, 10, 100)
+
+
+class BenchResult(NamedTuple):
+    day: Day
+    part: str
+    scale: int
+    size: int  # input bytes
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_rss: int = 0
+    base_rss: int = 0  # RSS of the worker before running the part
+    error: str | None = None
+
+    @property
+    def rss_growth(self) -> int:
+        return self.peak_rss - self.base_rss
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "year": self.day.year,
+            "day": self.day.day,
+            "part": self.part,
+            "scale": self.scale,
+            "size": self.size,
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "peak_rss": self.peak_rss,
+            "base_rss": self.base_rss,
+            "error": self.error,
+        }
+
+
+def _child(conn, day: Day, part: str, data: str, params: dict | None) -> None:
+    base = current_rss()
+    conn.send((run_part(day, part, data, params), base))
+    conn.close()
+
+
+def run_isolated(
+    day: Day,
+    part: str,
+    data: str,
+    params: dict[str, Any] | None = None,
+    timeout: float | None = None,
+) -> tuple[Result, int]:
+    """
+    Run a part in a fresh process and return its result along with the RSS of
+    that process before the part started.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_child, args=(sender, day, part, data, params), daemon=True
+    )
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            return Result(day, part, error=f"timeout after {timeout}s"), 0
+        return receiver.recv()
+    except EOFError:
+        error = f"worker died (exit code {process.exitcode})"
+        return Result(day, part, error=error), 0
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+
+def measure_repeated(
+    day: Day,
+    part: str,
+    data: str,
+    params: dict[str, Any] | None = None,
+    timeout: float | None = None,
+    repeat: int = 1,
+    warmup: int = 0,
+) -> tuple[Result, int]:
+    """
+    Run a part ``warmup`` times, discarding the results, then ``repeat`` times
+    and return the median of each measurement. Every run is isolated, so a
+    solver memoising across calls is not timed on a warm cache.
+    """
+    for _ in range(warmup):
+        result, base = run_isolated(day, part, data, params, timeout)
+        if result.error is not None:
+            return result, base
+    runs = []
+    for _ in range(repeat):
+        result, base = run_isolated(day, part, data, params, timeout)
+        if result.error is not None:
+            return result, base
+        runs.append((result, base))
+    results = [r for r, _ in runs]
+    return (
+        result._replace(
+            wall=statistics.median(r.wall for r in results),
+            cpu=statistics.median(r.cpu for r in results),
+            peak_rss=int(statistics.median(r.peak_rss for r in results)),
+        ),
+        int(statistics.median(b for _, b in runs)),
+    )
+
+
+def bench(
+    days: Iterable[Day],
+    parts: Iterable[str] = PARTS,
+    scales: Iterable[int] = SCALES,
+    timeout: float | None = 60.0,
+    seed: int = 0,
+    repeat: int = 1,
+    warmup: int = 0,
+) -> Iterator[BenchResult]:
+    parts, scales = list(parts), sorted(scales)
+    for day in days:
+        if day not in GENERATORS:
+            continue
+        spec = GENERATORS[day]
+        try:
+            available = [
+                p for p in get_parts(load_module(day), parts) if p in spec.parts
+            ]
+        except Exception:
+            yield BenchResult(
+                day, "-", 0, 0, error=traceback.format_exc(limit=-1).strip()
+            )
+            continue
+        failed = set()
+        for scale in scales:
+            try:
+                data = generate(day, scale, seed)
+            except Exception:
+                error = traceback.format_exc(limit=-1).strip()
+                yield BenchResult(day, "-", scale, 0, error=error)
+                break
+            for part in available:
+                if part in failed:
+                    continue
+                result, base = measure_repeated(
+                    day, part, data, spec.params, timeout, repeat, warmup
+                )
+                if result.error is not None:
+                    failed.add(part)
+                yield BenchResult(
+                    day,
+                    part,
+                    scale,
+                    len(data),
+                    result.wall,
+                    result.cpu,
+                    result.peak_rss,
+                    base,
+                    result.error,
+                )
+
+
+def growth(results: Iterable[BenchResult], field: str = "wall") -> float | None:
+    """
+    Least-squares slope of log(field) against log(input size), i.e. ``k`` in
+    ``field ~ size^k``. About 1 for linear solvers, 2 for quadratic ones.
+    """
+    points = [
+        (math.log(r.size), math.log(v))
+        for r in results
+        if r.error is None and r.size > 0 and (v := getattr(r, field)) > 0
+    ]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, _ in points) / len(points)
+    my = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    if sxx == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in points) / sxx
+
+
+def format_bench_result(result: BenchResult) -> str:
+    head = f"{result.day} {result.part:<6} x{result.scale:<4} {result.size:>11,} B"
+    if result.error is not None:
+        return f"{head}  ERROR {result.error.splitlines()[-1]}"
+    return (
+        f"{head}  wall {result.wall * 1000:10.2f} ms  "
+        f"rss {result.peak_rss / 1024:8.1f} MiB"
+    )
+
+
+def format_growth(results: list[BenchResult]) -> str:
+    lines = []
+    keys = sorted({(r.day, r.part) for r in results if r.part != "-"})
+    for day, part in keys:
+        rs = [r for r in results if (r.day, r.part) == (day, part)]
+        k_time, k_mem = growth(rs, "wall"), growth(rs, "rss_growth")
+        fmt = lambda k: "   n/a" if k is None else f"n^{k:4.2f}"
+        lines.append(f"{day} {part:<6}  time ~ {fmt(k_time)}  memory ~ {fmt(k_mem)}")
+    return "\n".join(lines)
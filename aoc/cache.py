@@ -0,0 +1,170 @@
+"""On-disk cache of part results, so unchanged days are not recomputed.
+
+An entry is keyed by the hash of the solver source (and of every ``aoc`` module
+it imports, directly or through other helpers), the hash of the input and the
+parameters of the run. Entries are small JSON files under ``.aoc/cache``;
+reading one bumps its modification time and the least recently used ones are
+evicted once the directory outgrows ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from aoc.inputs import Text, as_buffer
+from aoc.runner import ROOT, Day, Result
+from aoc.timings import STATE_DIR
+
+CACHE_DIR = STATE_DIR / "cache"
+MAX_BYTES = 64 * 1024 * 1024
+
+HELPERS_DIR = ROOT / "aoc"
+
+
+def aoc_imports(source: bytes) -> set[str]:
+    """
+    Names of the ``aoc`` modules a source imports anywhere in it, whether as
+    ``import aoc.X``, ``from aoc.X import ...`` or ``from aoc import X, Y``
+    (names that are not modules are kept too and simply match no file).
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:  # loading the solver reports it
+        return set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules = [node.module]
+            if node.module == "aoc":
+                modules += [f"aoc.{alias.name}" for alias in node.names]
+        else:
+            continue
+        names.update(m.split(".")[1] for m in modules if m.startswith("aoc."))
+    return names
+
+
+def helper_sources(source: bytes, path: Path = HELPERS_DIR) -> list[Path]:
+    """
+    Every ``aoc`` helper a source depends on, directly or through the helpers
+    it imports, sorted by name.
+    """
+    seen: set[str] = set()
+    pending = aoc_imports(source)
+    while pending:
+        name = pending.pop()
+        helper = path / f"{name}.py"
+        if name in seen or not helper.exists():
+            continue
+        seen.add(name)
+        pending |= aoc_imports(helper.read_bytes()) - seen
+    return [path / f"{name}.py" for name in sorted(seen)]
+
+
+def _entry_prefix(day: Day) -> str:
+    return f"{day.year}-{day.day:02d}-"
+
+
+class ResultCache:
+    def __init__(
+        self,
+        path: Path = CACHE_DIR,
+        max_bytes: int = MAX_BYTES,
+        helpers: Path = HELPERS_DIR,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.helpers = helpers
+        self._sources: dict[Day, str] = {}
+
+    def source_hash(self, day: Day) -> str:
+        if day not in self._sources:
+            source = day.path.read_bytes()
+            digest = hashlib.sha256(source)
+            # shared helpers are part of the solver as far as answers go, and
+            # so are the helpers they import in turn
+            for helper in helper_sources(source, self.helpers):
+                digest.update(helper.name.encode())
+                digest.update(helper.read_bytes())
+            self._sources[day] = digest.hexdigest()
+        return self._sources[day]
+
+    def key(
+        self, day: Day, part: str, data: Text, params: dict[str, Any] | None = None
+    ) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.source_hash(day).encode())
+        digest.update(hashlib.sha256(as_buffer(data)).digest())
+        digest.update(json.dumps(params or {}, sort_keys=True, default=repr).encode())
+        return f"{_entry_prefix(day)}{part}-{digest.hexdigest()[:32]}"
+
+    def get(self, key: str) -> Result | None:
+        path = self.path / f"{key}.json"
+        try:
+            entry = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return Result(
+            Day(entry["year"], entry["day"]),
+            entry["part"],
+            entry["answer"],
+            entry["wall"],
+            entry["cpu"],
+            entry["peak_rss"],
+            cached=True,
+        )
+
+    def put(self, key: str, result: Result) -> None:
+        if result.error is not None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / f"{key}.json.{os.getpid()}"
+        tmp.write_text(json.dumps(result._replace(cached=False).to_dict()))
+        tmp.replace(self.path / f"{key}.json")
+        self.evict()
+
+    def entries(self, days: Iterable[Day] | None = None) -> list[Path]:
+        if not self.path.is_dir():
+            return []
+        if days is None:
+            return list(self.path.glob("*.json"))
+        return [
+            path
+            for day in days
+            for path in self.path.glob(f"{_entry_prefix(day)}*.json")
+        ]
+
+    def size(self) -> int:
+        return sum(path.stat().st_size for path in self.entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        stats = []
+        for path in self.entries():
+            try:
+                stats.append((path.stat(), path))
+            except OSError:
+                continue
+        total = sum(stat.st_size for stat, _ in stats)
+        removed = 0
+        for stat, path in sorted(stats, key=lambda x: x[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            removed += 1
+        return removed
+
+    def invalidate(self, days: Iterable[Day] | None = None) -> int:
+        """Drop the entries of the given days, or every entry."""
+        paths = self.entries(days)
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return len(paths)
@@ -0,0 +1,83 @@
+"""Opt-in counters on the hot functions of a solver.
+
+Counters are off unless ``AOC_COUNTERS=1`` is set (``python -m aoc run
+--counters`` sets it) when the solver is imported. While off, ``counted`` and
+``watch_cache`` hand back the function untouched, so they cost nothing.
+
+    @counted("explode")
+    def explode(number): ...
+
+    @watch_cache("n_solutions")  # reports hits, misses and currsize
+    @cache
+    def n_solutions(pattern, arrangement): ...
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+from collections import Counter
+from typing import Callable, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+ENV_VAR = "AOC_COUNTERS"
+
+_counts: Counter[str] = Counter()
+_caches: dict[str, Callable] = {}
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV_VAR) == "1"
+
+
+def enable() -> None:
+    # through the environment so that pool workers inherit it
+    os.environ[ENV_VAR] = "1"
+
+
+def counted(name: str) -> Callable[[F], F]:
+    """Count the calls of the decorated function."""
+
+    def decorate(fn: F) -> F:
+        if not enabled():
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            _counts[name] += 1
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def watch_cache(name: str) -> Callable[[F], F]:
+    """Report the ``cache_info()`` of a ``functools.cache``d function."""
+
+    def decorate(fn: F) -> F:
+        if enabled():
+            _caches[name] = fn
+        return fn
+
+    return decorate
+
+
+def snapshot() -> dict[str, int]:
+    values = dict(_counts)
+    for name, fn in _caches.items():
+        info = fn.cache_info()
+        values[f"{name}.hits"] = info.hits
+        values[f"{name}.misses"] = info.misses
+        values[f"{name}.currsize"] = info.currsize
+    return values
+
+
+def diff(before: dict[str, int], after: dict[str, int]) -> dict[str, int]:
+    """What changed between two snapshots, e.g. over one part."""
+    return {
+        name: value - before.get(name, 0)
+        for name, value in sorted(after.items())
+        if value != before.get(name, 0)
+    }
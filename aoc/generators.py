@@ -0,0 +1,574 @@
+"""Synthetic puzzle inputs whose size grows with a scale factor.
+
+``scale=1`` approximates the size of a real puzzle input, ``scale=10`` and
+``scale=100`` grow the dimension the solver is most sensitive to (number of
+lines, grid area, number of sensors, ...). Every generator is deterministic for
+a given ``random.Random`` state.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import random
+import string
+from collections import defaultdict, deque
+from typing import Callable, NamedTuple
+
+from aoc.runner import PARTS, Day
+
+
+class Generator(NamedTuple):
+    fn: Callable[[int, random.Random], str]
+    parts: tuple[str, ...] = PARTS
+    params: dict | None = None
+
+
+GENERATORS: dict[Day, Generator] = {}
+
+
+def generator(
+    year: int, day: int, parts: tuple[str, ...] = PARTS, params: dict | None = None
+) -> Callable:
+    def register(fn: Callable[[int, random.Random], str]) -> Callable:
+        GENERATORS[Day(year, day)] = Generator(fn, parts, params)
+        return fn
+
+    return register
+
+
+def generate(day: Day, scale: int, seed: int = 0) -> str:
+    return GENERATORS[day].fn(scale, random.Random(f"{day}:{scale}:{seed}"))
+
+
+def side(base: int, scale: int) -> int:
+    # grids grow in area, not in side length
+    return max(1, round(base * math.sqrt(scale)))
+
+
+def digit_grid(n: int, m: int, rng: random.Random, digits: str = "0123456789") -> str:
+    return "\n".join("".join(rng.choices(digits, k=m)) for _ in range(n))
+
+
+# 2021
+
+
+@generator(2021, 1)
+def depths(scale: int, rng: random.Random) -> str:
+    depth, lines = 100, []
+    for _ in range(2000 * scale):
+        depth = max(0, depth + rng.randint(-5, 10))
+        lines.append(str(depth))
+    return "\n".join(lines)
+
+
+@generator(2021, 2)
+def commands(scale: int, rng: random.Random) -> str:
+    return "\n".join(
+        f"{rng.choice(['forward', 'down', 'up'])} {rng.randint(1, 9)}"
+        for _ in range(1000 * scale)
+    )
+
+
+@generator(2021, 3)
+def diagnostic(scale: int, rng: random.Random) -> str:
+    n = 1000 * scale
+    width = max(12, math.ceil(math.log2(n)) + 2)
+    numbers = rng.sample(range(2**width), n)
+    # where all the numbers left share a bit, the least common bit criterion
+    # keeps the value none of them has and the CO2 rating is lost; flipping
+    # it in one of them makes that one the rating. The group is every number
+    # with its prefix, so the flipped number is still unique.
+    group = list(range(n))
+    for bit in reversed(range(width)):
+        if len(group) == 1:
+            break
+        ones = [i for i in group if numbers[i] >> bit & 1]
+        zeros = [i for i in group if not numbers[i] >> bit & 1]
+        if not ones or not zeros:
+            numbers[group[0]] ^= 1 << bit
+            break
+        group = zeros if len(zeros) <= len(ones) else ones
+    return "\n".join(f"{x:0{width}b}" for x in numbers)
+
+
+@generator(2021, 4)
+def bingo(scale: int, rng: random.Random) -> str:
+    n = 100 * scale
+    numbers = list(range(n))
+    rng.shuffle(numbers)
+    boards = []
+    for _ in range(n):
+        cells = rng.sample(range(n), 25)
+        boards.append(
+            "\n".join(
+                " ".join(f"{c:>{len(str(n))}}" for c in cells[i : i + 5])
+                for i in range(0, 25, 5)
+            )
+        )
+    return ",".join(map(str, numbers)) + "\n\n" + "\n\n".join(boards)
+
+
+@generator(2021, 5)
+def vents(scale: int, rng: random.Random) -> str:
+    size = side(1000, scale)
+    lines = []
+    for _ in range(500 * scale):
+        x1, y1 = rng.randrange(size), rng.randrange(size)
+        dx, dy = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1)])
+        room = [size - 1 - v if d > 0 else v for v, d in ((x1, dx), (y1, dy)) if d]
+        length = rng.randint(0, min(room + [size // 3]))
+        lines.append(f"{x1},{y1} -> {x1 + dx * length},{y1 + dy * length}")
+    return "\n".join(lines)
+
+
+@generator(2021, 6)
+def lanternfish(scale: int, rng: random.Random) -> str:
+    return ",".join(str(rng.randint(1, 5)) for _ in range(300 * scale))
+
+
+@generator(2021, 7)
+def crabs(scale: int, rng: random.Random) -> str:
+    width = 2000 * scale
+    return ",".join(
+        str(min(width, int(rng.expovariate(3 / width)))) for _ in range(1000 * scale)
+    )
+
+
+@generator(2021, 8)
+def displays(scale: int, rng: random.Random) -> str:
+    digits = [
+        "abcefg",
+        "cf",
+        "acdeg",
+        "acdfg",
+        "bcdf",
+        "abdfg",
+        "abdefg",
+        "acf",
+        "abcdefg",
+        "abcdfg",
+    ]
+    lines = []
+    for _ in range(200 * scale):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+        encode = lambda d: "".join(rng.sample([wiring[c] for c in d], len(d)))
+        patterns = [encode(d) for d in rng.sample(digits, 10)]
+        output = [encode(rng.choice(digits)) for _ in range(4)]
+        lines.append(" ".join(patterns) + " | " + " ".join(output))
+    return "\n".join(lines)
+
+
+@generator(2021, 9)
+def heightmap(scale: int, rng: random.Random) -> str:
+    # basins grow from random low points and are walled off by 9s where they
+    # meet, then heights rise away from the low point so it is the only one
+    n = side(100, scale)
+    steps = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    centers = list({(rng.randrange(n), rng.randrange(n)) for _ in range(250 * scale)})
+    basin = [[-1] * n for _ in range(n)]
+    queue = deque(centers)
+    for b, (i, j) in enumerate(centers):
+        basin[i][j] = b
+    while queue:
+        i, j = queue.popleft()
+        for x, y in ((i + dx, j + dy) for dx, dy in steps):
+            if 0 <= x < n and 0 <= y < n and basin[x][y] == -1:
+                basin[x][y] = basin[i][j]
+                queue.append((x, y))
+    walls = [
+        (i, j)
+        for i in range(n)
+        for j in range(n)
+        if any(
+            0 <= x < n and 0 <= y < n and basin[x][y] != basin[i][j]
+            for x, y in ((i + 1, j), (i, j + 1))
+        )
+    ]
+    for i, j in walls:
+        basin[i][j] = -1
+    height = [[9] * n for _ in range(n)]
+    queue = deque((i, j) for i, j in centers if basin[i][j] != -1)
+    for i, j in queue:
+        height[i][j] = 0
+    while queue:
+        i, j = queue.popleft()
+        for x, y in ((i + dx, j + dy) for dx, dy in steps):
+            if (
+                0 <= x < n
+                and 0 <= y < n
+                and basin[x][y] == basin[i][j]
+                and height[x][y] == 9
+            ):
+                height[x][y] = min(8, height[i][j] + rng.randint(1, 2))
+                queue.append((x, y))
+    return "\n".join("".join(map(str, row)) for row in height)
+
+
+@generator(2021, 10)
+def navigation(scale: int, rng: random.Random) -> str:
+    pairs = {"(": ")", "[": "]", "{": "}", "<": ">"}
+    lines = []
+    for i in range(100 * scale):
+        stack, line = [], []
+        for _ in range(rng.randint(80, 110)):
+            if stack and rng.random() < 0.45:
+                line.append(pairs[stack.pop()])
+            else:
+                stack.append(rng.choice(list(pairs)))
+                line.append(stack[-1])
+        if i % 2 and stack:
+            wrong = [c for c in pairs.values() if c != pairs[stack[-1]]]
+            line.append(rng.choice(wrong))
+        elif not stack:
+            line.append(rng.choice(list(pairs)))
+        lines.append("".join(line))
+    return "\n".join(lines)
+
+
+# there is no guarantee that a large random grid ever flashes all at once
+@generator(2021, 11, parts=("part_1",))
+def octopuses(scale: int, rng: random.Random) -> str:
+    return digit_grid(side(10, scale), side(10, scale), rng)
+
+
+@generator(2021, 13)
+def origami(scale: int, rng: random.Random) -> str:
+    # every fold must split the paper in two halves of the same size
+    xs, ys, width, height = [], [], 40, 6
+    for _ in range(5):
+        xs.append(width)
+        width = 2 * width + 1
+    for _ in range(7):
+        ys.append(height)
+        height = 2 * height + 1
+    folds = [f"fold along x={x}" for x in reversed(xs)]
+    folds = [
+        f
+        for i, y in enumerate(reversed(ys))
+        for f in folds[i : i + 1] + [f"fold along y={y}"]
+    ]
+    points = {(width - 1, height - 1)}
+    while len(points) < min(800 * scale, width * height // 2):
+        points.add((rng.randrange(width), rng.randrange(height)))
+    return "\n".join(f"{x},{y}" for x, y in points) + "\n\n" + "\n".join(folds)
+
+
+@generator(2021, 14)
+def polymer(scale: int, rng: random.Random) -> str:
+    letters = "BCFHKNOPSV"
+    template = "".join(rng.choices(letters, k=20 * scale))
+    rules = [f"{a}{b} -> {rng.choice(letters)}" for a in letters for b in letters]
+    return template + "\n\n" + "\n".join(rules)
+
+
+@generator(2021, 15)
+def chitons(scale: int, rng: random.Random) -> str:
+    return digit_grid(side(100, scale), side(100, scale), rng, "123456789")
+
+
+@generator(2021, 16)
+def transmission(scale: int, rng: random.Random) -> str:
+    def literal(value: int) -> str:
+        groups = f"{value:b}"
+        groups = groups.zfill(-(-len(groups) // 4) * 4)
+        chunks = [groups[i : i + 4] for i in range(0, len(groups), 4)]
+        return "".join(
+            ("1" if i < len(chunks) - 1 else "0") + c for i, c in enumerate(chunks)
+        )
+
+    def packet(budget: int, depth: int) -> str:
+        version = f"{rng.randrange(8):03b}"
+        if budget <= 1 or depth > 40:
+            return version + "100" + literal(rng.randrange(1, 2**12))
+        type_id = rng.choice([0, 1, 2, 3, 5, 6, 7])
+        n = 2 if type_id >= 5 else rng.randint(1, min(budget - 1, 6))
+        children = [packet((budget - 1) // n, depth + 1) for _ in range(n)]
+        body = "".join(children)
+        if len(body) < 2**15 and rng.random() < 0.5:
+            return version + f"{type_id:03b}" + "0" + f"{len(body):015b}" + body
+        return version + f"{type_id:03b}" + "1" + f"{n:011b}" + body
+
+    bits = packet(300 * scale, 0)
+    bits += "0" * (-len(bits) % 4)
+    return "".join(f"{int(bits[i : i + 4], 2):X}" for i in range(0, len(bits), 4))
+
+
+@generator(2021, 17)
+def trench(scale: int, rng: random.Random) -> str:
+    x1 = rng.randint(150, 200) * scale
+    y1 = -rng.randint(100, 150) * scale
+    return f"target area: x={x1}..{x1 + 50 * scale}, y={y1}..{y1 + 50 * scale}"
+
+
+@generator(2021, 18)
+def snailfish(scale: int, rng: random.Random) -> str:
+    def number(depth: int) -> str:
+        if depth == 4 or (depth > 1 and rng.random() < 0.3):
+            return str(rng.randrange(10))
+        return f"[{number(depth + 1)},{number(depth + 1)}]"
+
+    return "\n".join(f"[{number(1)},{number(1)}]" for _ in range(100 * scale))
+
+
+@generator(2021, 19)
+def scanners(scale: int, rng: random.Random) -> str:
+    # each scanner is placed about 1200 away from an earlier one, not too close
+    # to any other, and shares 12 planted beacons with it, so the overlap graph
+    # is connected; the rest of the beacons are noise
+    orientations = []
+    for perm in itertools.permutations(range(3)):
+        inversions = sum(a > b for a, b in itertools.combinations(perm, 2))
+        for signs in itertools.product((1, -1), repeat=3):
+            if math.prod(signs) == (-1) ** inversions:
+                orientations.append((perm, signs))
+    positions = [(0, 0, 0)]
+    cells = {(0, 0, 0)}
+    beacons = set()
+    while len(positions) < 36 * scale:
+        parent = rng.choice(positions[-5:])
+        axis = rng.randrange(3)
+        position = tuple(
+            p + (rng.choice((-1, 1)) * 1200 if a == axis else rng.randint(-300, 300))
+            for a, p in enumerate(parent)
+        )
+        cell = tuple(p // 1000 for p in position)
+        if cell in cells:
+            continue
+        cells.add(cell)
+        shared = [
+            (max(p, q) - 1000, min(p, q) + 1000) for p, q in zip(parent, position)
+        ]
+        beacons.update(
+            tuple(rng.randint(lo, hi) for lo, hi in shared) for _ in range(12)
+        )
+        positions.append(position)
+    for position in positions:
+        beacons.update(
+            tuple(p + rng.randint(-1000, 1000) for p in position) for _ in range(4)
+        )
+    by_cell = defaultdict(list)
+    for beacon in sorted(beacons):
+        by_cell[tuple(b // 1000 for b in beacon)].append(beacon)
+    blocks = []
+    for i, position in enumerate(positions):
+        perm, signs = rng.choice(orientations)
+        x, y, z = (p // 1000 for p in position)
+        seen = [
+            [b - p for b, p in zip(beacon, position)]
+            for cell in itertools.product(*(range(c - 1, c + 2) for c in (x, y, z)))
+            for beacon in by_cell.get(cell, ())
+            if all(abs(b - p) <= 1000 for b, p in zip(beacon, position))
+        ]
+        rng.shuffle(seen)
+        lines = [f"--- scanner {i} ---"] + [
+            ",".join(str(s * v[a]) for a, s in zip(perm, signs)) for v in seen
+        ]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+@generator(2021, 20)
+def trench_map(scale: int, rng: random.Random) -> str:
+    algorithm = "".join(rng.choices(".#", k=512))
+    n = side(100, scale)
+    return algorithm + "\n\n" + digit_grid(n, n, rng, ".#")
+
+
+@generator(2021, 22)
+def reactor(scale: int, rng: random.Random) -> str:
+    def step(action: str, low: int, high: int, size: int) -> str:
+        ranges = []
+        for axis in "xyz":
+            a = rng.randint(low, high - size)
+            ranges.append(f"{axis}={a}..{a + rng.randint(size // 4, size)}")
+        return f"{action} " + ",".join(ranges)
+
+    steps = [
+        step("on" if i < 2 or rng.random() < 0.7 else "off", -50, 50, 50)
+        for i in range(20 * scale)
+    ]
+    steps += [
+        step(rng.choice(["on", "off"]), -100_000, 100_000, 40_000)
+        for _ in range(400 * scale)
+    ]
+    return "\n".join(steps)
+
+
+# 2022
+
+
+@generator(2022, 1)
+def calories(scale: int, rng: random.Random) -> str:
+    return "\n\n".join(
+        "\n".join(str(rng.randint(1000, 70000)) for _ in range(rng.randint(1, 15)))
+        for _ in range(250 * scale)
+    )
+
+
+@generator(2022, 8)
+def forest(scale: int, rng: random.Random) -> str:
+    return digit_grid(side(99, scale), side(99, scale), rng)
+
+
+@generator(2022, 12)
+def hill(scale: int, rng: random.Random) -> str:
+    # the middle row climbs one letter at a time, so E is always reachable
+    n, m = side(41, scale), side(160, scale)
+    rows = []
+    for _ in range(n):
+        row, h = [], 0
+        for j in range(m):
+            h = min(25, max(0, h + rng.choice([-1, 0, 1, 1])))
+            row.append(string.ascii_lowercase[h])
+        rows.append(row)
+    rows[n // 2] = [string.ascii_lowercase[min(25, j * 26 // m)] for j in range(m)]
+    rows[n // 2][0] = "S"
+    rows[n // 2][-1] = "E"
+    return "\n".join("".join(row) for row in rows)
+
+
+@generator(2022, 15)
+def sensors(scale: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(25 * scale):
+        x, y = rng.randrange(4_000_000), rng.randrange(4_000_000)
+        bx = x + rng.randint(-500_000, 500_000)
+        by = y + rng.randint(-500_000, 500_000)
+        lines.append(f"Sensor at x={x}, y={y}: closest beacon is at x={bx}, y={by}")
+    return "\n".join(lines)
+
+
+# 2023
+
+
+@generator(2023, 1)
+def calibration(scale: int, rng: random.Random) -> str:
+    words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+    lines = []
+    for _ in range(1000 * scale):
+        tokens = [rng.choice(words + list(string.ascii_lowercase)) for _ in range(6)]
+        tokens.insert(rng.randrange(len(tokens) + 1), str(rng.randint(1, 9)))
+        lines.append("".join(tokens))
+    return "\n".join(lines)
+
+
+@generator(2023, 3)
+def schematic(scale: int, rng: random.Random) -> str:
+    n = side(140, scale)
+    grid = [["."] * n for _ in range(n)]
+    for row in grid:
+        j = rng.randrange(4)
+        while j < n - 4:
+            if rng.random() < 0.5:
+                for k, c in enumerate(str(rng.randint(1, 999))):
+                    row[j + k] = c
+                j += 5
+            else:
+                row[j] = rng.choice("*#+$/=%@&-")
+                j += 2
+            j += rng.randrange(4)
+    return "\n".join("".join(row) for row in grid)
+
+
+@generator(2023, 4)
+def scratchcards(scale: int, rng: random.Random) -> str:
+    n = 200 * scale
+    lines = []
+    for i in range(n):
+        winning = rng.sample(range(1, 100), 10)
+        matches = rng.randint(0, min(10, n - i - 1))
+        numbers = winning[:matches] + rng.sample(
+            [x for x in range(1, 100) if x not in winning], 25 - matches
+        )
+        rng.shuffle(numbers)
+        lines.append(
+            f"Card {i + 1:>{len(str(n))}}: "
+            + " ".join(f"{x:>2}" for x in winning)
+            + " | "
+            + " ".join(f"{x:>2}" for x in numbers)
+        )
+    return "\n".join(lines)
+
+
+@generator(2023, 7)
+def camel_cards(scale: int, rng: random.Random) -> str:
+    return "\n".join(
+        "".join(rng.choices("23456789TJQKA", k=5)) + f" {rng.randint(1, 1000)}"
+        for _ in range(1000 * scale)
+    )
+
+
+@generator(2023, 9)
+def oasis(scale: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(200 * scale):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(2, 6))]
+        lines.append(
+            " ".join(
+                str(sum(c * x**k for k, c in enumerate(coefficients)))
+                for x in range(21)
+            )
+        )
+    return "\n".join(lines)
+
+
+@generator(2023, 11)
+def galaxies(scale: int, rng: random.Random) -> str:
+    n = side(140, scale)
+    rows = [["#" if rng.random() < 0.022 else "." for _ in range(n)] for _ in range(n)]
+    return "\n".join("".join(row) for row in rows)
+
+
+@generator(2023, 12)
+def springs(scale: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(1000 * scale):
+        pattern = "#" + "".join(rng.choices(".#", k=rng.randint(5, 19)))
+        groups = [len(g) for g in pattern.split(".") if g]
+        masked = "".join("?" if rng.random() < 0.5 else c for c in pattern)
+        lines.append(f"{masked} {','.join(map(str, groups))}")
+    return "\n".join(lines)
+
+
+@generator(2023, 14)
+def dish(scale: int, rng: random.Random) -> str:
+    n = side(100, scale)
+    return "\n".join(
+        "".join(rng.choices(".O#", weights=[6, 3, 1], k=n)) for _ in range(n)
+    )
+
+
+# 2024
+
+
+@generator(2024, 1)
+def location_ids(scale: int, rng: random.Random) -> str:
+    return "\n".join(
+        f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}"
+        for _ in range(1000 * scale)
+    )
+
+
+@generator(2024, 4)
+def word_search(scale: int, rng: random.Random) -> str:
+    n = side(140, scale)
+    return "\n".join("".join(rng.choices("XMAS", k=n)) for _ in range(n))
+
+
+@generator(2024, 5)
+def print_queue(scale: int, rng: random.Random) -> str:
+    pages = rng.sample(range(10, 100), 49)
+    rules = [
+        f"{pages[i]}|{pages[j]}"
+        for i in range(len(pages))
+        for j in range(i + 1, len(pages))
+    ]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(200 * scale):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates)
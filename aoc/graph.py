@@ -0,0 +1,121 @@
+"""Graphs in compressed sparse row form and the searches run on them.
+
+Nodes are the integers ``0..n-1``; grid cells map to ``row * width + col``.
+Distances come back as int64 arrays with -1 for unreachable nodes. The
+searches walk plain lists taken from the CSR arrays, which is much faster in
+Python than indexing NumPy arrays element by element.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Iterable, NamedTuple
+
+import numpy as np
+
+from aoc.grid import OFFSETS_4
+
+UNREACHED = -1
+
+
+def _int_array(values: Iterable[int]) -> np.ndarray:
+    if not isinstance(values, (np.ndarray, list, tuple)):
+        values = list(values)
+    return np.asarray(values, dtype=np.int64)
+
+
+class CSR(NamedTuple):
+    indptr: np.ndarray  # neighbours of u are indices[indptr[u]:indptr[u + 1]]
+    indices: np.ndarray
+    weights: np.ndarray | None = None
+
+    @property
+    def n(self) -> int:
+        return len(self.indptr) - 1
+
+    def neighbours(self, u: int) -> np.ndarray:
+        return self.indices[self.indptr[u] : self.indptr[u + 1]]
+
+    @classmethod
+    def from_edges(
+        cls,
+        n: int,
+        sources: Iterable[int],
+        targets: Iterable[int],
+        weights: Iterable[int] | None = None,
+        undirected: bool = False,
+    ) -> CSR:
+        sources, targets = _int_array(sources), _int_array(targets)
+        if weights is not None:
+            weights = _int_array(weights)
+        if undirected:
+            sources, targets = (
+                np.concatenate([sources, targets]),
+                np.concatenate([targets, sources]),
+            )
+            if weights is not None:
+                weights = np.concatenate([weights, weights])
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+        return cls(
+            indptr,
+            targets[order],
+            None if weights is None else weights[order],
+        )
+
+    @classmethod
+    def from_grid(
+        cls,
+        shape: tuple[int, int],
+        offsets: Iterable[tuple[int, int]] = OFFSETS_4,
+        mask: np.ndarray | None = None,
+        allowed: Callable[[np.ndarray, np.ndarray], np.ndarray] | None = None,
+        costs: np.ndarray | None = None,
+    ) -> CSR:
+        """
+        Edges between cells ``offsets`` apart. ``mask`` drops cells,
+        ``allowed(u, v)`` filters edges given flat source and target indices,
+        and ``costs[v]`` makes entering cell v cost that much.
+        """
+        h, w = shape
+        rows, cols = np.divmod(np.arange(h * w), w)
+        sources, targets = [], []
+        for dy, dx in offsets:
+            r, c = rows + dy, cols + dx
+            inside = (0 <= r) & (r < h) & (0 <= c) & (c < w)
+            u, v = np.flatnonzero(inside), (r * w + c)[inside]
+            if mask is not None:
+                keep = mask.flat[u] & mask.flat[v]
+                u, v = u[keep], v[keep]
+            if allowed is not None:
+                keep = allowed(u, v)
+                u, v = u[keep], v[keep]
+            sources.append(u)
+            targets.append(v)
+        sources, targets = np.concatenate(sources), np.concatenate(targets)
+        weights = None if costs is None else np.asarray(costs).flat[targets]
+        return cls.from_edges(h * w, sources, targets, weights)
+
+
+def multi_source_bfs(graph: CSR, sources: Iterable[int]) -> np.ndarray:
+    """Hops from the nearest of ``sources`` to every node."""
+    indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+    dist = [UNREACHED] * graph.n
+    queue = deque()
+    for s in sources:
+        if dist[s] == UNREACHED:
+            dist[s] = 0
+            queue.append(s)
+    while queue:
+        u = queue.popleft()
+        d = dist[u] + 1
+        for v in indices[indptr[u] : indptr[u + 1]]:
+            if dist[v] == UNREACHED:
+                dist[v] = d
+                queue.append(v)
+    return np.array(dist, dtype=np.int64)
+
+
+def bfs(graph: CSR, source: int) -> np.ndarray:
+    return multi_source_bfs(graph, [source])
@@ -0,0 +1,187 @@
+"""2D grids stored as contiguous NumPy arrays, indexed ``[row, col]``.
+
+Neighbourhood operations work on whole arrays: ``shifted`` moves the grid by an
+offset filling the uncovered border, and ``windows`` gives a zero-copy
+``(h, w, k, k)`` view of the stencil around every cell.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+OFFSETS_4 = ((-1, 0), (1, 0), (0, -1), (0, 1))
+OFFSETS_8 = OFFSETS_4 + ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def shift(array: np.ndarray, dy: int, dx: int, fill=0) -> np.ndarray:
+    """``out[i, j] = array[i + dy, j + dx]``, or ``fill`` outside the array."""
+    h, w = array.shape
+    out = np.full_like(array, fill)
+    if abs(dy) >= h or abs(dx) >= w:
+        return out
+    out[max(0, -dy) : h - max(0, dy), max(0, -dx) : w - max(0, dx)] = array[
+        max(0, dy) : h - max(0, -dy), max(0, dx) : w - max(0, -dx)
+    ]
+    return out
+
+
+def label(
+    mask: np.ndarray, offsets: Iterable[tuple[int, int]] = OFFSETS_4
+) -> np.ndarray:
+    """
+    Label the connected components of ``mask``. Every cell gets the flat index
+    of one cell of its component, cells outside the mask get -1.
+    """
+    offsets = list(offsets)
+    outside = mask.size
+    labels = np.where(mask, np.arange(mask.size).reshape(mask.shape), outside)
+    while True:
+        new = labels
+        for dy, dx in offsets:
+            new = np.minimum(new, shift(labels, dy, dx, outside))
+        new = np.where(mask, new, outside)
+        # follow labels to their own label, halving the remaining passes
+        inside = new[mask]
+        new[mask] = np.minimum(inside, new.flat[inside])
+        if np.array_equal(new, labels):
+            return np.where(mask, labels, -1)
+        labels = new
+
+
+def _code(value):
+    return ord(value) if isinstance(value, str) else value
+
+
+class Grid:
+    def __init__(self, array: np.ndarray):
+        self.array = np.ascontiguousarray(array)
+
+    @classmethod
+    def from_str(
+        cls,
+        data: str,
+        table: Mapping[str, int] | None = None,
+        dtype=np.uint8,
+    ) -> Grid:
+        """
+        Parse a rectangular block of text. Without ``table`` cells hold the
+        character codes, otherwise ``table[char]`` (0 for missing characters).
+        """
+        lines = data.strip("\n").splitlines()
+        width = len(lines[0])
+        if any(len(line) != width for line in lines):
+            raise ValueError("Grid rows must all have the same length")
+        array = np.frombuffer("".join(lines).encode(), dtype=np.uint8)
+        array = array.reshape(len(lines), width)
+        if table is None:
+            return cls(array.astype(dtype))
+        lookup = np.zeros(256, dtype=dtype)
+        for char, value in table.items():
+            lookup[ord(char)] = value
+        return cls(lookup[array])
+
+    @classmethod
+    def from_digits(cls, data: str, dtype=np.int64) -> Grid:
+        return cls((cls.from_str(data).array - ord("0")).astype(dtype))
+
+    @classmethod
+    def from_coords(
+        cls,
+        rows: Iterable[int],
+        cols: Iterable[int],
+        shape: tuple[int, int] | None = None,
+        dtype=bool,
+    ) -> Grid:
+        """Mark the given cells, sizing the grid to fit them unless ``shape``."""
+        rows, cols = np.fromiter(rows, dtype=np.intp), np.fromiter(cols, dtype=np.intp)
+        if shape is None:
+            shape = (int(rows.max()) + 1, int(cols.max()) + 1)
+        array = np.zeros(shape, dtype=dtype)
+        array[rows, cols] = 1
+        return cls(array)
+
+    @classmethod
+    def zeros(cls, shape: tuple[int, int], dtype=np.int64) -> Grid:
+        return cls(np.zeros(shape, dtype=dtype))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.array.shape
+
+    @property
+    def height(self) -> int:
+        return self.array.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.array.shape[1]
+
+    def __getitem__(self, key):
+        return self.array[key]
+
+    def __setitem__(self, key, value) -> None:
+        self.array[key] = value
+
+    def copy(self) -> Grid:
+        return Grid(self.array.copy())
+
+    def to_str(self, chars: str | None = None) -> str:
+        """Render cells as characters, ``chars[value]`` if given."""
+        array = self.array
+        if chars is not None:
+            array = np.frombuffer(chars.encode(), dtype=np.uint8)[array.astype(np.intp)]
+        lines = np.empty((self.height, self.width + 1), dtype=np.uint8)
+        lines[:, :-1] = array
+        lines[:, -1] = ord("\n")
+        return lines.tobytes()[:-1].decode()
+
+    def __str__(self) -> str:
+        return self.to_str()
+
+    def pad(self, width: int = 1, fill=0) -> Grid:
+        return Grid(np.pad(self.array, width, constant_values=fill))
+
+    def shifted(self, dy: int, dx: int, fill=0) -> np.ndarray:
+        return shift(self.array, dy, dx, fill)
+
+    def neighbours(
+        self, offsets: Iterable[tuple[int, int]] = OFFSETS_4, fill=0
+    ) -> np.ndarray:
+        """Stack of the neighbour values of every cell, shape ``(k, h, w)``."""
+        return np.stack([self.shifted(dy, dx, fill) for dy, dx in offsets])
+
+    def neighbour_sum(self, offsets: Iterable[tuple[int, int]] = OFFSETS_8):
+        """Sum of the neighbour values of every cell, cells outside count as 0."""
+        h, w = self.shape
+        offsets = list(offsets)
+        r = max((max(abs(dy), abs(dx)) for dy, dx in offsets), default=0)
+        padded = np.pad(self.array.astype(np.int64, copy=False), r)
+        total = np.zeros(self.shape, dtype=np.int64)
+        for dy, dx in offsets:
+            total += padded[r + dy : r + dy + h, r + dx : r + dx + w]
+        return total
+
+    def windows(self, radius: int = 1, fill=0) -> np.ndarray:
+        """Read-only view of the ``(2r + 1)²`` square around every cell."""
+        size = 2 * radius + 1
+        return sliding_window_view(self.pad(radius, fill).array, (size, size))
+
+    def rotate(self, k: int = 1) -> Grid:
+        """Rotate by ``k`` quarter turns counter-clockwise."""
+        return Grid(np.rot90(self.array, k))
+
+    def flip(self, axis: int) -> Grid:
+        return Grid(np.flip(self.array, axis))
+
+    def transpose(self) -> Grid:
+        return Grid(self.array.T)
+
+    def find(self, value) -> np.ndarray:
+        """``(row, col)`` of every cell equal to ``value``, a number or a char."""
+        return np.argwhere(self.array == _code(value))
+
+    def count(self, value) -> int:
+        return int(np.count_nonzero(self.array == _code(value)))
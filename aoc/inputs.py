@@ -0,0 +1,127 @@
+"""Zero-copy access to puzzle inputs and streaming parsers over them.
+
+``open_mmap`` maps an input file read-only; the parsers below accept either
+that map (or any bytes-like object) or a ``str``, so solvers work the same on
+the runner's mapped files and on the examples embedded in their source. They
+walk the input in bounded chunks, so memory stays flat however big it is.
+
+Solvers whose parts are written against these parsers set ``MMAP_INPUT =
+True`` and the runner hands them the map instead of a decoded string.
+"""
+
+from __future__ import annotations
+
+import mmap
+from array import array
+from pathlib import Path
+from typing import Iterator, Union
+
+from aoc.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+Text = Union[str, bytes, bytearray, mmap.mmap]
+
+CHUNK_SIZE = 1 << 20
+# longest run of digits and sign an int64 can take
+MAX_INT_WIDTH = 20
+
+
+def open_mmap(path: Path | str) -> mmap.mmap | bytes:
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can not be mapped
+            return b""
+
+
+def as_buffer(text: Text) -> bytes | bytearray | mmap.mmap:
+    return text.encode() if isinstance(text, str) else text
+
+
+def decode(text: Text) -> str:
+    return text if isinstance(text, str) else bytes(text).decode()
+
+
+def iter_lines(text: Text) -> Iterator[str]:
+    """Lines without their line break, decoded one at a time."""
+    start, n = 0, len(text)
+    newline = "\n" if isinstance(text, str) else b"\n"
+    while start < n:
+        end = text.find(newline, start)
+        if end == -1:
+            end = n
+        line = text[start:end]
+        yield line if isinstance(line, str) else line.decode()
+        start = end + 1
+
+
+def iter_records(text: Text) -> Iterator[str]:
+    """Blocks of lines separated by blank lines."""
+    record = []
+    for line in iter_lines(text):
+        if not line:
+            if record:
+                yield "\n".join(record)
+            record = []
+        else:
+            record.append(line)
+    if record:
+        yield "\n".join(record)
+
+
+def _chunk_ints(chunk: np.ndarray, signed: bool) -> np.ndarray:
+    digit = (chunk >= ord("0")) & (chunk <= ord("9"))
+    edges = np.diff(digit.astype(np.int8), prepend=0, append=0)
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    if not len(starts):
+        return np.empty(0, dtype=np.int64)
+    positions = np.flatnonzero(digit)
+    lengths = ends - starts
+    # each digit weighs 10 ** (digits after it in its number)
+    power = np.repeat(ends, lengths) - positions - 1
+    weighted = (chunk[positions] - ord("0")).astype(np.int64) * 10**power
+    values = np.add.reduceat(weighted, np.cumsum(lengths) - lengths)
+    if signed:
+        negative = np.zeros(len(starts), dtype=bool)
+        before = starts > 0
+        negative[before] = chunk[starts[before] - 1] == ord("-")
+        values[negative] *= -1
+    return values
+
+
+def iter_int_chunks(
+    text: Text, signed: bool = True, chunk_size: int = CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Every integer in the input, in order, as int64 arrays parsed from about
+    ``chunk_size`` bytes at a time. A ``-`` right before a number negates it
+    unless ``signed`` is false.
+    """
+    buffer = np.frombuffer(as_buffer(text), dtype=np.uint8)
+    start, n = 0, len(buffer)
+    while start < n:
+        end = min(start + max(chunk_size, 2 * MAX_INT_WIDTH), n)
+        if end < n:
+            # cut at the last byte that is not a digit so no number is split:
+            # before it if it is a minus, which may be the next number's sign
+            tail = buffer[end - MAX_INT_WIDTH : end]
+            other = np.flatnonzero((tail < ord("0")) | (tail > ord("9")))
+            if len(other):
+                cut = other[-1] + (tail[other[-1]] != ord("-"))
+                end -= MAX_INT_WIDTH - cut
+        yield _chunk_ints(buffer[start:end], signed)
+        start = end
+
+
+def parse_ints(text: Text, signed: bool = True) -> np.ndarray:
+    chunks = list(iter_int_chunks(text, signed))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+
+def int_array(text: Text, signed: bool = True) -> array:
+    """Every integer in the input packed into an ``array('q')``."""
+    values = array("q")
+    for chunk in iter_int_chunks(text, signed):
+        values.frombytes(chunk.tobytes())
+    return values
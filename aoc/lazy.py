@@ -0,0 +1,70 @@
+"""Deferred imports, so that importing a solver only costs its definitions.
+
+``lazy_import`` returns a module whose code runs on first attribute access,
+and ``njit`` postpones importing numba (and compiling) until the decorated
+function is first called. Compiled code is cached next to the solver, so warm
+starts skip the JIT altogether.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Callable
+
+
+def lazy_import(name: str) -> ModuleType:
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def njit(fn: Callable | None = None, **options) -> Callable:
+    """
+    ``numba.njit(cache=True, **options)`` applied on the first call. Compiled
+    functions can not call each other through these wrappers; a jitted helper
+    used by another one must be reached through ``helper.compiled()``.
+    """
+    options.setdefault("cache", True)
+
+    def decorate(fn: Callable) -> Callable:
+        jitted: list[Callable] = []
+
+        def compiled() -> Callable:
+            if not jitted:
+                import numba
+
+                jitted.append(numba.njit(**options)(fn))
+            return jitted[0]
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            try:
+                return compiled()(*args)
+            except ModuleNotFoundError as error:
+                module = sys.modules.get(fn.__module__)
+                if not options["cache"] or module is None or error.name in sys.modules:
+                    raise
+                # the cache was written with this file loaded under another
+                # module name (by the runner rather than run directly, say),
+                # which numba imports to load it: let that name find this one
+                sys.modules[error.name] = module
+                try:
+                    return compiled()(*args)
+                finally:
+                    del sys.modules[error.name]
+
+        wrapper.compiled = compiled
+        return wrapper
+
+    return decorate if fn is None else decorate(fn)
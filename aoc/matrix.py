@@ -0,0 +1,105 @@
+"""Linear recurrences on counts, advanced by matrix powers.
+
+Days whose state is a vector of counts that each step maps linearly (how many
+fish have each timer, how many times each pair occurs) advance ``n`` steps with
+the ``n``-th power of the step matrix, built by repeated squaring in
+``O(k³ log n)``. Counts stay exact: they are int64 while the step matrix
+provably keeps them below 2**63 and Python ints after that, or they are
+reduced modulo ``modulus`` when one is given, which is the only way to take
+10**12 steps of a growing population. Exact Python-int counts are stepped by
+the largest power of the matrix that is still int64, never by a matrix of
+Python ints.
+
+Matrices act on column vectors, ``new = matrix @ state``; batches of states
+are the rows of a ``(b, k)`` array.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _dtype(matrix: np.ndarray, total: int, n: int, modulus: int | None) -> type:
+    # every entry of matrix^n @ state is at most |state|_1 times the largest
+    # column sum of the matrix to the n, and so is every partial sum on the way
+    if modulus is not None:
+        return np.int64 if (modulus - 1) ** 2 * len(matrix) < 2**63 else object
+    growth = int(np.abs(matrix).sum(axis=0).max(initial=0))
+    if growth <= 1:
+        return np.int64 if total < 2**63 else object
+    # compare exponents rather than build growth**n for huge n
+    bound = total.bit_length() + n * (growth - 1).bit_length()
+    return np.int64 if bound < 63 else object
+
+
+def _mul(a: np.ndarray, b: np.ndarray, modulus: int | None) -> np.ndarray:
+    product = a @ b
+    return product if modulus is None else product % modulus
+
+
+def power(matrix: np.ndarray, n: int, modulus: int | None = None) -> np.ndarray:
+    """``matrix`` to the ``n``, by squaring. Entries must not be negative."""
+    matrix = np.asarray(matrix)
+    dtype = _dtype(matrix, 1, n, modulus)
+    result = np.identity(len(matrix), dtype=np.int64).astype(dtype)
+    square = matrix.astype(dtype)
+    if modulus is not None:
+        square %= modulus
+    while n:
+        if n & 1:
+            result = _mul(result, square, modulus)
+        n >>= 1
+        if n:
+            square = _mul(square, square, modulus)
+    return result
+
+
+def advance(
+    matrix: np.ndarray, states: np.ndarray, n: int, modulus: int | None = None
+) -> np.ndarray:
+    """
+    ``states`` (one vector, or a batch as rows) after ``n`` steps. Few steps
+    are cheaper one at a time, ``k²`` each against ``k³`` per squaring, so the
+    power is only built when ``n`` is more than ``k log n``.
+    """
+    matrix, states = np.asarray(matrix), np.asarray(states)
+    total = int(np.abs(np.atleast_2d(states)).sum(axis=1).max(initial=0))
+    dtype = _dtype(matrix, total, n, modulus)
+    states = states.astype(dtype)
+    if modulus is not None:
+        states %= modulus
+    if dtype is object and modulus is None:
+        block = _int64_block(matrix, n)
+        if block:
+            return _advance_blocks(matrix, states, n, block)
+    if n < len(matrix) * n.bit_length():
+        step = matrix.T.astype(dtype)
+        for _ in range(n):
+            states = _mul(states, step, modulus)
+        return states
+    return _mul(states, power(matrix, n, modulus).T, modulus)
+
+
+def _int64_block(matrix: np.ndarray, n: int) -> int:
+    # the most steps, up to n, whose power ``_dtype`` still keeps in int64
+    growth = int(np.abs(matrix).sum(axis=0).max(initial=0))
+    if growth <= 1:
+        return n
+    return min(n, 61 // (growth - 1).bit_length())
+
+
+def _advance_blocks(
+    matrix: np.ndarray, states: np.ndarray, n: int, block: int
+) -> np.ndarray:
+    # Exact counts past int64 are Python ints, and squaring a matrix of them
+    # costs k³ big products a time. The matrix power itself is small for a
+    # while, so only the vector is big: ``block`` steps at a time by an int64
+    # power, k² big-by-small products per block.
+    blocks, rest = divmod(n, block)
+    if blocks:
+        step = power(matrix, block).T.astype(object)
+        for _ in range(blocks):
+            states = states @ step
+    if rest:
+        states = states @ power(matrix, rest).T.astype(object)
+    return states
@@ -0,0 +1,118 @@
+"""Run (day, part) jobs on a process pool, longest expected job first."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from aoc import timings
+from aoc.runner import PARTS, Day, Result, get_parts, load_module, read_input, run_part
+
+if TYPE_CHECKING:
+    from aoc.cache import ResultCache
+
+
+def pool_workers(workers: int | None = None) -> int:
+    """
+    How many processes a solver may spread its own work on: ``workers`` or one
+    per CPU, but only one (no pool) inside a daemonic process such as the ones
+    ``aoc bench`` isolates parts in, which may not have children.
+    """
+    if multiprocessing.current_process().daemon:
+        return 1
+    return workers or os.cpu_count() or 1
+
+
+def solver_pool(workers: int | None = None) -> ProcessPoolExecutor:
+    """
+    A pool for a solver to spread its own work on. Solvers are loaded from
+    their path under a name the workers could not import, so the workers are
+    forked where the platform allows and inherit the module instead.
+    """
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    return ProcessPoolExecutor(workers, mp_context=context)
+
+
+def _run_job(
+    day: Day, part: str, params: dict[str, Any] | None, profile: str | None
+) -> Result:
+    try:
+        data = read_input(day)
+    except OSError:
+        return Result(day, part, error=traceback.format_exc(limit=-1).strip())
+    return run_part(day, part, data, params, profile)
+
+
+def plan(
+    days: Iterable[Day],
+    parts: Iterable[str] = PARTS,
+    params: dict[str, Any] | None = None,
+    cache: ResultCache | None = None,
+) -> tuple[list[tuple[Day, str, str | None]], list[Result]]:
+    """
+    Split the selection into runnable jobs (day, part, cache key), sorted
+    longest expected first, and results that need no job: cached answers and
+    days that can not run at all.
+    """
+    parts = list(parts)
+    jobs, skipped = [], []
+    for day in days:
+        if not day.input_path.exists():
+            skipped.append(Result(day, "-", error=f"missing input {day.input_path}"))
+            continue
+        try:
+            keys, hits = dict.fromkeys(parts), {}
+            if cache is not None:
+                data = read_input(day)
+                keys = {p: cache.key(day, p, data, params) for p in parts}
+                hits = {p: r for p, k in keys.items() if (r := cache.get(k))}
+            if hits and len(hits) == len(parts):
+                skipped.extend(hits.values())
+                continue
+            available = get_parts(load_module(day), parts)
+        except Exception:
+            skipped.append(
+                Result(day, "-", error=traceback.format_exc(limit=-1).strip())
+            )
+            continue
+        skipped.extend(hits[p] for p in available if p in hits)
+        jobs.extend((day, p, keys[p]) for p in available if p not in hits)
+    recorded = timings.load()
+    jobs.sort(key=lambda job: timings.expected(recorded, *job[:2]), reverse=True)
+    return jobs, skipped
+
+
+def run_parallel(
+    days: Iterable[Day],
+    parts: Iterable[str] = PARTS,
+    params: dict[str, Any] | None = None,
+    workers: int | None = None,
+    cache: ResultCache | None = None,
+    profile: str | None = None,
+) -> Iterator[Result]:
+    """
+    Yield results as soon as each job finishes. The pool takes jobs in
+    submission order, so submitting the longest first keeps the total wall time
+    close to the slowest single job.
+    """
+    jobs, skipped = plan(days, parts, params, cache)
+    yield from skipped
+    if not jobs:
+        return
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_job, day, part, params, profile): key
+            for day, part, key in jobs
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            # only the parent writes, so workers never race on the cache
+            if cache is not None and futures[future] is not None:
+                cache.put(futures[future], result)
+            yield result
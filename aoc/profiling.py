@@ -0,0 +1,159 @@
+"""Profile single parts with cProfile or a sampling profiler.
+
+Each profiled part writes ``YYYY-DD-part_N.json`` under ``.aoc/profiles``: the
+functions ranked by own time, with paths relative to the repository so that
+profiles of two commits can be diffed. The sampler also writes the stacks in
+collapsed form (``.folded``, one ``frame;frame;frame count`` line per stack)
+for flamegraph tools, and cProfile the raw ``.pstats`` for its own viewers.
+"""
+
+from __future__ import annotations
+
+import json
+import signal
+import sys
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Callable
+
+from aoc.runner import ROOT, Day
+from aoc.timings import STATE_DIR
+
+PROFILE_DIR = STATE_DIR / "profiles"
+MODES = ("cprofile", "sample")
+SAMPLE_INTERVAL = 0.001  # seconds of CPU time
+TOP_FUNCTIONS = 50
+
+
+def _location(filename: str, line: int, name: str) -> str:
+    path = Path(filename)
+    if path.is_absolute() and path.is_relative_to(ROOT):
+        filename = str(path.relative_to(ROOT))
+    elif path.is_absolute():
+        # site-packages and the standard library: keep the last parts only
+        filename = "/".join(path.parts[-2:])
+    return f"{name} ({filename}:{line})"
+
+
+def _code_location(code: CodeType) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return _location(code.co_filename, code.co_firstlineno, name)
+
+
+class CProfiler:
+    mode = "cprofile"
+
+    def __init__(self):
+        import cProfile
+
+        self.profile = cProfile.Profile()
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        return self.profile.runcall(fn, *args, **kwargs)
+
+    def report(self) -> dict[str, Any]:
+        import pstats
+
+        stats = pstats.Stats(self.profile).stats
+        functions = [
+            {
+                "function": _location(*func),
+                "calls": calls,
+                "primitive_calls": primitive,
+                "tottime": tottime,
+                "cumtime": cumtime,
+            }
+            for func, (primitive, calls, tottime, cumtime, _) in stats.items()
+        ]
+        functions.sort(key=lambda f: f["tottime"], reverse=True)
+        return {"mode": self.mode, "functions": functions[:TOP_FUNCTIONS]}
+
+    def write(self, stem: Path) -> list[Path]:
+        self.profile.dump_stats(stem.with_suffix(".pstats"))
+        return [stem.with_suffix(".pstats")]
+
+
+class Sampler:
+    """
+    Statistical profiler on ``ITIMER_PROF``: every ``interval`` seconds of CPU
+    time the signal handler records the Python stack of the profiled call.
+    Time spent in C code is charged to the Python frame that called it.
+    """
+
+    mode = "sample"
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._base: FrameType | None = None
+
+    def _sample(self, signum: int, frame: FrameType | None) -> None:
+        stack = []
+        while frame is not None and frame is not self._base:
+            stack.append(_code_location(frame.f_code))
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        self._base = sys._getframe()
+        previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+    def report(self) -> dict[str, Any]:
+        own, total = Counter(), Counter()
+        for stack, n in self.stacks.items():
+            own[stack[-1]] += n
+            for frame in set(stack):
+                total[frame] += n
+        functions = [
+            {"function": frame, "own_samples": own[frame], "samples": total[frame]}
+            for frame in total
+        ]
+        functions.sort(key=lambda f: (f["own_samples"], f["samples"]), reverse=True)
+        return {
+            "mode": self.mode,
+            "interval": self.interval,
+            "samples": sum(self.stacks.values()),
+            "functions": functions[:TOP_FUNCTIONS],
+        }
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{';'.join(stack)} {n}\n" for stack, n in sorted(self.stacks.items())
+        )
+
+    def write(self, stem: Path) -> list[Path]:
+        path = stem.with_suffix(".folded")
+        path.write_text(self.collapsed())
+        return [path]
+
+
+def profiler(mode: str) -> CProfiler | Sampler:
+    if mode == "cprofile":
+        return CProfiler()
+    if mode == "sample":
+        return Sampler()
+    raise ValueError(f"Unknown profiler {mode!r}, expected one of {MODES}")
+
+
+def write_profile(
+    day: Day,
+    part: str,
+    profiler: CProfiler | Sampler,
+    extra: dict[str, Any],
+    path: Path = PROFILE_DIR,
+) -> list[Path]:
+    """Write the report of a profiled part, ``extra`` going into its JSON."""
+    path.mkdir(parents=True, exist_ok=True)
+    stem = path / f"{day.year}-{day.day:02d}-{part}"
+    report = {"year": day.year, "day": day.day, "part": part, **extra}
+    report.update(profiler.report())
+    stem.with_suffix(".json").write_text(json.dumps(report, indent=2))
+    return [stem.with_suffix(".json"), *profiler.write(stem)]
@@ -0,0 +1,278 @@
+"""Discover, load and time the ``YYYY/DD.py`` solvers.
+
+Solvers are loaded from their file path (their names are not valid module
+names) and only their ``part_1``/``part_2`` functions are called, so nothing
+under ``if __name__ == "__main__"`` runs. The input is read by the runner from
+``YYYY/data/DD.txt`` and passed to each part as a string, or as a read-only
+memory map to solvers that set ``MMAP_INPUT = True`` (see ``aoc.inputs``).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import re
+import resource
+import sys
+import time
+import traceback
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple
+
+from aoc import counters, inputs
+
+if TYPE_CHECKING:
+    from aoc.cache import ResultCache
+
+ROOT = Path(__file__).resolve().parent.parent
+PARTS = ("part_1", "part_2")
+
+SELECTOR_REGEXP = re.compile(r"^(\d{4})(?:/(\d{1,2}))?$")
+
+
+class Day(NamedTuple):
+    year: int
+    day: int
+
+    @classmethod
+    def from_path(cls, path: Path) -> "Day":
+        return cls(int(path.parent.name), int(path.stem))
+
+    @property
+    def path(self) -> Path:
+        return ROOT / str(self.year) / f"{self.day:02d}.py"
+
+    @property
+    def input_path(self) -> Path:
+        return ROOT / str(self.year) / "data" / f"{self.day:02d}.txt"
+
+    def __str__(self) -> str:
+        return f"{self.year}/{self.day:02d}"
+
+
+class Measurement(NamedTuple):
+    wall: float
+    cpu: float
+    peak_rss: int  # KiB
+
+
+class Result(NamedTuple):
+    day: Day
+    part: str
+    answer: Any = None
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_rss: int = 0
+    error: str | None = None
+    cached: bool = False  # answer and measurements come from an earlier run
+    counters: dict[str, int] | None = None  # see aoc.counters
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "year": self.day.year,
+            "day": self.day.day,
+            "part": self.part,
+            "answer": None if self.answer is None else str(self.answer),
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "peak_rss": self.peak_rss,
+            "error": self.error,
+            "cached": self.cached,
+            "counters": self.counters,
+        }
+
+
+def discover(root: Path = ROOT) -> list[Day]:
+    return sorted(
+        Day.from_path(path) for path in root.glob("[0-9][0-9][0-9][0-9]/[0-9][0-9].py")
+    )
+
+
+def select(days: Iterable[Day], selectors: Iterable[str]) -> list[Day]:
+    """
+    Filter days using selectors such as ``2021`` or ``2023/05``.
+    No selectors means every day.
+    """
+    selectors = list(selectors)
+    if not selectors:
+        return list(days)
+    wanted = []
+    for selector in selectors:
+        if (m := SELECTOR_REGEXP.match(selector)) is None:
+            raise ValueError(f"Invalid selector: {selector}")
+        wanted.append(
+            (int(m.group(1)), None if m.group(2) is None else int(m.group(2)))
+        )
+    return [
+        d
+        for d in days
+        if any(d.year == y and (n is None or d.day == n) for y, n in wanted)
+    ]
+
+
+def load_module(day: Day) -> ModuleType:
+    name = f"aoc_{day.year}_{day.day:02d}"
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, day.path)
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses resolve their module through sys.modules while executing it
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def get_parts(module: ModuleType, parts: Iterable[str] = PARTS) -> dict[str, Callable]:
+    return {p: fn for p in parts if callable(fn := getattr(module, p, None))}
+
+
+def read_input(day: Day) -> inputs.Text:
+    """The mapped input file, decoded only for solvers that need a string."""
+    return inputs.open_mmap(day.input_path)
+
+
+def input_for(module: ModuleType, data: inputs.Text) -> inputs.Text:
+    return data if getattr(module, "MMAP_INPUT", False) else inputs.decode(data)
+
+
+def _rss_kib(field: str) -> int | None:
+    try:
+        with open("/proc/self/status") as f:
+            status = f.read()
+    except OSError:
+        return None
+    m = re.search(rf"^{field}:\s+(\d+) kB", status, re.MULTILINE)
+    return int(m.group(1)) if m else None
+
+
+def reset_peak_rss() -> None:
+    # Linux only: resets VmHWM to the current RSS so each part gets its own peak
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def current_rss() -> int:
+    return _rss_kib("VmRSS") or 0
+
+
+def peak_rss() -> int:
+    if (x := _rss_kib("VmHWM")) is not None:
+        return x
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def measure(fn: Callable, *args, **kwargs) -> tuple[Any, Measurement]:
+    reset_peak_rss()
+    wall, cpu = time.perf_counter(), time.process_time()
+    answer = fn(*args, **kwargs)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return answer, Measurement(wall, cpu, peak_rss())
+
+
+def accepted_params(fn: Callable, params: dict[str, Any]) -> dict[str, Any]:
+    if not params:
+        return {}
+    import inspect  # slow to import and only needed with --param
+
+    signature = inspect.signature(fn).parameters
+    return {k: v for k, v in params.items() if k in signature}
+
+
+def run_part(
+    day: Day,
+    part: str,
+    data: inputs.Text,
+    params: dict[str, Any] | None = None,
+    profile: str | None = None,
+) -> Result:
+    """
+    Run one part. With ``profile`` ("cprofile" or "sample") the call is
+    profiled and its report written by ``aoc.profiling``; with counters
+    enabled the result carries what they counted during the part.
+    """
+    try:
+        module = load_module(day)
+        fn = get_parts(module, [part])[part]
+        data = input_for(module, data)
+        kwargs = accepted_params(fn, params or {})
+        before = counters.snapshot()
+        if profile is None:
+            answer, m = measure(fn, data, **kwargs)
+        else:
+            from aoc import profiling
+
+            profiler = profiling.profiler(profile)
+            answer, m = measure(profiler.call, fn, data, **kwargs)
+        counted = None
+        if counters.enabled():
+            counted = counters.diff(before, counters.snapshot())
+        if profile is not None:
+            profiling.write_profile(
+                day, part, profiler, {"wall": m.wall, "counters": counted}
+            )
+    except Exception:
+        return Result(day, part, error=traceback.format_exc(limit=-1).strip())
+    return Result(day, part, answer, m.wall, m.cpu, m.peak_rss, counters=counted)
+
+
+def run(
+    days: Iterable[Day],
+    parts: Iterable[str] = PARTS,
+    params: dict[str, Any] | None = None,
+    cache: ResultCache | None = None,
+    profile: str | None = None,
+) -> Iterator[Result]:
+    """
+    Run the parts of each day in turn. With a cache, a day whose parts are all
+    cached is answered without importing its solver.
+    """
+    parts = list(parts)
+    for day in days:
+        if not day.input_path.exists():
+            yield Result(day, "-", error=f"missing input {day.input_path}")
+            continue
+        try:
+            data = read_input(day)
+            keys, hits = {}, {}
+            if cache is not None:
+                keys = {p: cache.key(day, p, data, params) for p in parts}
+                hits = {p: r for p, k in keys.items() if (r := cache.get(k))}
+            if hits and len(hits) == len(parts):
+                yield from hits.values()
+                continue
+            available = get_parts(load_module(day), parts)
+        except Exception:
+            yield Result(day, "-", error=traceback.format_exc(limit=-1).strip())
+            continue
+        for part in available:
+            if part in hits:
+                yield hits[part]
+                continue
+            result = run_part(day, part, data, params, profile)
+            if cache is not None:
+                cache.put(keys[part], result)
+            yield result
+
+
+def format_result(result: Result) -> str:
+    if result.error is not None:
+        return f"{result.day} {result.part:<6}  ERROR {result.error.splitlines()[-1]}"
+    answer = str(result.answer)
+    if "\n" in answer:
+        answer = "\n" + answer
+    return (
+        f"{result.day} {result.part:<6}  "
+        f"wall {result.wall * 1000:10.2f} ms  "
+        f"cpu {result.cpu * 1000:10.2f} ms  "
+        f"rss {result.peak_rss / 1024:8.1f} MiB  "
+        f"{'(cached)  ' if result.cached else ''}{answer}"
+        + "".join(f"\n    {k} {v}" for k, v in (result.counters or {}).items())
+    )
@@ -0,0 +1,37 @@
+"""Last recorded wall time of every (day, part), used to schedule jobs."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable
+
+from aoc.runner import ROOT, Day, Result
+
+STATE_DIR = ROOT / ".aoc"
+TIMINGS_PATH = STATE_DIR / "timings.json"
+
+
+def key(day: Day, part: str) -> str:
+    return f"{day}:{part}"
+
+
+def load(path: Path = TIMINGS_PATH) -> dict[str, float]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def update(results: Iterable[Result], path: Path = TIMINGS_PATH) -> None:
+    timings = load(path)
+    for result in results:
+        if result.error is None:
+            timings[key(result.day, result.part)] = result.wall
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(timings, indent=2, sort_keys=True))
+
+
+def expected(timings: dict[str, float], day: Day, part: str) -> float:
+    # Unknown jobs could be the slow ones, so they are scheduled first
+    return timings.get(key(day, part), float("inf"))
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aoc.cache import ResultCache, aoc_imports, helper_sources
+from aoc.runner import Day, Result
+
+SOLVER = """\
+from aoc import top, missing
+import aoc.other
+
+
+def part_1(data):
+    from aoc.late import late
+    return late(data)
+"""
+
+
+class AocImportsTest(unittest.TestCase):
+    def test_import_forms(self):
+        source = b"import aoc.a\nfrom aoc.b import x\nfrom aoc import c, d as e\n"
+        self.assertEqual(aoc_imports(source), {"a", "b", "c", "d"})
+
+    def test_ignores_other_packages(self):
+        self.assertEqual(
+            aoc_imports(b"import aoc\nimport numpy\nfrom . import a\n"), set()
+        )
+
+    def test_syntax_error(self):
+        self.assertEqual(aoc_imports(b"def broken(:\n"), set())
+
+
+class SourceHashTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.helpers = self.root / "aoc"
+        self.helpers.mkdir()
+        self.write("top.py", "from aoc.middle import f\n")
+        self.write("middle.py", "import aoc.bottom\n")
+        self.write("bottom.py", "VALUE = 1\n")
+        self.write("other.py", "from aoc import top\n")  # a cycle
+        self.write("late.py", "def late(data):\n    return data\n")
+        self.solver = self.root / "01.py"
+        self.solver.write_text(SOLVER)
+        patch = mock.patch.object(Day, "path", property(lambda day: self.solver))
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.day = Day(2021, 1)
+
+    def write(self, name: str, text: str) -> None:
+        (self.helpers / name).write_text(text)
+
+    def cache(self) -> ResultCache:
+        return ResultCache(self.root / "cache", helpers=self.helpers)
+
+    def test_helpers_are_followed(self):
+        names = [p.name for p in helper_sources(self.solver.read_bytes(), self.helpers)]
+        self.assertEqual(
+            names, ["bottom.py", "late.py", "middle.py", "other.py", "top.py"]
+        )
+
+    def test_editing_an_indirect_helper_invalidates(self):
+        cache = self.cache()
+        key = cache.key(self.day, "part_1", "input")
+        cache.put(key, Result(self.day, "part_1", answer=1))
+        self.assertIsNotNone(
+            self.cache().get(self.cache().key(self.day, "part_1", "input"))
+        )
+
+        self.write("bottom.py", "VALUE = 2\n")
+        fresh = self.cache()
+        new_key = fresh.key(self.day, "part_1", "input")
+        self.assertNotEqual(new_key, key)
+        self.assertIsNone(fresh.get(new_key))
+
+
+if __name__ == "__main__":
+    unittest.main()
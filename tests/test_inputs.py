@@ -0,0 +1,58 @@
+import random
+import re
+import unittest
+
+import numpy as np
+
+from aoc.inputs import MAX_INT_WIDTH, int_array, iter_int_chunks, parse_ints
+
+SEPARATORS = ["\n", ",", " ", "..", "-", " -> ", ",-", ", ", "=", "x="]
+
+
+def random_text(rng: random.Random, n: int) -> str:
+    parts = []
+    for _ in range(n):
+        parts.append(rng.choice(SEPARATORS))
+        parts.append(str(rng.randrange(10 ** rng.randint(1, 8))))
+    return "".join(parts)
+
+
+class IterIntChunksTest(unittest.TestCase):
+    def check(self, text: str, chunk_size: int) -> None:
+        for signed, pattern in ((True, r"-?\d+"), (False, r"\d+")):
+            chunks = list(iter_int_chunks(text, signed, chunk_size))
+            found = np.concatenate(chunks).tolist() if chunks else []
+            expected = [int(x) for x in re.findall(pattern, text)]
+            self.assertEqual(found, expected, (text, chunk_size, signed))
+
+    def test_dash_separated_run_at_every_chunk_size(self):
+        text = "-".join(map(str, range(1, 200)))
+        for chunk_size in range(2 * MAX_INT_WIDTH, len(text) + 2):
+            self.check(text, chunk_size)
+
+    def test_random_separators_at_every_chunk_size(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            text = random_text(rng, 40)
+            for chunk_size in range(2 * MAX_INT_WIDTH, len(text) + 2):
+                self.check(text, chunk_size)
+
+    def test_longest_numbers(self):
+        rng = random.Random(1)
+        values = [rng.randrange(-(2**63) + 1, 2**63) for _ in range(50)]
+        text = ",".join(map(str, values))
+        for chunk_size in range(2 * MAX_INT_WIDTH, 200):
+            self.check(text, chunk_size)
+
+    def test_bytes_and_str_agree(self):
+        text = "on x=-5..47,y=-31..22\noff x=1..2,y=-3..-1\n"
+        self.assertEqual(parse_ints(text).tolist(), parse_ints(text.encode()).tolist())
+        self.assertEqual(list(int_array(text)), parse_ints(text).tolist())
+
+    def test_empty(self):
+        self.assertEqual(parse_ints("").tolist(), [])
+        self.assertEqual(parse_ints("no numbers here").tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()